@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import pytest
+
+
+def make_checks(count, passed=True):
+    checks = []
+    for i in range(count):
+        def check():
+            return passed, 'it works'
+
+        check.__name__ = 'check_{}'.format(i)
+        checks.append(check)
+    return checks
+
+
+def make_results(count):
+    now = time.time()
+    return [{'checker': 'check_{}'.format(i),
+             'output': 'it works',
+             'passed': True,
+             'timestamp': now,
+             'expires': now + 27,
+             'response_time': 0.000123} for i in range(count)]
+
+
+@pytest.fixture
+def large_environ(monkeypatch):
+    """Replace os.environ with 5000 variables, a tenth of them sensitive."""
+    for i in range(4500):
+        monkeypatch.setenv('VARIABLE_{}'.format(i), 'value-{}'.format(i))
+    for i in range(500):
+        monkeypatch.setenv('SECRET_TOKEN_{}'.format(i), 'secret')
+    return os.environ
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import pytest
+
+from healthcheck import EnvironmentDump
+from healthcheck.security import Redactor, safe_dict
+from healthcheck.serializers import available_serializers
+
+
+def legacy_safe_dict(dictionary, blacklist=('key', 'token', 'pass'), max_deep=5):
+    """The scan used before the compiled Redactor, kept for comparison."""
+    if max_deep <= 0:
+        return dictionary
+    result = {}
+    for key in dictionary.keys():
+        if isinstance(dictionary[key], dict):
+            result[key] = legacy_safe_dict(dictionary[key], blacklist, max_deep - 1)
+        elif any(b in key.lower() for b in blacklist):
+            result[key] = '********'
+        else:
+            result[key] = dictionary[key]
+    return result
+
+
+@pytest.mark.benchmark(group='environment dump')
+@pytest.mark.parametrize('name', available_serializers())
+def test_run(benchmark, large_environ, name):
+    ed = EnvironmentDump(serializer=name)
+    ed.run()
+
+    message, status, headers = benchmark(ed.run)
+
+    assert status == 200
+
+
+@pytest.mark.benchmark(group='environment dump')
+def test_run_single_section(benchmark, large_environ):
+    ed = EnvironmentDump()
+    ed.run()
+
+    message, status, headers = benchmark(ed.run, 'python')
+
+    assert status == 200
+
+
+@pytest.mark.benchmark(group='redact 5000 variables')
+def test_legacy_safe_dict(benchmark, large_environ):
+    benchmark(legacy_safe_dict, dict(large_environ))
+
+
+@pytest.mark.benchmark(group='redact 5000 variables')
+def test_safe_dict(benchmark, large_environ):
+    benchmark(safe_dict, dict(large_environ))
+
+
+@pytest.mark.benchmark(group='redact 5000 variables')
+def test_redact_environ_memoized(benchmark, large_environ):
+    redactor = Redactor()
+
+    benchmark(redactor.redact_environ, large_environ)
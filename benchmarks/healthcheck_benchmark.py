@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import pytest
+
+from healthcheck import HealthCheck
+from healthcheck.healthcheck import json_success_handler
+from healthcheck.serializers import available_serializers, get_serializer
+
+from .conftest import make_checks, make_results
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+def test_run_hot_cache(benchmark, count):
+    hc = HealthCheck(checkers=make_checks(count))
+    hc.run()
+
+    message, status, headers = benchmark(hc.run)
+
+    assert status == 200
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+def test_run_cold_cache(benchmark, count):
+    hc = HealthCheck(checkers=make_checks(count), success_ttl=0)
+
+    message, status, headers = benchmark(hc.run)
+
+    assert status == 200
+
+
+@pytest.mark.parametrize('count', [10, 100])
+def test_run_cached_response(benchmark, count):
+    hc = HealthCheck(checkers=make_checks(count), cache_response=True)
+    hc.run()
+
+    message, status, headers = benchmark(hc.run)
+
+    assert status == 200
+
+
+def test_cache_hit_lookup(benchmark):
+    hc = HealthCheck(checkers=make_checks(100))
+    hc.run()
+    checks = hc.select()
+
+    results, misses = benchmark(hc.cached_results, checks)
+
+    assert misses == []
+
+
+@pytest.mark.benchmark(group='serialize 1000 results')
+@pytest.mark.parametrize('name', available_serializers())
+def test_serialize_results(benchmark, name):
+    results = make_results(1000)
+    serializer = get_serializer(name)
+
+    benchmark(json_success_handler, results, serializer=serializer)
+
+
+def peak_bytes(func):
+    """Peak memory allocated while calling ``func``."""
+    tracemalloc = pytest.importorskip('tracemalloc')
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('count', [10, 100])
+def test_allocations_per_request(benchmark, count):
+    hc = HealthCheck(checkers=make_checks(count))
+    hc.run()
+
+    # memory allocated while serving a request from the cache, results are not encoded again
+    cached = benchmark.extra_info['peak_bytes'] = peak_bytes(hc.run)
+    for result in hc.results():
+        # changing a result drops its JSON document
+        result['output'] = result['output']
+    encoded = benchmark.extra_info['peak_bytes_encoding'] = peak_bytes(hc.run)
+
+    message, status, headers = benchmark(hc.run)
+
+    assert status == 200
+    assert cached < encoded
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Overhead of serving a health check through the framework handlers."""
+import json
+
+import pytest
+
+from healthcheck import HealthCheck, WSGIApplication
+
+from .conftest import make_checks
+
+flask = pytest.importorskip('flask')
+tornado_web = pytest.importorskip('tornado.web')
+httputil = pytest.importorskip('tornado.httputil')
+concurrent = pytest.importorskip('tornado.concurrent')
+ioloop = pytest.importorskip('tornado.ioloop')
+
+from healthcheck import FlaskHandler, TornadoHandler  # noqa: E402
+
+
+class _Connection(object):
+    """Minimal HTTP connection keeping the last body written by the handler."""
+
+    context = None
+
+    def __init__(self):
+        self.body = b''
+
+    def _done(self):
+        future = concurrent.Future()
+        future.set_result(None)
+        return future
+
+    def set_close_callback(self, callback):
+        pass
+
+    def write_headers(self, start_line, headers, chunk=None, callback=None):
+        self.body = chunk or b''
+        return self._done()
+
+    def write(self, chunk, callback=None):
+        self.body += chunk
+        return self._done()
+
+    def finish(self):
+        pass
+
+
+@pytest.fixture
+def health():
+    hc = HealthCheck(checkers=make_checks(10))
+    hc.run()
+    return hc
+
+
+@pytest.mark.benchmark(group='handler overhead')
+def test_run(benchmark, health):
+    message, status, headers = benchmark(health.run)
+
+    assert status == 200
+
+
+@pytest.mark.benchmark(group='handler overhead')
+def test_flask_handler(benchmark, health):
+    app = flask.Flask(__name__)
+    app.add_url_rule('/h', view_func=FlaskHandler(health))
+    client = app.test_client()
+
+    response = benchmark(client.get, '/h')
+
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group='handler overhead')
+def test_tornado_handler(benchmark, health):
+    app = tornado_web.Application()
+    connection = _Connection()
+    loop = ioloop.IOLoop()
+
+    def get():
+        request = httputil.HTTPServerRequest(method='GET', uri='/h', connection=connection)
+        handler = TornadoHandler(app, request, checker=health)
+        handler._transforms = []
+        # the checks run on the executor, the loop waits for the response
+        loop.run_sync(handler.get)
+        handler.finish()
+        return handler
+
+    try:
+        handler = benchmark(get)
+    finally:
+        loop.close()
+
+    assert handler.get_status() == 200
+    assert json.loads(connection.body.decode('utf-8'))['status'] == 'success'
+
+
+@pytest.mark.benchmark(group='handler overhead')
+def test_wsgi_application(benchmark, health):
+    app = WSGIApplication({'/h': health})
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/h'}
+
+    def start_response(status, headers):
+        pass
+
+    body = benchmark(app, environ, start_response)
+
+    assert body
@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import sys
+
+collect_ignore_glob = []
+if sys.version_info < (3, 5):
+    # async def is a syntax error on python2, asyncio code and tests are python3 only
+    collect_ignore_glob = ['healthcheck/asgi.py', 'healthcheck/async_healthcheck.py',
+                           'tests/*/*async*_test.py']
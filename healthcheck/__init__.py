@@ -7,9 +7,22 @@ except Exception:
     pass
 
 try:
-    from .tornado_handler import TornadoHandler  # noqa
+    from .tornado_handler import EnvironmentDumpHandler, TornadoHandler  # noqa
+except ImportError:
+    pass
+
+try:
+    from .flask_handler import FlaskHandler  # noqa
 except ImportError:
     pass
 
 from .environmentdump import EnvironmentDump  # noqa
 from .healthcheck import HealthCheck  # noqa
+from .wsgi import WSGIApplication  # noqa
+
+try:
+    from .async_healthcheck import AsyncHealthCheck  # noqa
+    from .asgi import ASGIApplication  # noqa
+except (ImportError, SyntaxError):
+    # asyncio engine and ASGI application are only available on python3
+    pass
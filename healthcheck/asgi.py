@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .healthcheck import HealthCheck
+from .streaming import CONTENT_TYPES, negotiate
+from .wsgi import Routes, encode
+
+_NOT_FOUND = (b'Not Found', 404, {'Content-Type': 'text/plain'})
+_NOT_ALLOWED = (b'', 405, {'Allow': 'GET, HEAD'})
+
+
+class ASGIApplication(object):
+    """ASGI application exposing health checks without a web framework.
+
+    ``run_async`` is awaited when the checker has one (``AsyncHealthCheck``),
+    other checkers run on ``executor``, the loop default one unless given.
+    Health check results are streamed as they complete when the request
+    accepts ``application/x-ndjson`` or ``text/event-stream``::
+
+        app = ASGIApplication({'/healthcheck': health, '/environment': envdump})
+
+    :param routes: Checkers by path prefix, or a single checker served on ``/``,
+        see ``wsgi.WSGIApplication``
+    :param executor: Pool running synchronous checkers
+    """
+
+    def __init__(self, routes, executor=None):  # type: (Any, Optional[Any]) -> None
+        self.routes = Routes(routes)
+        self.executor = executor
+        # encoded headers by identity of the mapping returned by run, which is reused between calls
+        self._headers = {}  # type: Dict[int, Tuple[Mapping[str, str], List[Tuple[bytes, bytes]]]]
+
+    async def __call__(self, scope, receive, send):
+        # type: (Dict[str, Any], Callable[..., Any], Callable[..., Any]) -> None
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        method = scope['method']
+        if method != 'GET' and method != 'HEAD':
+            body, status, headers = _NOT_ALLOWED
+        else:
+            match = self.routes.match(scope['path'] or '/')
+            if match is None:
+                body, status, headers = _NOT_FOUND
+            elif isinstance(match[0], HealthCheck) and negotiate(self.header(scope, b'accept')):
+                await self.stream(match[0], match[1], scope, send)
+                return
+            else:
+                body, status, headers = await self.run(match[0], match[1], scope)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': self.encode_headers(headers, body, status)})
+        await send({'type': 'http.response.body', 'body': b'' if method == 'HEAD' else body})
+
+    @staticmethod
+    def header(scope, name):  # type: (Dict[str, Any], bytes) -> Optional[str]
+        for key, value in scope.get('headers') or ():
+            if key == name:
+                return value.decode('latin-1')
+        return None
+
+    async def run(self, checker, args, scope):  # type: (Any, Tuple[str, ...], Dict[str, Any]) -> Tuple[bytes, int, Any]
+        kwargs = {}
+        if isinstance(checker, HealthCheck):
+            kwargs['if_none_match'] = self.header(scope, b'if-none-match')
+        run_async = getattr(checker, 'run_async', None)
+        if run_async is not None:
+            message, status, headers = await run_async(*args, **kwargs)
+        else:
+            run = functools.partial(checker.run, *args, **kwargs)
+            message, status, headers = await asyncio.get_event_loop().run_in_executor(self.executor, run)
+        return encode(message), status, headers
+
+    async def stream(self, checker, args, scope, send):
+        # type: (HealthCheck, Tuple[str, ...], Dict[str, Any], Callable[..., Any]) -> None
+        format = negotiate(self.header(scope, b'accept')) or 'ndjson'
+        check = args[0] if args else None
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', CONTENT_TYPES[format].encode('ascii')),
+                                (b'cache-control', b'no-cache')]})
+        if scope['method'] != 'HEAD':
+            stream_async = getattr(checker, 'stream_async', None)
+            if stream_async is not None:
+                async for chunk in stream_async(check, format=format):
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                loop = asyncio.get_event_loop()
+                queue = asyncio.Queue()  # type: asyncio.Queue
+                done = loop.run_in_executor(self.executor, self.drain, checker.stream(check, format=format),
+                                            loop, queue)
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                # raises the error that ended the stream, if any
+                await done
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    def drain(chunks, loop, queue):  # type: (Iterator[bytes], asyncio.AbstractEventLoop, asyncio.Queue) -> None
+        """Run a whole stream on one pool thread, so the run hooks start and end on the same thread."""
+        try:
+            for chunk in chunks:
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    def encode_headers(self, headers, body, status):
+        # type: (Mapping[str, str], bytes, int) -> List[Tuple[bytes, bytes]]
+        cached = self._headers.get(id(headers))
+        if cached is None or cached[0] is not headers:
+            if len(self._headers) >= 64:
+                self._headers.clear()
+            encoded = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers.items()]
+            cached = self._headers[id(headers)] = (headers, encoded)
+        if status == 304:
+            return cached[1]
+        return cached[1] + [(b'content-length', str(len(body)).encode('ascii'))]
+
+    async def lifespan(self, receive, send):  # type: (Callable[..., Any], Callable[..., Any]) -> None
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .healthcheck import HealthCheck, perf_counter
+from .hooks import fire
+from .registry import Check, Selection
+from .result import CheckResult
+from .streaming import get_encoder
+from .timeout import TimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+def is_coroutine_checker(checker):  # type:(Callable) -> bool
+    """Tell whether calling ``checker``, a function or a callable object, returns a coroutine."""
+    func = getattr(checker, 'func', checker)
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(type(func), '__call__', None))
+
+
+class AsyncHealthCheck(HealthCheck):
+    """HealthCheck whose checks can be awaited from an asyncio event loop.
+
+    Checkers may be coroutine functions or plain callables; plain callables are
+    run on the instance executor (or the loop default one) so they never block
+    the loop. The cache and handlers are the same ones used by ``run``.
+    """
+
+    def __init__(self, *args, **kwargs):  # type:(*Any, **Any) -> None
+        super(AsyncHealthCheck, self).__init__(*args, **kwargs)
+        self._async_flights = {}  # type: Dict[str, asyncio.Future]
+
+    async def run_async(self, check=None, tags=None, if_none_match=None, deadline=None):
+        # type:(Selection, Selection, Optional[str], Optional[float]) -> Tuple[Union[str, bytes], int, Dict[str,str]]
+        hooks = self.hooks
+        filtered = self.select(check, tags)
+        if hooks.on_run_start:
+            fire(hooks.on_run_start, filtered)
+        results, misses = self.cached_results(filtered)
+
+        if misses:
+            deadline = self.deadline if deadline is None else deadline
+            if deadline > 0:
+                fresh = await self.execute_until([filtered[i] for i in misses], deadline)
+            else:
+                fresh = await asyncio.gather(*self.schedule([filtered[i] for i in misses]))
+            for index, result in zip(misses, fresh):
+                results[index] = result
+
+        if hooks.on_run_end:
+            fire(hooks.on_run_end, filtered, results)
+        if not self.cache_response:
+            return self.respond(results)
+        return self.respond_cached(results, if_none_match)
+
+    def stream_async(self, check=None, tags=None, format='ndjson'):
+        # type:(Selection, Selection, str) -> AsyncIterator[bytes]
+        """Asynchronous version of ``HealthCheck.stream``, to use with ``async for``."""
+        return ResultStream(self, self.select(check, tags), format)
+
+    async def execute_async(self, checker):  # type:(Check) -> Mapping[str, Any]
+        """Run a checker and cache its result, once for all concurrent coroutines."""
+        flight = self._async_flights.get(checker.name)
+        if flight is None:
+            flight = asyncio.ensure_future(self._execute_async(checker))
+            self._async_flights[checker.name] = flight
+            flight.add_done_callback(lambda _: self._async_flights.pop(checker.name, None))
+        return await asyncio.shield(flight)
+
+    def schedule(self, checkers):  # type:(List[Check]) -> List[asyncio.Future]
+        """Start a task per checker, running each one after its dependencies."""
+        if not self.registry.has_dependencies:
+            return [asyncio.ensure_future(self.execute_async(checker)) for checker in checkers]
+        tasks = {}  # type: Dict[str, asyncio.Future]
+        for check in self.registry.closure(checkers):
+            prerequisites = [tasks[name] for name in check.depends_on]
+            tasks[check.name] = asyncio.ensure_future(self._execute_after(check, prerequisites))
+        return [tasks[checker.name] for checker in checkers]
+
+    async def _execute_after(self, check, prerequisites):  # type:(Check, List[asyncio.Future]) -> Mapping[str, Any]
+        results = {}
+        # skip as soon as any dependency fails, whatever the order they complete in
+        for future in asyncio.as_completed(prerequisites):
+            result = await future
+            results[result['checker']] = result
+            skipped = self.skip(check, results)
+            if skipped is not None:
+                return skipped
+        return await self.execute_async(check)
+
+    async def execute_until(self, checkers, deadline):  # type:(List[Check], float) -> list
+        """Run the checkers, with a pending result for those still running after ``deadline`` seconds.
+
+        The checks keep running on the loop, and cache their result when they finish.
+        """
+        tasks = self.schedule(checkers)
+        await asyncio.wait(tasks, timeout=deadline)
+        results = []
+        for checker, task in zip(checkers, tasks):
+            if task.done():
+                results.append(task.result())
+            else:
+                # not cancelled, a check waiting for its dependencies must still run
+                results.append(self.make_pending(checker, deadline))
+        return results
+
+    async def _execute_async(self, checker):  # type:(Check) -> Mapping[str, Any]
+        cached = self.cache.get(checker.name)
+        if cached is not None and cached.get('expires') >= time.time():
+            return cached
+        if self.circuit_breaker is not None:
+            short = self.circuit_breaker.short_circuit(checker.name, cached)
+            if short is not None:
+                return short  # type: ignore[return-value]
+        hooks = self.hooks
+        if hooks.on_check_start:
+            fire(hooks.on_check_start, checker)
+        result = await self.run_check_async(checker)
+        self.store(checker.name, result)
+        if hooks.on_check_end:
+            fire(hooks.on_check_end, checker, result)
+        return result
+
+    async def run_check_async(self, checker):  # type:(Callable) -> CheckResult
+        start_time = perf_counter()
+
+        try:
+            if is_coroutine_checker(checker):
+                awaitable = checker()
+            else:
+                awaitable = asyncio.get_event_loop().run_in_executor(self.executor, checker)
+            if self.error_timeout > 0:
+                try:
+                    passed, output = await asyncio.wait_for(awaitable, self.error_timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError('Timeout error!')
+            else:
+                passed, output = await awaitable
+        except Exception as exc:
+            logger.error(exc)
+            passed, output = self.exception_handler(checker, exc)
+
+        return self.make_result(checker, passed, output, perf_counter() - start_time)
+
+
+class ResultStream(object):
+    """Chunks of ``AsyncHealthCheck.stream_async``: cached results first, then the others as they complete.
+
+    An asynchronous iterator rather than an asynchronous generator, which needs python 3.6.
+    """
+
+    def __init__(self, health, checkers, format):  # type:(AsyncHealthCheck, List[Check], str) -> None
+        self.health = health
+        self.checkers = checkers
+        self.encode = get_encoder(format)
+        self.ready = deque()  # type: Deque[bytes]
+        self.results = []  # type: List[Any]
+        self.completed = None  # type: Optional[Iterator[Any]]
+        self.done = False
+
+    def __aiter__(self):  # type:() -> ResultStream
+        return self
+
+    def start(self):  # type:() -> None
+        health = self.health
+        if health.hooks.on_run_start:
+            fire(health.hooks.on_run_start, self.checkers)
+        self.results, misses = health.cached_results(self.checkers)
+        for result in self.results:
+            if result is not None:
+                self.ready.append(self.encode(health.serializer, 'result', result))
+
+        async def execute(index, task):  # type:(int, asyncio.Future) -> Tuple[int, Mapping[str, Any]]
+            return index, await task
+
+        tasks = health.schedule([self.checkers[i] for i in misses])
+        self.completed = iter(asyncio.as_completed([execute(i, task) for i, task in zip(misses, tasks)]))
+
+    async def __anext__(self):  # type:() -> bytes
+        if self.completed is None:
+            self.start()
+        if self.ready:
+            return self.ready.popleft()
+        health = self.health
+        for future in self.completed:  # type: ignore[union-attr]
+            index, result = await future
+            self.results[index] = result
+            return self.encode(health.serializer, 'result', result)
+        if self.done:
+            raise StopAsyncIteration
+        self.done = True
+        if health.hooks.on_run_end:
+            fire(health.hooks.on_run_end, self.checkers, self.results)
+        return self.encode(health.serializer, 'summary', health.summarize(self.results))
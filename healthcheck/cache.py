@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+try:
+    from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+except ImportError:
+    # for python2
+    pass
+
+try:
+    import fcntl
+except ImportError:
+    # not available on windows
+    fcntl = None  # type: ignore[assignment]
+
+from .result import CheckResult, dumpb
+from .serializers import get_serializer
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(object):
+    """Interface of the check result cache, see ``HealthCheck(cache=...)``.
+
+    Keys are check names and values result dictionaries.
+    """
+
+    def get(self, key, default=None):  # type: (str, Any) -> Any
+        raise NotImplementedError
+
+    def __setitem__(self, key, value):  # type: (str, Mapping[str, Any]) -> None
+        raise NotImplementedError
+
+    def pop(self, key, default=None):  # type: (str, Any) -> Any
+        raise NotImplementedError
+
+
+class DictCache(dict, Cache):  # type: ignore[misc]
+    """Per process cache, the default."""
+
+
+# sequence (odd while a write is in progress), sha1 of the key, payload length
+_HEADER = struct.Struct('<Q20sI')
+_SEQUENCE = struct.Struct('<Q')
+_EMPTY = b'\0' * 20
+_REMOVED = b'\xff' * 20
+
+
+class SharedMemoryCache(Cache):
+    """Cache shared by every process mapping the same file.
+
+    Create it before the server forks its workers, or give every worker the
+    same ``path``, so a result stored by one worker serves all of them.
+
+    The file holds ``slots`` records of ``record_size`` bytes each: a small
+    header followed by the result encoded as JSON. Writers are serialized
+    with a lock on the file. Readers do not lock: they retry when the
+    sequence number of the record changed while it was being copied, and
+    only decode a record when its sequence number moved since the last read,
+    so a cache hit costs a single header read.
+
+    Results that do not fit in a record, or stored when every slot is taken,
+    are kept in the process only.
+
+    :param path: File backing the cache, created if needed
+    :param slots: Maximum number of checks
+    :param record_size: Bytes per record, header included
+    """
+
+    # unlocked read attempts before waiting for the writer lock
+    max_spins = 1000
+
+    def __init__(self, path, slots=64, record_size=4096):  # type: (str, int, int) -> None
+        if fcntl is None:
+            raise RuntimeError('SharedMemoryCache requires the "fcntl" module (posix only).')
+        if record_size <= _HEADER.size:
+            raise ValueError('record_size must be larger than {} bytes.'.format(_HEADER.size))
+        self.path = path
+        self.slots = slots
+        self.record_size = record_size
+        self.serializer = get_serializer(default=str)
+        size = slots * record_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._flock()
+            try:
+                actual = os.fstat(self._fd).st_size
+                if actual == 0:
+                    os.ftruncate(self._fd, size)
+                elif actual != size:
+                    raise ValueError('{} holds {} bytes, expected {} for {} slots of {} bytes.'.format(
+                        path, actual, size, slots, record_size))
+            finally:
+                self._funlock()
+            self._map = mmap.mmap(self._fd, size)
+        except Exception:
+            os.close(self._fd)
+            raise
+        self._lock = threading.Lock()
+        # key -> (sequence, slot, value) of the last record read or written by this process
+        self._local = {}  # type: Dict[str, Tuple[int, Optional[int], Any]]
+
+    def _flock(self):  # type: () -> None
+        # lockf locks belong to the process, so they also exclude workers sharing the descriptor after a fork
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+
+    def _funlock(self):  # type: () -> None
+        fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _probe(self, digest):  # type: (bytes) -> Iterator[int]
+        start = struct.unpack_from('<I', digest)[0] % self.slots
+        for i in range(self.slots):
+            yield (start + i) % self.slots
+
+    def _find(self, digest, claim=False):  # type: (bytes, bool) -> Optional[int]
+        """Return the slot holding ``digest``, or the slot to store it in when ``claim`` is set."""
+        free = None
+        for slot in self._probe(digest):
+            offset = slot * self.record_size + _SEQUENCE.size
+            key = self._map[offset:offset + 20]
+            if key == digest:
+                return slot
+            if key == _REMOVED:
+                if free is None:
+                    free = slot
+            elif key == _EMPTY:
+                break
+        else:
+            slot = None
+        if not claim:
+            return None
+        return slot if free is None else free
+
+    def _read(self, slot):  # type: (int) -> Tuple[int, bytes, bytes]
+        offset = slot * self.record_size
+        for _ in range(self.max_spins):
+            sequence, key, length = _HEADER.unpack_from(self._map, offset)
+            if sequence & 1:
+                continue
+            start = offset + _HEADER.size
+            payload = self._map[start:start + length]
+            if _SEQUENCE.unpack_from(self._map, offset)[0] == sequence:
+                return sequence, key, payload
+        # a writer is slow, or died in the middle of a write. The thread lock comes
+        # first: lockf would let a thread in on a lock held by another one of the process
+        with self._lock:
+            self._flock()
+            try:
+                sequence, key, length = _HEADER.unpack_from(self._map, offset)
+                if sequence & 1:
+                    return sequence, _EMPTY, b''
+                start = offset + _HEADER.size
+                return sequence, key, self._map[start:start + length]
+            finally:
+                self._funlock()
+
+    def _write(self, slot, digest, payload):  # type: (int, bytes, bytes) -> int
+        offset = slot * self.record_size
+        sequence = _SEQUENCE.unpack_from(self._map, offset)[0]
+        _SEQUENCE.pack_into(self._map, offset, sequence + 1)
+        start = offset + _HEADER.size
+        self._map[start:start + len(payload)] = payload
+        _HEADER.pack_into(self._map, offset, sequence + 1, digest, len(payload))
+        _SEQUENCE.pack_into(self._map, offset, sequence + 2)
+        return sequence + 2
+
+    def get(self, key, default=None):  # type: (str, Any) -> Any
+        local = self._local.get(key)
+        if local is not None:
+            sequence, slot, value = local
+            if slot is None or _SEQUENCE.unpack_from(self._map, slot * self.record_size)[0] == sequence:
+                return value
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        slot = self._find(digest)
+        if slot is None:
+            return default
+        sequence, found, payload = self._read(slot)
+        if found != digest:
+            return default
+        value = CheckResult.from_dict(json.loads(payload.decode('utf-8')))
+        self._local[key] = (sequence, slot, value)
+        return value
+
+    def __getitem__(self, key):  # type: (str) -> Any
+        value = self.get(key, _REMOVED)
+        if value is _REMOVED:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):  # type: (Any) -> bool
+        return self.get(key, _REMOVED) is not _REMOVED
+
+    def __setitem__(self, key, value):  # type: (str, Mapping[str, Any]) -> None
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        payload = dumpb(self.serializer, value)
+        with self._lock:
+            if len(payload) > self.record_size - _HEADER.size:
+                logger.warning('Result of "%s" does not fit in %s bytes, it is not shared', key, self.record_size)
+                self._local[key] = (0, None, value)
+                return
+            self._flock()
+            try:
+                slot = self._find(digest, claim=True)
+                if slot is not None:
+                    sequence = self._write(slot, digest, payload)
+            finally:
+                self._funlock()
+            if slot is None:
+                logger.warning('No slot left for "%s", it is not shared', key)
+                self._local[key] = (0, None, value)
+            else:
+                self._local[key] = (sequence, slot, value)
+
+    def pop(self, key, default=None):  # type: (str, Any) -> Any
+        value = self.get(key, default)
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        with self._lock:
+            self._local.pop(key, None)
+            self._flock()
+            try:
+                slot = self._find(digest)
+                if slot is not None:
+                    self._write(slot, _REMOVED, b'')
+            finally:
+                self._funlock()
+        return value
+
+    def clear(self):  # type: () -> None
+        with self._lock:
+            self._local.clear()
+            self._flock()
+            try:
+                for slot in range(self.slots):
+                    self._write(slot, _EMPTY, b'')
+            finally:
+                self._funlock()
+
+    def close(self):  # type: () -> None
+        self._map.close()
+        os.close(self._fd)
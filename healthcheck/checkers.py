@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Ready-made checkers keeping their connections open between runs."""
+import os
+import select
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+try:
+    from typing import Any, Callable, Deque, Dict, Iterator, Optional, Sequence, Tuple, Type
+    Errors = Tuple[Type[BaseException], ...]
+except ImportError:
+    # for python2
+    pass
+
+from six.moves import http_client
+from six.moves.urllib.parse import urlsplit
+
+
+class BrokenConnection(EOFError):
+    """The server closed the connection or replied something unexpected."""
+
+
+class RedisError(Exception):
+    """Error reply of a Redis server."""
+
+
+# errors meaning the connection can not be used anymore
+CONNECTION_ERRORS = (socket.error, EOFError, http_client.HTTPException)  # type: Errors
+
+
+def socket_is_alive(sock):  # type: (Optional[socket.socket]) -> bool
+    """Tell whether an idle socket may be reused, without any round trip.
+
+    Nothing must be readable from an idle connection: data or end of file
+    mean the server closed it or that the protocol is out of sync.
+    """
+    if sock is None:
+        return False
+    try:
+        if hasattr(select, 'poll'):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return not poller.poll(0)
+        return not select.select([sock], [], [], 0)[0]
+    except (ValueError, socket.error, select.error):
+        # closed socket
+        return False
+
+
+def connect(host, port, timeout):  # type: (str, int, float) -> socket.socket
+    sock = socket.create_connection((host, port), timeout)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+class ConnectionPool(object):
+    """Thread safe pool of idle connections.
+
+    Connections are taken from and given back to the pool by ``connection``,
+    most recently used first, and created on demand: concurrent runs never
+    wait for each other. At most ``max_size`` idle connections are kept, and
+    those idle for more than ``max_idle`` seconds, or failing ``is_alive``,
+    are closed instead of being reused. The pool is emptied in a forked
+    process so parent and child never share a connection.
+
+    :param factory: Function creating a connection
+    :param close: Function closing a connection
+    :param is_alive: Function telling whether an idle connection may be reused
+    :param errors: Exceptions meaning a connection is broken, see ``run``
+    """
+
+    def __init__(self, factory, close, is_alive=None, max_size=2, max_idle=60, errors=CONNECTION_ERRORS):
+        # type: (Callable[[], Any], Callable[[Any], None], Optional[Callable[[Any], bool]], int, float, Errors) -> None
+        self.factory = factory
+        self.close_connection = close
+        self.is_alive = is_alive
+        self.errors = errors
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = deque()  # type: Deque[Tuple[Any, float]]
+        self._pid = os.getpid()
+        # connections opened, for monitoring and tests
+        self.created = 0
+
+    def __len__(self):  # type: () -> int
+        return len(self._idle)
+
+    def _take(self):  # type: () -> Optional[Any]
+        with self._lock:
+            if self._pid != os.getpid():
+                # forked, the connections belong to the parent
+                self._idle.clear()
+                self._pid = os.getpid()
+            now = time.time()
+            while self._idle:
+                connection, released = self._idle.pop()
+                if now - released <= self.max_idle and (self.is_alive is None or self.is_alive(connection)):
+                    return connection
+                self._discard(connection)
+        return None
+
+    def _discard(self, connection):  # type: (Any) -> None
+        try:
+            self.close_connection(connection)
+        except Exception:
+            pass
+
+    def _give_back(self, connection):  # type: (Any) -> None
+        with self._lock:
+            if len(self._idle) < self.max_size and self._pid == os.getpid():
+                self._idle.append((connection, time.time()))
+                return
+        self._discard(connection)
+
+    @contextmanager
+    def connection(self, new=False):  # type: (bool) -> Iterator[Tuple[Any, bool]]
+        """Yield a connection and whether it was reused, close it if an exception is raised."""
+        connection = None if new else self._take()
+        reused = connection is not None
+        if connection is None:
+            connection = self.factory()
+            self.created += 1
+        try:
+            yield connection, reused
+        except BaseException:
+            self._discard(connection)
+            raise
+        self._give_back(connection)
+
+    def run(self, func):  # type: (Callable[[Any], Any]) -> Any
+        """Call ``func`` with a connection.
+
+        A reused connection may have been dropped by the server since its
+        last use, so one of ``errors`` raised on it is retried once on a new
+        connection.
+        """
+        reused = False
+        try:
+            with self.connection() as (connection, reused):
+                return func(connection)
+        except self.errors:
+            if not reused:
+                raise
+        with self.connection(new=True) as (connection, _):
+            return func(connection)
+
+    def close(self):  # type: () -> None
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+
+class PooledChecker(object):
+    """Base class of the checkers, callable with ``HealthCheck.add_check``.
+
+    Checks are named after the checker type and address unless a ``name``
+    is given to ``add_check``. ``close`` closes the pooled connections.
+    """
+
+    def __init__(self, name, pool):  # type: (str, ConnectionPool) -> None
+        self.__name__ = name
+        self.pool = pool
+
+    def __call__(self):  # type: () -> Tuple[bool, Any]
+        return self.pool.run(self.check)
+
+    def check(self, connection):  # type: (Any) -> Tuple[bool, Any]
+        raise NotImplementedError
+
+    def close(self):  # type: () -> None
+        self.pool.close()
+
+    def __repr__(self):  # type: () -> str
+        return '<{} {}>'.format(type(self).__name__, self.__name__)
+
+
+class TCPChecker(PooledChecker):
+    """Check that a TCP server accepts connections.
+
+    The connection is kept open with TCP keepalive, and the check passes as
+    long as the server does not close it. With ``send``, the bytes are sent
+    on every run and the check passes when the reply starts with ``expect``.
+
+    :param timeout: Connection and read timeout in seconds
+    """
+
+    def __init__(self, host, port, timeout=1.0, send=None, expect=None, max_idle=60):
+        # type: (str, int, float, Optional[bytes], Optional[bytes], float) -> None
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.send = send
+        self.expect = expect
+        super(TCPChecker, self).__init__('tcp_{}_{}'.format(host, port), ConnectionPool(
+            lambda: connect(host, port, timeout), lambda sock: sock.close(), socket_is_alive, max_size=1,
+            max_idle=max_idle))
+
+    def check(self, sock):  # type: (socket.socket) -> Tuple[bool, Any]
+        address = '{}:{}'.format(self.host, self.port)
+        if self.send is None:
+            return True, '{} is reachable'.format(address)
+        sock.sendall(self.send)
+        if not self.expect:
+            return True, '{} is reachable'.format(address)
+        reply = b''
+        while len(reply) < len(self.expect):
+            chunk = sock.recv(len(self.expect) - len(reply))
+            if not chunk:
+                raise BrokenConnection('{} closed the connection'.format(address))
+            reply += chunk
+        if reply != self.expect:
+            # the rest of the reply would be read by the next run
+            raise BrokenConnection('{} replied {!r}, expected {!r}'.format(address, reply, self.expect))
+        return True, '{} replied {!r}'.format(address, reply)
+
+
+class HTTPChecker(PooledChecker):
+    """Check that a URL answers with one of the ``expected_status`` codes.
+
+    Requests are sent on persistent HTTP/1.1 connections, which are given
+    up when the server asks to close them.
+
+    :param url: ``http`` or ``https`` URL
+    :param timeout: Connection and read timeout in seconds
+    :param expected_status: Status codes passing the check, 2xx and 3xx by default
+    """
+
+    def __init__(self, url, timeout=1.0, method='GET', headers=None, expected_status=None, max_idle=60):
+        # type: (str, float, str, Optional[Dict[str, str]], Optional[Sequence[int]], float) -> None
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError('Unsupported URL "{}", expected an http or https URL.'.format(url))
+        self.url = url
+        self.method = method
+        self.path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        self.headers = dict(headers or {})
+        self.expected_status = expected_status
+        connection_class = http_client.HTTPSConnection if parts.scheme == 'https' else http_client.HTTPConnection
+        super(HTTPChecker, self).__init__('http_{}'.format(parts.netloc), ConnectionPool(
+            lambda: connection_class(parts.hostname or '', parts.port, timeout=timeout),
+            lambda connection: connection.close(), lambda connection: socket_is_alive(connection.sock),
+            max_idle=max_idle))
+
+    def check(self, connection):  # type: (Any) -> Tuple[bool, Any]
+        connection.request(self.method, self.path, headers=self.headers)
+        response = connection.getresponse()
+        # the body must be consumed to reuse the connection
+        response.read()
+        if response.will_close:
+            connection.close()
+        status = response.status
+        if self.expected_status is None:
+            passed = 200 <= status < 400
+        else:
+            passed = status in self.expected_status
+        return passed, '{} {} returned {} {}'.format(self.method, self.url, status, response.reason)
+
+
+class RedisChecker(PooledChecker):
+    """Check that a Redis server, or one speaking its protocol, answers ``PING``.
+
+    :param password: Sent with ``AUTH`` once per connection
+    :param db: Database selected once per connection
+    :param timeout: Connection and read timeout in seconds
+    """
+
+    def __init__(self, host='localhost', port=6379, password=None, db=0, timeout=1.0, max_idle=60):
+        # type: (str, int, Optional[str], int, float, float) -> None
+        self.host = host
+        self.port = port
+        self.password = password
+        self.db = db
+        self.timeout = timeout
+        super(RedisChecker, self).__init__('redis_{}_{}'.format(host, port), ConnectionPool(
+            self.connect, self.disconnect, lambda connection: socket_is_alive(connection[0]), max_idle=max_idle))
+
+    def connect(self):  # type: () -> Tuple[socket.socket, Any]
+        sock = connect(self.host, self.port, self.timeout)
+        connection = (sock, sock.makefile('rb'))
+        try:
+            if self.password:
+                self.command(connection, 'AUTH', self.password)
+            if self.db:
+                self.command(connection, 'SELECT', str(self.db))
+        except Exception:
+            self.disconnect(connection)
+            raise
+        return connection
+
+    @staticmethod
+    def disconnect(connection):  # type: (Tuple[socket.socket, Any]) -> None
+        sock, reader = connection
+        reader.close()
+        sock.close()
+
+    @staticmethod
+    def command(connection, *args):  # type: (Tuple[socket.socket, Any], *str) -> bytes
+        """Send a command and return its status reply, raise on an error reply."""
+        sock, reader = connection
+        request = [b'*' + str(len(args)).encode('ascii')]
+        for arg in args:
+            value = arg.encode('utf-8')
+            request.extend((b'$' + str(len(value)).encode('ascii'), value))
+        sock.sendall(b'\r\n'.join(request) + b'\r\n')
+        line = reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise BrokenConnection('Redis closed the connection')
+        if line.startswith(b'-'):
+            raise RedisError(line[1:-2].decode('utf-8', 'replace'))
+        return line[1:-2]
+
+    def check(self, connection):  # type: (Tuple[socket.socket, Any]) -> Tuple[bool, Any]
+        reply = self.command(connection, 'PING')
+        return reply == b'PONG', 'PING returned {}'.format(reply.decode('utf-8', 'replace'))
+
+
+class DBAPIChecker(PooledChecker):
+    """Check a database by running ``query`` on a pooled DB-API connection.
+
+    A connection that failed is closed, and a run on a reused connection
+    failing with one of ``errors`` is retried once on a new connection.
+
+    :param connect: Function returning a new DB-API connection
+    :param errors: Exceptions meaning the connection is broken, usually the
+        ``OperationalError`` and ``InterfaceError`` of the driver
+    """
+
+    def __init__(self, connect, query='SELECT 1', errors=(), name=None, max_idle=60):
+        # type: (Callable[[], Any], str, Errors, Optional[str], float) -> None
+        self.query = query
+        super(DBAPIChecker, self).__init__(name or 'database', ConnectionPool(
+            connect, lambda connection: connection.close(), max_idle=max_idle,
+            errors=CONNECTION_ERRORS + tuple(errors)))
+
+    def check(self, connection):  # type: (Any) -> Tuple[bool, Any]
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.query)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        # do not keep a transaction open on an idle connection
+        connection.rollback()
+        return True, '{} returned {!r}'.format(self.query, row[0] if row else None)
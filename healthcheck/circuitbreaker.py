@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+try:
+    from typing import Any, Dict, Mapping, MutableMapping, Optional
+except ImportError:
+    # for python2
+    pass
+
+from .result import CheckResult
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _Circuit(object):
+    __slots__ = ('state', 'failures', 'trips', 'retry_at')
+
+    def __init__(self):  # type: () -> None
+        self.state = CLOSED
+        self.failures = 0
+        # consecutive times the circuit opened, drives the backoff
+        self.trips = 0
+        self.retry_at = 0.0
+
+
+class CircuitBreaker(object):
+    """Stop running checks of a dependency that keeps failing.
+
+    Each check has its own circuit. After ``failure_threshold`` consecutive
+    failures the circuit opens: the last failure is served from the cache
+    without running the check until ``reset_timeout`` seconds have passed.
+    The next run is a probe (half open): a success closes the circuit, a
+    failure opens it again for twice as long, up to ``max_reset_timeout``.
+
+    :param failure_threshold: Consecutive failures opening the circuit
+    :param reset_timeout: Seconds the circuit stays open the first time
+    :param max_reset_timeout: Upper bound of the backoff, in seconds
+    :param multiplier: Backoff growth factor after each failed probe
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=10.0, max_reset_timeout=300.0, multiplier=2.0):
+        # type: (int, float, float, float) -> None
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = float(reset_timeout)
+        self.max_reset_timeout = float(max_reset_timeout)
+        self.multiplier = float(multiplier)
+        self._lock = threading.Lock()
+        self._circuits = {}  # type: Dict[str, _Circuit]
+
+    def _get(self, name):  # type: (str) -> _Circuit
+        circuit = self._circuits.get(name)
+        if circuit is None:
+            circuit = self._circuits.setdefault(name, _Circuit())
+        return circuit
+
+    def backoff(self, trips):  # type: (int) -> float
+        """Seconds the circuit stays open after opening ``trips`` times in a row."""
+        return min(self.reset_timeout * self.multiplier ** (trips - 1), self.max_reset_timeout)
+
+    def state(self, name):  # type: (str) -> str
+        circuit = self._circuits.get(name)
+        return CLOSED if circuit is None else circuit.state
+
+    def retry_at(self, name):  # type: (str) -> float
+        """Time the next probe is allowed at, 0 unless the circuit is open."""
+        circuit = self._circuits.get(name)
+        return 0.0 if circuit is None or circuit.state != OPEN else circuit.retry_at
+
+    def allow(self, name, now=None):  # type: (str, Optional[float]) -> bool
+        """Tell whether the check may run, moving an expired open circuit to half open."""
+        circuit = self._circuits.get(name)
+        if circuit is None or circuit.state != OPEN:
+            return True
+        with self._lock:
+            if circuit.state != OPEN:
+                return True
+            if (time.time() if now is None else now) < circuit.retry_at:
+                return False
+            circuit.state = HALF_OPEN
+            return True
+
+    def record(self, name, passed, now=None):  # type: (str, Any, Optional[float]) -> str
+        """Record the outcome of a check run and return the new state of its circuit."""
+        with self._lock:
+            circuit = self._get(name)
+            if passed:
+                circuit.state = CLOSED
+                circuit.failures = circuit.trips = 0
+                return CLOSED
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.trips += 1
+                circuit.state = OPEN
+                circuit.retry_at = (time.time() if now is None else now) + self.backoff(circuit.trips)
+            return circuit.state
+
+    def forget(self, name):  # type: (str) -> None
+        with self._lock:
+            self._circuits.pop(name, None)
+
+    def annotate(self, name, result):  # type: (str, MutableMapping[str, Any]) -> MutableMapping[str, Any]
+        """Record ``result`` and report the circuit state in it.
+
+        An open circuit keeps the failure cached until the next probe is due.
+        """
+        state = self.record(name, result['passed'])
+        result['breaker'] = state
+        if state == OPEN:
+            result['expires'] = max(result['expires'], self.retry_at(name))
+        return result
+
+    def short_circuit(self, name, cached):  # type: (str, Optional[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]
+        """Return the result to serve instead of running an open check, None to run it."""
+        if self.allow(name):
+            return None
+        if cached is not None:
+            return cached
+        return CheckResult(name, 'Circuit open', False, time.time(), self.retry_at(name), 0.0, breaker=OPEN)
@@ -1,17 +1,53 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import json
 import os
 import platform
 import sys
+import time
 try:
-    from typing import Dict, Any, Tuple, Callable
+    from typing import Dict, Any, List, Optional, Tuple, Callable, Union
 except ImportError:
     # for python2
     pass
 import six
 
-from .security import safe_dict
+from .security import safe_environ
+from .serializers import get_serializer
+
+
+_installed_packages = None  # type: Optional[Dict[str, str]]
+
+
+def get_installed_packages():  # type: () -> Dict[str, str]
+    """Return the installed distributions as ``{name: version}``.
+
+    The index is built on first use and reused for the process lifetime.
+    """
+    global _installed_packages
+    if _installed_packages is None:
+        _installed_packages = _scan_installed_packages()
+    return _installed_packages
+
+
+def _scan_installed_packages():  # type: () -> Dict[str, str]
+    packages = {}  # type: Dict[str, str]
+    try:
+        from importlib import metadata  # python 3.8+
+    except ImportError:
+        try:
+            import pkg_resources  # type:ignore[import]
+        except ImportError:
+            return packages
+        for dist in pkg_resources.working_set:
+            packages.setdefault(dist.project_name, dist.version)
+        return packages
+
+    for dist in metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            # the first distribution found on sys.path wins, as for imports
+            packages.setdefault(name, dist.version)
+    return packages
 
 
 class EnvironmentDump:
@@ -19,8 +55,20 @@ class EnvironmentDump:
                  include_os=True,
                  include_python=True,
                  include_process=True,
+                 serializer=None,
+                 redactor=None,
                  **kwargs):
+        # values that can not be serialized are rendered with str()
+        self.serializer = get_serializer(serializer, default=str)
+        # masks secrets in the process environment, see security.Redactor
+        self.redactor = redactor
         self.functions = {}
+        # seconds each section may be cached for, and the cached (expires, value)
+        self.ttls = {}  # type: Dict[str, float]
+        self._cache = {}  # type: Dict[str, Tuple[float, Any]]
+        # sections that do not change during the process lifetime, built on first use
+        self._os = None  # type: Optional[Dict[str, Any]]
+        self._python = None  # type: Optional[Dict[str, Any]]
         if include_os:
             self.functions['os'] = self.get_os
         if include_python:
@@ -33,44 +81,77 @@ class EnvironmentDump:
             if k not in self.functions:
                 self.add_section(k, v)
 
-    def add_section(self, name, func):  # type: (Any, Callable) -> None
+    def add_section(self, name, func, ttl=None):  # type: (Any, Callable, Optional[float]) -> None
+        """Add a section to the dump.
+
+        :param name: Section name
+        :param func: Function returning the section data, or the data itself
+        :param ttl: Seconds the value returned by ``func`` is cached for
+        """
         if name in self.functions:
             raise Exception('The name "{}" is already taken.'.format(name))
+        if ttl:
+            self.ttls[name] = float(ttl)
         if not hasattr(func, '__call__'):
             self.functions[name] = lambda: func
             return
         self.functions[name] = func
 
-    def run(self):  # type: () -> Tuple[str, int, Dict[str, str]]
+    def run(self, sections=None):  # type: (Optional[Union[str, List[str]]]) -> Tuple[str, int, Dict[str, str]]
+        """Dump the selected sections, all of them by default.
+
+        :param sections: Section name, comma separated names or list of names
+        """
+        if not sections:
+            names = list(self.functions)
+        elif isinstance(sections, six.string_types):
+            names = sections.split(',')
+        else:
+            names = list(sections)
+
+        unknown = [name for name in names if name not in self.functions]
+        if unknown:
+            message = {'error': 'Unknown section "{}"'.format(unknown[0])}
+            return self.serializer.dumps(message), 404, {'Content-Type': 'application/json'}
+
         data = {}
-        for (name, func) in six.iteritems(self.functions):
-            data[name] = func()
+        for name in names:
+            data[name] = self.get_section(name)
 
-        return json.dumps(data, default=str), 200, {'Content-Type': 'application/json'}
+        return self.serializer.dumps(data), 200, {'Content-Type': 'application/json'}
+
+    def get_section(self, name):  # type: (str) -> Any
+        ttl = self.ttls.get(name)
+        if not ttl:
+            return self.functions[name]()
+
+        now = time.time()
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] >= now:
+            return cached[1]
+        value = self.functions[name]()
+        self._cache[name] = (now + ttl, value)
+        return value
 
     def get_os(self):  # type: () -> Dict[str, Any]
-        return {'platform': sys.platform,
-                'name': os.name,
-                'uname': platform.uname()}
+        if self._os is None:
+            self._os = {'platform': sys.platform,
+                        'name': os.name,
+                        'uname': platform.uname()}
+        return self._os
 
     def get_python(self):  # type: () -> Dict[str, Any]
-        result = {'version': sys.version,
-                  'executable': sys.executable,
-                  'pythonpath': sys.path,
-                  'version_info': {'major': sys.version_info.major,
-                                   'minor': sys.version_info.minor,
-                                   'micro': sys.version_info.micro,
-                                   'releaselevel': sys.version_info.releaselevel,
-                                   'serial': sys.version_info.serial}}
-        try:
-            import pip
-            packages = {p.project_name: p.version
-                        for p in pip.get_installed_distributions()}  # type:ignore[attr-defined]
-            result['packages'] = packages
-        except AttributeError:
-            pass
-
-        return result
+        if self._python is None:
+            self._python = {'version': sys.version,
+                            'executable': sys.executable,
+                            'version_info': {'major': sys.version_info.major,
+                                             'minor': sys.version_info.minor,
+                                             'micro': sys.version_info.micro,
+                                             'releaselevel': sys.version_info.releaselevel,
+                                             'serial': sys.version_info.serial},
+                            'packages': get_installed_packages()}
+        # sys.path may be changed at runtime
+        return dict(self._python, pythonpath=list(sys.path))
 
     def get_login(self):  # type: () -> str
         # Based on https://github.com/gitpython-developers/GitPython/pull/43/
@@ -89,4 +170,4 @@ class EnvironmentDump:
                 'cwd': os.getcwd(),
                 'user': self.get_login(),
                 'pid': os.getpid(),
-                'environ': safe_dict(os.environ)}
+                'environ': safe_environ(self.redactor)}
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    from typing import Any, Optional
+except ImportError:
+    # for python2
+    pass
+
+import flask
+
+from .healthcheck import HealthCheck
+from .streaming import CONTENT_TYPES, negotiate
+
+
+class FlaskHandler(object):
+    """Flask view exposing a ``HealthCheck`` or an ``EnvironmentDump``.
+
+    URL variables are passed to ``run``, and the ``If-None-Match`` header is
+    forwarded to ``HealthCheck.run`` so unchanged responses get a 304::
+
+        app.add_url_rule('/healthcheck', 'healthcheck', view_func=FlaskHandler(health))
+        app.add_url_rule('/healthcheck/<check>', 'check', view_func=FlaskHandler(health))
+
+    Health check results are streamed as they complete when the request
+    accepts ``application/x-ndjson`` or ``text/event-stream``, or always
+    with ``stream='ndjson'`` or ``stream='sse'``, see ``HealthCheck.stream``.
+    """
+
+    def __init__(self, checker, stream=None):  # type: (Any, Optional[str]) -> None
+        self.checker = checker
+        self.stream = stream
+        self.__name__ = type(checker).__name__.lower()
+
+    def __call__(self, *args, **kwargs):  # type: (*Any, **Any) -> Any
+        if isinstance(self.checker, HealthCheck):
+            format = self.stream or negotiate(flask.request.headers.get('Accept'))
+            if format:
+                kwargs['format'] = format
+                return flask.Response(self.checker.stream(*args, **kwargs),
+                                      content_type=CONTENT_TYPES[format], headers={'Cache-Control': 'no-cache'})
+            kwargs.setdefault('if_none_match', flask.request.headers.get('If-None-Match'))
+        return self.checker.run(*args, **kwargs)
@@ -1,18 +1,43 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import json
+import hashlib
+import itertools
 import logging
 import socket
 import time
 try:
-    from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
+    from .registry import Selection  # noqa
 except ImportError:
     # for python2
     pass
 
 import six
 
+from .cache import Cache, DictCache
+from .circuitbreaker import CircuitBreaker
+from .history import History
+from .hooks import Hooks, fire
+from .registry import Check, CheckerList, CheckRegistry
+from .result import CheckResult, as_dicts, dumpb
+from .scheduler import RefreshScheduler
+from .serializers import get_serializer
+from .singleflight import SingleFlight
+from .streaming import get_encoder
 from .timeout import timeout
+from .ttl import TTLPolicy
+
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+except ImportError:
+    # for python2 without the futures backport
+    ThreadPoolExecutor = as_completed = wait = None  # type: ignore[assignment, misc]
+
+try:
+    from contextvars import copy_context
+except ImportError:
+    # python < 3.7, context is not propagated to the pool
+    copy_context = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -21,46 +46,83 @@ try:
 except Exception:
     pass
 
+try:
+    perf_counter = time.perf_counter
+except AttributeError:
+    # for python2
+    perf_counter = time.time
+
 
 def basic_exception_handler(_, exc):  # type: (Any, Exception) -> Tuple[bool, str]
     return False, str(exc)
 
 
+default_serializer = get_serializer()
+
+
+def render(serializer, data, results):  # type: (Any, Dict[str, Any], Any) -> str
+    """Encode ``data`` with a ``results`` list made of the JSON document of each result."""
+    if not isinstance(results, list):
+        data['results'] = results
+        return serializer.dumps(data)
+    body = serializer.dumpb(data)
+    # some encoders end documents with a new line
+    end = body.rindex(b'}')
+    separator = b'' if body[:end].rstrip().endswith(b'{') else b','
+    fragments = b','.join(dumpb(serializer, result) for result in results)
+    message = body[:end] + separator + b'"results":[' + fragments + b']' + body[end:]
+    # str on python2 too, like serializer.dumps
+    return message if isinstance(message, str) else message.decode('utf-8')
+
+
 def json_success_handler(results, *args, **kw):  # type: (dict,*Any,**Any) -> str
+    serializer = kw.pop('serializer', None) or default_serializer
     data = {
         'hostname': socket.gethostname(),
         'status': 'success',
         'timestamp': time.time(),
-        'results': results,
     }
     data.update(kw)
-    return json.dumps(data)
+    return render(serializer, data, results)
 
 
 def json_failed_handler(results, *args, **kw):  # type: (dict, *Any, **Any) -> str
+    serializer = kw.pop('serializer', None) or default_serializer
     data = {
         'hostname': socket.gethostname(),
         'status': 'failure',
         'timestamp': time.time(),
-        'results': results,
     }
     data.update(kw)
-    return json.dumps(data)
+    return render(serializer, data, results)
+
+
+def etag_matches(if_none_match, etag):  # type: (str, str) -> bool
+    """Tell whether an ``If-None-Match`` header value matches ``etag``."""
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate == etag or candidate == 'W/' + etag:
+            return True
+    return False
 
 
 def check_reduce(passed, result):  # type: (bool, Mapping[str,bool]) -> bool
     return passed and result.get('passed')  # type: ignore[return-value]
 
 
-class HealthCheck:
+class HealthCheck(object):
     def __init__(self, success_status=200,
                  success_headers=None, success_handler=json_success_handler,
                  success_ttl=27, failed_status=500, failed_headers=None,
                  failed_handler=json_failed_handler, failed_ttl=9,
                  error_timeout=0,
                  exception_handler=basic_exception_handler, checkers=None,
+                 max_workers=0, executor=None, cache_response=False, serializer=None,
+                 metrics=None, circuit_breaker=None, ttl_policy=None, cache=None,
+                 deadline=0, history=None,
                  **kwargs):
-        self.cache = dict()
+        # results per check name, see cache.Cache
+        self.cache = DictCache() if cache is None else cache  # type: Cache
 
         self.success_status = success_status
         self.success_headers = success_headers or {'Content-Type': 'application/json'}
@@ -71,12 +133,55 @@ class HealthCheck:
         self.failed_headers = failed_headers or {'Content-Type': 'application/json'}
         self.failed_handler = failed_handler
         self.failed_ttl = float(failed_ttl or 0)
+        # optional ttl.TTLPolicy adding jitter to, or adapting, the ttls above
+        self.ttl_policy = ttl_policy  # type: Optional[TTLPolicy]
 
         self.error_timeout = error_timeout
 
         self.exception_handler = exception_handler
 
-        self.checkers = checkers or []
+        # used by the built-in json handlers, the fastest installed encoder by default
+        self.serializer = get_serializer(serializer)
+
+        # callbacks around check execution, see hooks.EVENTS
+        self.hooks = Hooks()
+        # optional metrics.Metrics recording latency, outcomes and cache usage
+        self.metrics = metrics
+        if metrics is not None:
+            self.hooks.register(metrics)
+
+        # optional history.History summarizing the last runs of each check in its results
+        self.history = history  # type: Optional[History]
+
+        # optional circuitbreaker.CircuitBreaker skipping checks that keep failing
+        self.circuit_breaker = circuit_breaker  # type: Optional[CircuitBreaker]
+
+        # cached results per selection, valid until a check result changes
+        self._aggregates = {}  # type: Dict[Tuple[str, ...], Tuple[int, float, list]]
+        self._generations = itertools.count()
+        self._generation = next(self._generations)
+
+        self.registry = CheckRegistry()
+        self._checkers = CheckerList(self)
+        for checker in checkers or []:
+            self.add_check(checker)
+
+        # seconds a run may take, checks still running then are reported as pending
+        self.deadline = float(deadline or 0)
+
+        # checks are executed concurrently when a pool is given, max_workers > 0 or a deadline is set
+        if (max_workers or deadline) and executor is None and ThreadPoolExecutor is None:
+            raise RuntimeError('Concurrent checks require the "futures" package on python2.')
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        self.scheduler = None  # type: Optional[RefreshScheduler]
+
+        # rendered responses per selection, reused while the results are the same
+        self.cache_response = cache_response
+        self._responses = {}  # type: Dict[Tuple[str, ...], Tuple[list, bytes, int, Dict[str, str]]]
+        self._flights = SingleFlight()
 
         self.functions = dict()
         # ads custom_sections on signature
@@ -84,47 +189,443 @@ class HealthCheck:
             if k not in self.functions:
                 self.add_section(k, v)
 
+    def add_hook(self, event, func):  # type:(str, Callable[..., Any]) -> None
+        """Call ``func`` on a check execution event, see ``hooks.EVENTS``."""
+        self.hooks.add(event, func)
+
     def add_section(self, name, func):  # type:(str, Callable[..., Tuple[bool,str]]) -> None
         if name in self.functions:
             raise Exception('The name "{}" is already taken.'.format(name))
         self.functions[name] = func
 
-    def add_check(self, func):  # type:(Callable[..., Tuple[bool,str]]) -> None
-        self.checkers.append(func)
-
-    def run(self, check=None):  # type:(Optional[Callable[..., Tuple[bool,str]]]) -> Tuple[str, int, Dict[str, str]]
-        results = []
-        filtered = [c for c in self.checkers if check is None or c.__name__ == check]
-        for checker in filtered:
-            if checker in self.cache and self.cache[checker].get('expires') >= time.time():
-                result = self.cache[checker]
+    def add_check(self, func, name=None, tags=None, depends_on=None):
+        # type:(Callable[..., Tuple[bool,str]], Optional[str], Optional[Iterable[str]], Selection) -> Check
+        """Register a check function.
+
+        :param func: Check function returning a ``(passed, output)`` tuple
+        :param name: Unique name, defaults to the function name (suffixed if already taken)
+        :param tags: Groups the check belongs to, e.g. ``('readiness',)``
+        :param depends_on: Name or names of registered checks that must pass first,
+            the check is skipped when one of them fails
+        """
+        check = self.registry.add(func, name=name, tags=tags, depends_on=depends_on)
+        self._checkers.refresh(self.registry)
+        self._changed()
+        return check
+
+    def remove_check(self, name):  # type:(str) -> Check
+        check = self.registry.remove(name)
+        self.cache.pop(name, None)
+        if self.metrics is not None:
+            self.metrics.forget(name)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.forget(name)
+        if self.ttl_policy is not None:
+            self.ttl_policy.forget(name)
+        if self.history is not None:
+            self.history.forget(name)
+        # rendered responses and aggregates of the selections including the check
+        for cached in (self._responses, self._aggregates):
+            for key in [key for key in list(cached) if name in key]:
+                cached.pop(key, None)
+        self._checkers.refresh(self.registry)
+        self._changed()
+        return check
+
+    @property
+    def checkers(self):  # type:() -> CheckerList
+        """Functions of the registered checks, see ``CheckerList``."""
+        return self._checkers
+
+    @checkers.setter
+    def checkers(self, checkers):  # type:(Iterable[Callable[..., Tuple[bool,str]]]) -> None
+        checkers = list(checkers)
+        self._checkers.clear()
+        for checker in checkers:
+            self.add_check(checker)
+
+    def run(self, check=None, tags=None, if_none_match=None, deadline=None):
+        # type:(Selection, Selection, Optional[str], Optional[float]) -> Tuple[Union[str, bytes], int, Dict[str,str]]
+        """Run the selected checks, reusing cached results, and render the response.
+
+        :param check: Name or names of the checks to run
+        :param tags: Tag or tags of the checks to run
+        :param if_none_match: ``If-None-Match`` request header, answered with a 304
+            when ``cache_response`` is enabled and the response did not change
+        :param deadline: Seconds the checks may take, overrides the instance ``deadline``
+        """
+        results = self.results(check, tags, deadline)
+        if not self.cache_response:
+            return self.respond(results)
+        return self.respond_cached(results, if_none_match)
+
+    def stream(self, check=None, tags=None, format='ndjson'):  # type:(Selection, Selection, str) -> Iterator[bytes]
+        """Run the selected checks and yield each result as soon as it is known.
+
+        Cached results come first, then the others as they complete, followed by
+        a summary with the status, the number of passed and failed checks and
+        the custom sections. Each item is encoded on its own, see ``streaming``.
+
+        :param format: ``'ndjson'`` (a JSON document per line) or ``'sse'`` (server-sent events)
+        """
+        encode = get_encoder(format)
+        serializer = self.serializer
+        hooks = self.hooks
+        filtered = self.select(check, tags)
+        if hooks.on_run_start:
+            fire(hooks.on_run_start, filtered)
+
+        results, misses = self.cached_results(filtered)
+        for result in results:
+            if result is not None:
+                yield encode(serializer, 'result', result)
+        for index, result in self.iter_checks([filtered[i] for i in misses]):
+            results[misses[index]] = result
+            yield encode(serializer, 'result', result)
+
+        if hooks.on_run_end:
+            fire(hooks.on_run_end, filtered, results)
+        yield encode(serializer, 'summary', self.summarize(results))
+
+    def summarize(self, results):  # type:(list) -> Dict[str, Any]
+        """Last item of a stream."""
+        passed = sum(1 for result in results if result['passed'])
+        summary = {'hostname': socket.gethostname(),
+                   'status': 'success' if passed == len(results) else 'failure',
+                   'timestamp': time.time(),
+                   'passed': passed,
+                   'failed': len(results) - passed}
+        summary.update(self.custom_sections())
+        return summary
+
+    def select(self, check=None, tags=None):  # type:(Selection, Selection) -> List[Check]
+        return self.registry.select(check, tags)
+
+    def results(self, check=None, tags=None, deadline=None):  # type:(Selection, Selection, Optional[float]) -> list
+        hooks = self.hooks
+        filtered = self.select(check, tags)
+        if hooks.on_run_start:
+            fire(hooks.on_run_start, filtered)
+
+        key = tuple(c.name for c in filtered)
+        generation = self._generation
+        aggregate = self._aggregates.get(key)
+        if aggregate is not None and aggregate[0] == generation and (self.refreshing or aggregate[1] >= time.time()):
+            # a copy, callers may change the list they get
+            results = list(aggregate[2])
+            if hooks.on_cache_hit:
+                for checker, result in zip(filtered, results):
+                    fire(hooks.on_cache_hit, checker, result)
+        else:
+            results, misses = self.cached_results(filtered)
+            # keep results in registration order whatever order the misses finish in
+            deadline = self.deadline if deadline is None else deadline
+            for index, result in zip(misses, self.run_checks([filtered[i] for i in misses], deadline=deadline)):
+                results[index] = result
+
+            if not misses:
+                # pending results are never part of it, as a deadline only applies to misses
+                expires = min([r['expires'] for r in results] or [float('inf')])
+                self._aggregates[key] = (generation, expires, list(results))
+
+        if hooks.on_run_end:
+            fire(hooks.on_run_end, filtered, results)
+        return results
+
+    def _changed(self):  # type:() -> None
+        self._generation = next(self._generations)
+
+    def cached_results(self, checkers):  # type:(list) -> Tuple[list, list]
+        """Look the checkers up in the cache.
+
+        Returns the results list, with ``None`` for every checker that must be
+        run again, and the indexes of those checkers.
+        """
+        results = [None] * len(checkers)  # type: list
+        misses = []
+        # the background scheduler keeps entries fresh, so any cached entry will do
+        now = 0 if self.refreshing else time.time()
+        for index, checker in enumerate(checkers):
+            cached = self.cache.get(checker.name)
+            if cached is not None and cached.get('expires') >= now:
+                results[index] = cached
             else:
-                result = self.run_check(checker)
-                self.cache[checker] = result
-            results.append(result)
-
+                misses.append(index)
+        hooks = self.hooks
+        if hooks.on_cache_hit or hooks.on_cache_miss:
+            for checker, result in zip(checkers, results):
+                if result is None:
+                    fire(hooks.on_cache_miss, checker)
+                else:
+                    fire(hooks.on_cache_hit, checker, result)
+        return results, misses
+
+    def respond_cached(self, results, if_none_match=None):
+        # type:(list, Optional[str]) -> Tuple[bytes, int, Dict[str, str]]
+        """Render the response as bytes with an ``ETag``, once per set of results.
+
+        The body, including custom sections and its timestamp, is rendered when
+        one of the results changes and served as is until then.
+        """
+        key = tuple(r['checker'] for r in results)
+        rendered = self._responses.get(key)
+        if rendered is None or any(old is not new for old, new in zip(rendered[0], results)):
+            message, status, headers = self.respond(results)
+            body = message if isinstance(message, bytes) else message.encode('utf-8')
+            headers = dict(headers, ETag='"{}"'.format(hashlib.sha1(body).hexdigest()))
+            rendered = self._responses[key] = (list(results), body, status, headers)
+
+        _, body, status, headers = rendered
+        if if_none_match and status < 300 and etag_matches(if_none_match, headers['ETag']):
+            return b'', 304, headers
+        return body, status, headers
+
+    def custom_sections(self):  # type:() -> Dict[str, Any]
         custom_section = dict()
         for (name, func) in six.iteritems(self.functions):
             try:
                 custom_section[name] = func() if callable(func) else func
             except Exception:
                 pass
+        return custom_section
+
+    def respond(self, results):  # type:(list) -> Tuple[str, int, Dict[str, str]]
+        custom_section = self.custom_sections()
 
         passed = reduce(check_reduce, results, True)
 
         if passed:
             message = 'OK'
             if self.success_handler:
-                message = self.success_handler(results, **custom_section)
+                message = self.handle(self.success_handler, results, custom_section)
 
             return message, self.success_status, self.success_headers
         message = 'NOT OK'
         if self.failed_handler:
-            message = self.failed_handler(results, **custom_section)
+            message = self.handle(self.failed_handler, results, custom_section)
         return message, self.failed_status, self.failed_headers
 
-    def run_check(self, checker):  # type:(Callable) -> Dict[str, Union[str, float, bool]]
-        start_time = time.time()
+    def handle(self, handler, results, custom_section):  # type:(Callable, list, Dict[str, Any]) -> Any
+        if handler in (json_success_handler, json_failed_handler):
+            return handler(results, serializer=self.serializer, **custom_section)
+        return handler(as_dicts(results), **custom_section)
+
+    @property
+    def executor(self):  # type:() -> Optional[Any]
+        """Thread pool shared by every run, created on first use."""
+        if self._executor is None and (self.max_workers or self.deadline):
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers or None)
+        return self._executor
+
+    @property
+    def refreshing(self):  # type:() -> bool
+        return self.scheduler is not None and self.scheduler.running
+
+    def start_refresh(self, lead_time=1.0, min_interval=1.0):  # type:(float, float) -> RefreshScheduler
+        """Refresh every check in the background before its cached result expires.
+
+        From then on ``run`` only reads the cache (stale-while-revalidate).
+        """
+        self.stop_refresh()
+        self.scheduler = RefreshScheduler(self, lead_time=lead_time, min_interval=min_interval)
+        self.scheduler.start()
+        return self.scheduler
+
+    def stop_refresh(self, wait=True):  # type:(bool) -> None
+        if self.scheduler is not None:
+            self.scheduler.stop(wait=wait)
+            self.scheduler = None
+
+    def shutdown(self, wait=True):  # type:(bool) -> None
+        """Stop the background refresh and release the thread pool if it was created by this instance."""
+        self.stop_refresh(wait=wait)
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def run_checks(self, checkers, force=False, deadline=0):  # type:(list, bool, float) -> list
+        """Run the given checkers and cache their results.
+
+        Checkers are run concurrently when a pool is configured, and results are
+        returned in the same order as ``checkers``. See ``execute``.
+
+        With a ``deadline``, checkers still running after that many seconds get
+        a pending result and keep running in the pool to fill the cache.
+        """
+        if self.registry.has_dependencies:
+            results = [None] * len(checkers)  # type: list
+            for index, result in self._iter_graph(checkers, force, deadline):
+                results[index] = result
+            return results
+        if deadline > 0:
+            return self._run_checks_until(checkers, force, deadline)
+        executor = self.executor
+        if executor is None or len(checkers) < 2:
+            return [self.execute(checker, force) for checker in checkers]
+        if copy_context is None:
+            return list(executor.map(self.execute, checkers, [force] * len(checkers)))
+        # run each check in a copy of the caller context, e.g. to keep tracing spans
+        contexts = [copy_context() for _ in checkers]
+        return list(executor.map(lambda context, checker: context.run(self.execute, checker, force),
+                                 contexts, checkers))
+
+    def iter_checks(self, checkers):  # type:(list) -> Iterator[Tuple[int, Mapping[str, Any]]]
+        """Run the given checkers and yield ``(index, result)`` as each one completes."""
+        if self.registry.has_dependencies:
+            for item in self._iter_graph(checkers, False, 0):
+                yield item
+            return
+        executor = self.executor
+        if executor is None or len(checkers) < 2:
+            for index, checker in enumerate(checkers):
+                yield index, self.execute(checker)
+            return
+        futures = dict((self._submit(executor, checker, False), index) for index, checker in enumerate(checkers))
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def _pool(self):  # type:() -> Any
+        executor = self.executor
+        if executor is None:
+            if ThreadPoolExecutor is None:
+                raise RuntimeError('Concurrent checks require the "futures" package on python2.')
+            executor = self._executor = ThreadPoolExecutor()
+        return executor
+
+    def _submit(self, executor, checker, force):  # type:(Any, Callable, bool) -> Any
+        if copy_context is None:
+            return executor.submit(self.execute, checker, force)
+        # run each check in a copy of the caller context, e.g. to keep tracing spans
+        return executor.submit(copy_context().run, self.execute, checker, force)
+
+    def _run_checks_until(self, checkers, force, deadline):  # type:(list, bool, float) -> list
+        executor = self._pool()
+        futures = [self._submit(executor, checker, force) for checker in checkers]
+        wait(futures, timeout=deadline)
+        return [future.result() if future.done() else self.make_pending(checker, deadline)
+                for checker, future in zip(checkers, futures)]
+
+    def _iter_graph(self, checkers, force, deadline):
+        # type:(list, bool, float) -> Iterator[Tuple[int, Mapping[str, Any]]]
+        """Run checkers after their dependencies and yield ``(index, result)`` as each one completes.
+
+        Dependencies that are not among ``checkers`` are run too, or read from
+        the cache, but not yielded. A check is skipped as soon as one of its
+        dependencies fails, and independent branches run concurrently when a
+        pool is configured.
+        """
+        wanted = dict((checker.name, index) for index, checker in enumerate(checkers))
+        remaining = self.registry.closure(checkers)
+        results = {}  # type: Dict[str, Mapping[str, Any]]
+
+        executor = self._pool() if deadline > 0 else self.executor
+        if executor is None:
+            for check in remaining:
+                result = self.skip(check, results) or self.execute(check, force and check.name in wanted)
+                results[check.name] = result
+                if check.name in wanted:
+                    yield wanted[check.name], result
+            return
+
+        stop = time.time() + deadline if deadline > 0 else None
+        running = {}  # type: Dict[Any, Check]
+        # dependencies still running once every wanted check is known complete in the background
+        unknown = set(wanted)
+        while unknown:
+            waiting = []
+            # registration order is a topological order, so a skip reaches dependents in the same pass
+            for check in remaining:
+                skipped = self.skip(check, results)
+                if skipped is None:
+                    if any(name not in results for name in check.depends_on):
+                        waiting.append(check)
+                    else:
+                        running[self._submit(executor, check, force and check.name in wanted)] = check
+                    continue
+                results[check.name] = skipped
+                if check.name in wanted:
+                    unknown.discard(check.name)
+                    yield wanted[check.name], skipped
+            remaining = waiting
+            if not running or not unknown:
+                break
+
+            timeout = None if stop is None else max(stop - time.time(), 0)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # the deadline passed, running checks complete in the background
+                for check in list(running.values()) + remaining:
+                    if check.name in wanted:
+                        yield wanted[check.name], self.make_pending(check, deadline)
+                return
+            for future in done:
+                check = running.pop(future)
+                result = results[check.name] = future.result()
+                if check.name in wanted:
+                    unknown.discard(check.name)
+                    yield wanted[check.name], result
+
+    def skip(self, check, results):  # type:(Check, Mapping[str, Mapping[str, Any]]) -> Optional[CheckResult]
+        """Cache and return a skipped result when a dependency of ``check`` failed, None otherwise."""
+        for name in check.depends_on:
+            dependency = results.get(name)
+            if dependency is not None and not dependency['passed']:
+                result = self.make_skipped(check, name, dependency)
+                self.store(check.name, result)
+                return result
+        return None
+
+    def make_skipped(self, check, name, dependency):  # type:(Check, str, Mapping[str, Any]) -> CheckResult
+        # decided again with the dependency
+        return CheckResult(check.name, 'skipped: dependency {} failed'.format(name), False, time.time(),
+                           dependency['expires'], 0.0, skipped=True)
+
+    def make_pending(self, checker, deadline):  # type:(Callable, float) -> CheckResult
+        """Result of a check still running when the deadline passed, failed and not cached."""
+        logger.warning('Health check "%s" did not finish within %ss', checker.__name__, deadline)
+        timestamp = time.time()
+        return CheckResult(checker.__name__, 'Pending: deadline of {}s exceeded'.format(deadline), False,
+                           timestamp, timestamp, deadline, pending=True)
+
+    def execute(self, checker, force=False):  # type:(Callable, bool) -> Mapping[str, Any]
+        """Run a checker and cache its result, once for all concurrent callers.
+
+        Callers arriving while the checker is running wait for it and share its
+        result. Unless ``force`` is set, a result cached by a previous flight in
+        the meantime is returned instead of running the checker again.
+        """
+        return self._flights.do(checker.__name__, self._execute, checker, force)
+
+    def _execute(self, checker, force):  # type:(Callable, bool) -> Mapping[str, Any]
+        cached = self.cache.get(checker.__name__)
+        if not force and cached is not None and cached.get('expires') >= time.time():
+            return cached
+        if self.circuit_breaker is not None:
+            short = self.circuit_breaker.short_circuit(checker.__name__, cached)
+            if short is not None:
+                return short  # type: ignore[return-value]
+        hooks = self.hooks
+        if hooks.on_check_start:
+            fire(hooks.on_check_start, checker)
+        result = self.run_check(checker)
+        self.store(checker.__name__, result)
+        if hooks.on_check_end:
+            fire(hooks.on_check_end, checker, result)
+        return result
+
+    def store(self, name, result):  # type:(str, MutableMapping[str, Any]) -> None
+        """Cache the result of a check run."""
+        if not result.get('skipped'):
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.annotate(name, result)
+            if self.history is not None:
+                self.history.record(result)
+                result['history'] = self.history.stats(name)
+        self.cache[name] = result
+        self._changed()
+
+    def run_check(self, checker):  # type:(Callable) -> CheckResult
+        start_time = perf_counter()
 
         try:
             if self.error_timeout > 0:
@@ -135,10 +636,12 @@ class HealthCheck:
             logger.error(exc)
             passed, output = self.exception_handler(checker, exc)
 
-        end_time = time.time()
-        elapsed_time = end_time - start_time
+        return self.make_result(checker, passed, output, perf_counter() - start_time)
+
+    def make_result(self, checker, passed, output, elapsed_time):
+        # type:(Callable, bool, Any, float) -> CheckResult
         # Reduce to 6 decimal points to have consistency with timestamp
-        elapsed_time = float('{:.6f}'.format(elapsed_time))
+        elapsed_time = round(elapsed_time, 6)
 
         if passed:
             msg = 'Health check "{}" passed'.format(checker.__name__)
@@ -148,15 +651,7 @@ class HealthCheck:
             logger.error(msg)
 
         timestamp = time.time()
-        if passed:
-            expires = timestamp + self.success_ttl
-        else:
-            expires = timestamp + self.failed_ttl
-
-        result = {'checker': checker.__name__,
-                  'output': output,
-                  'passed': passed,
-                  'timestamp': timestamp,
-                  'expires': expires,
-                  'response_time': elapsed_time}
-        return result
+        ttl = self.success_ttl if passed else self.failed_ttl
+        if self.ttl_policy is not None:
+            ttl = self.ttl_policy.ttl(checker.__name__, passed, ttl, elapsed_time)
+        return CheckResult(checker.__name__, output, passed, timestamp, timestamp + ttl, elapsed_time)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+from array import array
+from collections import OrderedDict
+try:
+    from typing import Any, Dict, List, Mapping, Optional, Tuple
+except ImportError:
+    # for python2
+    pass
+
+from .serializers import get_serializer
+
+PERCENTILES = (50, 95, 99)
+
+
+class _Ring(object):
+    """Last ``size`` runs of a check, in fixed size arrays."""
+    __slots__ = ('timestamps', 'latencies', 'passed', 'position', 'count', 'stats')
+
+    def __init__(self, size):  # type: (int) -> None
+        self.timestamps = array('d', [0.0]) * size
+        self.latencies = array('d', [0.0]) * size
+        self.passed = bytearray(size)
+        self.position = 0
+        self.count = 0
+        # computed on demand, reset by every new run
+        self.stats = None  # type: Optional[Dict[str, Any]]
+
+    def append(self, timestamp, latency, passed):  # type: (float, float, bool) -> None
+        size = len(self.passed)
+        position = self.position
+        self.timestamps[position] = timestamp
+        self.latencies[position] = latency
+        self.passed[position] = 1 if passed else 0
+        self.position = (position + 1) % size
+        self.count = min(self.count + 1, size)
+        self.stats = None
+
+    def ordered(self):  # type: () -> Tuple[List[float], List[float], bytearray]
+        """The runs from the oldest to the newest."""
+        start = self.position if self.count == len(self.passed) else 0
+        indexes = [(start + i) % len(self.passed) for i in range(self.count)]
+        return ([self.timestamps[i] for i in indexes], [self.latencies[i] for i in indexes],
+                bytearray(self.passed[i] for i in indexes))
+
+
+def percentile(ordered, rank):  # type: (List[float], float) -> float
+    """Nearest-rank percentile of a sorted list."""
+    index = max(0, min(len(ordered) - 1, int(-(-rank * len(ordered) // 100)) - 1))
+    return ordered[index]
+
+
+class History(object):
+    """Keep the last runs of every check and summarize them.
+
+    Each check gets a ring buffer of ``size`` runs made of two arrays of
+    doubles and a bytearray, about 17 bytes per run, so memory is bounded
+    whatever the uptime. Pass it to ``HealthCheck(history=...)`` to add a
+    ``history`` summary to every result; ``run`` renders the summaries as
+    JSON, so a History object can be served by the handlers.
+
+    :param size: Number of runs kept per check
+    :param serializer: JSON encoder used by ``run``, see ``serializers.get_serializer``
+    """
+
+    def __init__(self, size=100, serializer=None):  # type: (int, Any) -> None
+        if size < 1:
+            raise ValueError('size must be positive, got {}.'.format(size))
+        self.size = size
+        self.serializer = get_serializer(serializer)
+        self._lock = threading.Lock()
+        self._rings = OrderedDict()  # type: OrderedDict[str, _Ring]
+
+    def record(self, result):  # type: (Mapping[str, Any]) -> None
+        name = result['checker']
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = self._rings[name] = _Ring(self.size)
+            ring.append(result['timestamp'], result['response_time'], bool(result['passed']))
+
+    def forget(self, name):  # type: (str) -> None
+        with self._lock:
+            self._rings.pop(name, None)
+
+    def stats(self, name):  # type: (str) -> Optional[Dict[str, Any]]
+        """Summary of the runs of a check, None when it never ran.
+
+        ``samples`` runs between ``since`` and ``until``, latency percentiles
+        in seconds, the failure rate and the number of times the check went
+        from passing to failing or back (``flaps``). The returned dictionary is
+        shared until the next run and must not be modified.
+        """
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                return None
+            if ring.stats is None:
+                ring.stats = self._summarize(ring)
+            return ring.stats
+
+    def _summarize(self, ring):  # type: (_Ring) -> Dict[str, Any]
+        timestamps, latencies, passed = ring.ordered()
+        latencies.sort()
+        failures = len(passed) - sum(passed)
+        stats = OrderedDict([('samples', ring.count),
+                             ('since', timestamps[0]),
+                             ('until', timestamps[-1])])  # type: Dict[str, Any]
+        for rank in PERCENTILES:
+            stats['p{}'.format(rank)] = percentile(latencies, rank)
+        stats['failure_rate'] = float(failures) / ring.count
+        stats['flaps'] = sum(1 for previous, current in zip(passed, passed[1:]) if previous != current)
+        return stats
+
+    def all_stats(self):  # type: () -> Dict[str, Any]
+        return OrderedDict((name, self.stats(name)) for name in list(self._rings))
+
+    def run(self, name=None, *args, **kwargs):  # type: (Optional[str], *Any, **Any) -> Tuple[str, int, Dict[str, str]]
+        """Render the summaries of every check, or of the check ``name``, as JSON."""
+        headers = {'Content-Type': 'application/json'}
+        if not name:
+            return self.serializer.dumps(self.all_stats()), 200, headers
+        stats = self.stats(name)
+        if stats is None:
+            return self.serializer.dumps({'error': 'Unknown check "{}"'.format(name)}), 404, headers
+        return self.serializer.dumps(stats), 200, headers
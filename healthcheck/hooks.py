@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+try:
+    from typing import Any, Callable, Tuple
+except ImportError:
+    # for python2
+    pass
+
+logger = logging.getLogger(__name__)
+
+#: on_run_start(checks), on_run_end(checks, results), on_check_start(check),
+#: on_check_end(check, result), on_cache_hit(check, result), on_cache_miss(check)
+EVENTS = ('on_run_start', 'on_run_end', 'on_check_start', 'on_check_end', 'on_cache_hit', 'on_cache_miss')
+
+
+class Hooks(object):
+    """Callbacks fired around check execution.
+
+    Each event holds a tuple of callbacks, empty when unused, so call sites
+    only pay for a truth test. Tuples are replaced rather than mutated, which
+    keeps firing safe while hooks are added from another thread.
+    """
+    __slots__ = EVENTS
+
+    def __init__(self):  # type: () -> None
+        for event in EVENTS:
+            setattr(self, event, ())
+
+    def add(self, event, func):  # type: (str, Callable[..., Any]) -> None
+        if event not in EVENTS:
+            raise ValueError('Unknown hook "{}", expected one of {}.'.format(event, ', '.join(EVENTS)))
+        setattr(self, event, getattr(self, event) + (func,))
+
+    def remove(self, event, func):  # type: (str, Callable[..., Any]) -> None
+        setattr(self, event, tuple(f for f in getattr(self, event) if f != func))
+
+    def register(self, observer):  # type: (Any) -> None
+        """Add every method of ``observer`` named after an event."""
+        for event in EVENTS:
+            func = getattr(observer, event, None)
+            if func is not None:
+                self.add(event, func)
+
+    def unregister(self, observer):  # type: (Any) -> None
+        for event in EVENTS:
+            func = getattr(observer, event, None)
+            if func is not None:
+                self.remove(event, func)
+
+
+def fire(callbacks, *args):  # type: (Tuple[Callable[..., Any], ...], *Any) -> None
+    """Call each callback, logging instead of raising its errors."""
+    for callback in callbacks:
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception('Health check hook %r failed', callback)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import bisect
+import threading
+from collections import OrderedDict
+try:
+    from typing import Any, Dict, List, Mapping, Sequence, Tuple
+except ImportError:
+    # for python2
+    pass
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):  # type: (str) -> str
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _number(value):  # type: (float) -> str
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CheckMetrics(object):
+    __slots__ = ('buckets', 'duration_sum', 'passed', 'failed', 'hits', 'misses', 'up', 'last_success')
+
+    def __init__(self, size):  # type: (int) -> None
+        self.buckets = [0] * size
+        self.duration_sum = 0.0
+        self.passed = 0
+        self.failed = 0
+        self.hits = 0
+        self.misses = 0
+        self.up = None  # type: Any
+        self.last_success = None  # type: Any
+
+
+class Metrics(object):
+    """Collect check metrics and expose them in the Prometheus text format.
+
+    Records, per check, a latency histogram, passed/failed counters, cache
+    hits and misses, the outcome of the last run and the time of the last
+    success. Pass it to ``HealthCheck(metrics=...)``, which registers its
+    hooks. ``run`` renders the metrics, so a Metrics object can be served by
+    ``TornadoHandler``, ``FlaskHandler`` or any view returning its result.
+
+    :param prefix: Prefix of every metric name
+    :param buckets: Upper bounds of the latency histogram buckets, in seconds
+    """
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, prefix='healthcheck', buckets=DEFAULT_BUCKETS):  # type: (str, Sequence[float]) -> None
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._checks = OrderedDict()  # type: OrderedDict[str, _CheckMetrics]
+
+    def _get(self, name):  # type: (str) -> _CheckMetrics
+        check = self._checks.get(name)
+        if check is None:
+            check = self._checks.setdefault(name, _CheckMetrics(len(self.buckets) + 1))
+        return check
+
+    # hooks, see HealthCheck.hooks
+
+    def on_check_end(self, check, result):  # type: (Any, Mapping[str, Any]) -> None
+        self.observe(result)
+
+    def on_cache_hit(self, check, result):  # type: (Any, Mapping[str, Any]) -> None
+        self.cache_hit(check.__name__)
+
+    def on_cache_miss(self, check):  # type: (Any) -> None
+        self.cache_miss(check.__name__)
+
+    def observe(self, result):  # type: (Mapping[str, Any]) -> None
+        """Record the result of a check run."""
+        name, elapsed = result['checker'], result['response_time']
+        with self._lock:
+            check = self._get(name)
+            check.buckets[bisect.bisect_left(self.buckets, elapsed)] += 1
+            check.duration_sum += elapsed
+            check.up = bool(result['passed'])
+            if check.up:
+                check.passed += 1
+                check.last_success = result['timestamp']
+            else:
+                check.failed += 1
+
+    def cache_hit(self, name):  # type: (str) -> None
+        with self._lock:
+            self._get(name).hits += 1
+
+    def cache_miss(self, name):  # type: (str) -> None
+        with self._lock:
+            self._get(name).misses += 1
+
+    def forget(self, name):  # type: (str) -> None
+        with self._lock:
+            self._checks.pop(name, None)
+
+    def render(self):  # type: () -> str
+        prefix = self.prefix
+        with self._lock:
+            checks = [(_escape(name), check) for name, check in self._checks.items()]
+            lines = []  # type: List[str]
+
+            lines.append('# HELP {}_check_duration_seconds Time spent running the check.'.format(prefix))
+            lines.append('# TYPE {}_check_duration_seconds histogram'.format(prefix))
+            for name, check in checks:
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), check.buckets):
+                    cumulative += count
+                    lines.append('{}_check_duration_seconds_bucket{{check="{}",le="{}"}} {}'.format(
+                        prefix, name, _number(bound), cumulative))
+                lines.append('{}_check_duration_seconds_sum{{check="{}"}} {}'.format(
+                    prefix, name, _number(check.duration_sum)))
+                lines.append('{}_check_duration_seconds_count{{check="{}"}} {}'.format(prefix, name, cumulative))
+
+            lines.append('# HELP {}_check_runs_total Check runs by outcome.'.format(prefix))
+            lines.append('# TYPE {}_check_runs_total counter'.format(prefix))
+            for name, check in checks:
+                lines.append('{}_check_runs_total{{check="{}",outcome="passed"}} {}'.format(prefix, name, check.passed))
+                lines.append('{}_check_runs_total{{check="{}",outcome="failed"}} {}'.format(prefix, name, check.failed))
+
+            lines.append('# HELP {}_check_cache_requests_total Check lookups by cache result.'.format(prefix))
+            lines.append('# TYPE {}_check_cache_requests_total counter'.format(prefix))
+            for name, check in checks:
+                lines.append('{}_check_cache_requests_total{{check="{}",result="hit"}} {}'.format(
+                    prefix, name, check.hits))
+                lines.append('{}_check_cache_requests_total{{check="{}",result="miss"}} {}'.format(
+                    prefix, name, check.misses))
+
+            lines.append('# HELP {}_check_up Whether the last run of the check passed.'.format(prefix))
+            lines.append('# TYPE {}_check_up gauge'.format(prefix))
+            for name, check in checks:
+                if check.up is not None:
+                    lines.append('{}_check_up{{check="{}"}} {}'.format(prefix, name, int(check.up)))
+
+            lines.append('# HELP {}_check_last_success_timestamp_seconds Time of the last passed run.'.format(prefix))
+            lines.append('# TYPE {}_check_last_success_timestamp_seconds gauge'.format(prefix))
+            for name, check in checks:
+                if check.last_success is not None:
+                    lines.append('{}_check_last_success_timestamp_seconds{{check="{}"}} {}'.format(
+                        prefix, name, _number(check.last_success)))
+
+        return '\n'.join(lines) + '\n'
+
+    def run(self, *args, **kwargs):  # type: (*Any, **Any) -> Tuple[str, int, Dict[str, str]]
+        return self.render(), 200, {'Content-Type': self.content_type}
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+from collections import OrderedDict
+try:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+    # a name or tag, or several of them
+    Selection = Optional[Union[str, Iterable[str]]]
+except ImportError:
+    # for python2
+    pass
+
+import six
+
+
+class Check(object):
+    """A check function registered under a unique name, a set of tags and its prerequisites."""
+
+    def __init__(self, func, name, tags=(), index=0, depends_on=()):
+        # type: (Callable[..., Tuple[bool, Any]], str, Iterable[str], int, Iterable[str]) -> None
+        self.func = func
+        self.name = name
+        self.tags = frozenset(tags)
+        self.index = index
+        self.depends_on = tuple(depends_on)
+
+    @property
+    def __name__(self):  # type: () -> str
+        # lets exception handlers and logs keep using ``checker.__name__``
+        return self.name
+
+    def __call__(self):  # type: () -> Tuple[bool, Any]
+        return self.func()
+
+    def __repr__(self):  # type: () -> str
+        return '<Check {!r} tags={}>'.format(self.name, sorted(self.tags))
+
+
+def _as_names(value):  # type: (Selection) -> Optional[Tuple[str, ...]]
+    if value is None:
+        return None
+    if isinstance(value, six.string_types):
+        return (value,)
+    return tuple(value)
+
+
+class CheckRegistry(object):
+    """Ordered registry of checks with O(1) lookup by name and by tag.
+
+    A check may only depend on checks registered before it, so the
+    registration order is also a valid execution order.
+    """
+
+    def __init__(self):  # type: () -> None
+        self._checks = OrderedDict()  # type: OrderedDict[str, Check]
+        self._tags = {}  # type: Dict[str, Set[str]]
+        self._counter = itertools.count()
+        # checks depending on each check
+        self._dependents = {}  # type: Dict[str, Set[str]]
+
+    @property
+    def has_dependencies(self):  # type: () -> bool
+        return bool(self._dependents)
+
+    def __len__(self):  # type: () -> int
+        return len(self._checks)
+
+    def __iter__(self):  # type: () -> Iterator[Check]
+        return iter(list(self._checks.values()))
+
+    def __contains__(self, name):  # type: (object) -> bool
+        return name in self._checks
+
+    def get(self, name):  # type: (str) -> Optional[Check]
+        return self._checks.get(name)
+
+    @property
+    def tags(self):  # type: () -> List[str]
+        return sorted(self._tags)
+
+    def add(self, func, name=None, tags=None, depends_on=None):
+        # type: (Callable[..., Tuple[bool, Any]], Optional[str], Optional[Iterable[str]], Selection) -> Check
+        depends_on = _as_names(depends_on) or ()
+        for dependency in depends_on:
+            if dependency not in self._checks:
+                raise Exception('Unknown dependency "{}", register it first.'.format(dependency))
+        if name is not None:
+            if name in self._checks:
+                raise Exception('The name "{}" is already taken.'.format(name))
+        else:
+            # unnamed checks sharing a function name (lambdas, partials) get a suffix
+            base = name = getattr(func, '__name__', None) or type(func).__name__
+            suffix = 1
+            while name in self._checks:
+                suffix += 1
+                name = '{}_{}'.format(base, suffix)
+
+        check = Check(func, name, _as_names(tags) or (), next(self._counter), depends_on)
+        self._checks[name] = check
+        for tag in check.tags:
+            self._tags.setdefault(tag, set()).add(name)
+        for dependency in check.depends_on:
+            self._dependents.setdefault(dependency, set()).add(name)
+        return check
+
+    def remove(self, name):  # type: (str) -> Check
+        dependents = self._dependents.get(name)
+        if dependents:
+            raise Exception('"{}" is required by "{}".'.format(name, '", "'.join(sorted(dependents))))
+        check = self._checks.pop(name)
+        for dependency in check.depends_on:
+            names = self._dependents[dependency]
+            names.discard(name)
+            if not names:
+                del self._dependents[dependency]
+        for tag in check.tags:
+            names = self._tags[tag]
+            names.discard(name)
+            if not names:
+                del self._tags[tag]
+        return check
+
+    def select(self, names=None, tags=None):  # type: (Selection, Selection) -> List[Check]
+        """Return the checks matching any of ``names`` or ``tags`` in registration order.
+
+        Unknown names and tags are ignored. Without names and tags every check is returned.
+        """
+        names, tags = _as_names(names), _as_names(tags)
+        if names is None and tags is None:
+            return list(self._checks.values())
+
+        selected = set(name for name in names or () if name in self._checks)
+        for tag in tags or ():
+            selected.update(self._tags.get(tag, ()))
+        return sorted((self._checks[name] for name in selected), key=lambda check: check.index)
+
+    def closure(self, checks):  # type: (Iterable[Check]) -> List[Check]
+        """Return ``checks`` and everything they depend on, in execution order."""
+        selected = {}  # type: Dict[str, Check]
+        pending = list(checks)
+        while pending:
+            check = pending.pop()
+            if check.name not in selected:
+                selected[check.name] = check
+                pending.extend(self._checks[name] for name in check.depends_on)
+        return sorted(selected.values(), key=lambda check: check.index)
+
+
+class CheckerList(list):
+    """Functions of the checks of a ``HealthCheck``, kept in sync with its registry.
+
+    ``append`` and ``extend`` register checks as ``add_check`` does,
+    ``remove`` unregisters one as ``remove_check`` and ``clear`` all of
+    them. Other changes would reorder or replace checks behind the
+    registry and raise ``TypeError``.
+    """
+
+    def __init__(self, health):  # type: (Any) -> None
+        super(CheckerList, self).__init__()
+        self._health = health
+
+    def refresh(self, registry):  # type: (CheckRegistry) -> None
+        list.__setitem__(self, slice(None), [check.func for check in registry])
+
+    def append(self, func):  # type: (Callable[..., Tuple[bool, Any]]) -> None
+        self._health.add_check(func)
+
+    def extend(self, funcs):  # type: (Iterable[Callable[..., Tuple[bool, Any]]]) -> None
+        for func in list(funcs):
+            self._health.add_check(func)
+
+    def __iadd__(self, funcs):  # type: ignore[override, misc]
+        self.extend(funcs)
+        return self
+
+    def remove(self, func):  # type: (Callable[..., Tuple[bool, Any]]) -> None
+        for check in self._health.registry:
+            if check.func == func:
+                self._health.remove_check(check.name)
+                return
+        raise ValueError('list.remove(x): x not in list')
+
+    def clear(self):  # type: () -> None
+        # dependents first
+        for check in reversed(list(self._health.registry)):
+            self._health.remove_check(check.name)
+
+    def _unsupported(self, *args, **kwargs):  # type: (*Any, **Any) -> Any
+        raise TypeError('Checks are changed with add_check and remove_check.')
+
+    __setitem__ = __delitem__ = __imul__ = insert = pop = sort = reverse = _unsupported  # type: ignore[assignment]
+    # python2 slices
+    __setslice__ = __delslice__ = _unsupported
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    from typing import Any, Dict, Iterator, Optional, Tuple
+except ImportError:
+    # for python2
+    pass
+try:
+    from collections.abc import ItemsView, KeysView, Mapping, MutableMapping, ValuesView  # only works on python 3.3+
+    _Base = MutableMapping
+except ImportError:
+    from collections import (ItemsView, KeysView, Mapping, MutableMapping,  # type: ignore[attr-defined, no-redef]
+                             ValuesView)
+    # the python2 ABCs have no __slots__, results would get a __dict__
+    _Base = object  # type: ignore[misc, assignment]
+
+FIELDS = ('checker', 'output', 'passed', 'timestamp', 'expires', 'response_time')
+
+
+class CheckResult(_Base):
+    """Result of a check run.
+
+    The six fields of every result are slots, anything else (``breaker``,
+    ``history``, ``skipped``...) goes to ``extra``. Results behave as
+    dictionaries for existing handlers and hooks, and compare equal to the
+    dictionary with the same items. They are not ``dict`` instances though:
+    custom handlers are given ``to_dict()`` copies. ``encode`` keeps the JSON
+    document of the result until the result changes, so a cached result is
+    encoded once.
+    """
+    __slots__ = FIELDS + ('extra', '_encoded')
+
+    def __init__(self, checker, output, passed, timestamp, expires, response_time, **extra):
+        # type: (str, Any, bool, float, float, float, **Any) -> None
+        self.checker = checker
+        self.output = output
+        self.passed = passed
+        self.timestamp = timestamp
+        self.expires = expires
+        self.response_time = response_time
+        self.extra = extra
+        self._encoded = None  # type: Optional[Tuple[Any, bytes]]
+
+    @classmethod
+    def from_dict(cls, data):  # type: (Mapping[str, Any]) -> CheckResult
+        extra = dict((key, value) for key, value in data.items() if key not in FIELDS)
+        return cls(data['checker'], data.get('output'), data['passed'], data['timestamp'],
+                   data['expires'], data.get('response_time', 0.0), **extra)
+
+    def __getitem__(self, key):  # type: (str) -> Any
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):  # type: (str, Any) -> None
+        if key in FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+        self._encoded = None
+
+    def __delitem__(self, key):  # type: (str) -> None
+        if key in FIELDS:
+            raise TypeError('"{}" can not be removed from a result.'.format(key))
+        del self.extra[key]
+        self._encoded = None
+
+    def __iter__(self):  # type: () -> Iterator[str]
+        for key in FIELDS:
+            yield key
+        for key in self.extra:
+            yield key
+
+    def __len__(self):  # type: () -> int
+        return len(FIELDS) + len(self.extra)
+
+    def __contains__(self, key):  # type: (object) -> bool
+        return key in FIELDS or key in self.extra
+
+    def get(self, key, default=None):  # type: (str, Any) -> Any
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    # the mixin methods of MutableMapping, which is not a base class on python2
+    def keys(self):  # type: () -> Any
+        return KeysView(self)
+
+    def items(self):  # type: () -> Any
+        return ItemsView(self)
+
+    def values(self):  # type: () -> Any
+        return ValuesView(self)
+
+    def pop(self, key, *default):  # type: (str, *Any) -> Any
+        if key in self.extra or not default:
+            value = self[key]
+            del self[key]
+            return value
+        return default[0]
+
+    def setdefault(self, key, default=None):  # type: (str, Any) -> Any
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):  # type: (*Any, **Any) -> None
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __eq__(self, other):  # type: (object) -> bool
+        if isinstance(other, CheckResult):
+            other = other.to_dict()
+        return isinstance(other, Mapping) and self.to_dict() == dict(other.items())
+
+    def __ne__(self, other):  # type: (object) -> bool
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):  # type: () -> str
+        return 'CheckResult({!r})'.format(self.to_dict())
+
+    def __reduce__(self):  # type: () -> Any
+        return restore, (self.to_dict(),)
+
+    def to_dict(self):  # type: () -> Dict[str, Any]
+        data = {'checker': self.checker,
+                'output': self.output,
+                'passed': self.passed,
+                'timestamp': self.timestamp,
+                'expires': self.expires,
+                'response_time': self.response_time}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def encode(self, serializer):  # type: (Any) -> bytes
+        """JSON document of the result, encoded once per serializer and change."""
+        encoded = self._encoded
+        if encoded is None or encoded[0] is not serializer:
+            encoded = self._encoded = (serializer, serializer.dumpb(self.to_dict()))
+        return encoded[1]
+
+
+MutableMapping.register(CheckResult)
+
+
+def restore(data):  # type: (Mapping[str, Any]) -> CheckResult
+    """Unpickle a result, python2 pickle does not take class methods."""
+    return CheckResult.from_dict(data)
+
+
+def as_dicts(results):  # type: (Any) -> Any
+    """Copy the results given to custom handlers, which may expect ``dict`` instances."""
+    if not isinstance(results, list):
+        return results
+    return [result.to_dict() if isinstance(result, CheckResult) else result for result in results]
+
+
+def dumpb(serializer, obj):  # type: (Any, Any) -> bytes
+    """Encode ``obj``, reusing the JSON document of a result."""
+    if isinstance(obj, CheckResult):
+        return obj.encode(serializer)
+    return serializer.dumpb(obj)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+try:
+    from typing import Any, List, Optional, Tuple
+except ImportError:
+    # for python2
+    pass
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler(object):
+    """Re-run checks in the background shortly before their cached result expires.
+
+    While the scheduler is running ``HealthCheck.run`` serves whatever is in the
+    cache, even if it is a little stale, and only runs a check itself when it
+    has never been cached.
+
+    :param healthcheck: HealthCheck whose checkers are refreshed
+    :param lead_time: Seconds before expiry at which a check is run again
+    :param min_interval: Minimum seconds between two runs of the same check
+    :param poll_interval: Maximum seconds to sleep, so new checkers are picked up
+    """
+
+    def __init__(self, healthcheck, lead_time=1.0, min_interval=1.0, poll_interval=1.0):
+        # type: (Any, float, float, float) -> None
+        self.healthcheck = healthcheck
+        self.lead_time = float(lead_time)
+        self.min_interval = float(min_interval)
+        self.poll_interval = float(poll_interval)
+        self._stopped = threading.Event()
+        self._thread = None  # type: Any
+
+    @property
+    def running(self):  # type: () -> bool
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):  # type: () -> None
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._loop, name='healthcheck-refresh')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, wait=True):  # type: (bool) -> None
+        self._stopped.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def due(self, now=None):  # type: (Optional[float]) -> Tuple[List[Any], float]
+        """Return the checkers that must be refreshed now and the seconds until the next one."""
+        now = time.time() if now is None else now
+        due = []
+        wait = self.poll_interval
+        for checker in self.healthcheck.registry:
+            entry = self.healthcheck.cache.get(checker.name)
+            if entry is None:
+                due.append(checker)
+                continue
+            refresh_at = max(entry['expires'] - self.lead_time, entry['timestamp'] + self.min_interval)
+            if refresh_at <= now:
+                due.append(checker)
+            else:
+                wait = min(wait, refresh_at - now)
+        return due, wait
+
+    def refresh(self, checkers):  # type: (List[Any]) -> None
+        self.healthcheck.run_checks(checkers, force=True)
+
+    def _loop(self):  # type: () -> None
+        while not self._stopped.is_set():
+            try:
+                checkers, wait = self.due()
+                if checkers:
+                    self.refresh(checkers)
+                    # a result may not be stored (a short-circuited check), it would be due again at once
+                    wait = self.min_interval
+            except Exception:
+                logger.exception('Background refresh failed')
+                wait = self.poll_interval
+            self._stopped.wait(wait)
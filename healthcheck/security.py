@@ -1,5 +1,7 @@
+import os
+import re
 try:
-    from typing import Any, Tuple
+    from typing import Any, Dict, Iterable, Mapping as MappingType, Optional, Pattern, Tuple, Union
 except ImportError:
     # for python2
     pass
@@ -8,9 +10,121 @@ try:
 except ImportError:
     from collections import Mapping  # type: ignore[attr-defined, no-redef]
 
+import six
 
-def safe_dict(dictionary, blacklist=('key', 'token', 'pass'), max_deep=5):
-    # type: (Mapping[str, Any], Tuple[str,...], int)  -> Mapping[str, Any]
+BLACKLIST = ('key', 'token', 'pass')
+MASK = '********'
+
+
+def _join(patterns):  # type: (Iterable[Union[str, Pattern]]) -> str
+    return '|'.join('(?:{})'.format(getattr(p, 'pattern', p)) for p in patterns)
+
+
+class Redactor(object):
+    """Mask sensitive values in nested mappings, lists and tuples.
+
+    Everything under a sensitive key is masked, whatever its type. All the
+    rules are compiled into a single regular expression for keys and one for
+    values.
+
+    :param blacklist: Case insensitive substrings of sensitive keys
+    :param patterns: Regular expressions searched in keys (case insensitive)
+    :param value_patterns: Regular expressions searched in string values
+    :param max_deep: Maximum nesting level, deeper containers are masked
+    :param mask: Replacement for sensitive values
+    """
+
+    # bound on the memo of key decisions
+    max_keys = 10000
+
+    def __init__(self, blacklist=BLACKLIST, patterns=(), value_patterns=(), max_deep=5, mask=MASK):
+        # type: (Iterable[str], Iterable[Union[str, Pattern]], Iterable[Union[str, Pattern]], int, str) -> None
+        key_patterns = [re.escape(b) for b in blacklist] + list(patterns)
+        self._key_re = re.compile(_join(key_patterns), re.IGNORECASE) if key_patterns else None
+        value_patterns = list(value_patterns)
+        self._value_re = re.compile(_join(value_patterns)) if value_patterns else None
+        self.max_deep = max_deep
+        self.mask = mask
+        self._keys = {}  # type: Dict[Any, bool]
+        self._environ = None  # type: Optional[Tuple[Dict[Any, Any], Dict[str, Any]]]
+
+    def is_sensitive_key(self, key):  # type: (Any) -> bool
+        sensitive = self._keys.get(key)
+        if sensitive is None:
+            sensitive = self._key_re is not None and self._key_re.search(six.text_type(key)) is not None
+            if len(self._keys) >= self.max_keys:
+                self._keys.clear()
+            self._keys[key] = sensitive
+        return sensitive
+
+    def redact(self, value, max_deep=None):  # type: (Any, Optional[int]) -> Any
+        return self._redact(value, self.max_deep if max_deep is None else max_deep)
+
+    def _redact(self, value, deep):  # type: (Any, int) -> Any
+        if isinstance(value, Mapping):
+            result = {}
+            keys = self._keys
+            value_re = self._value_re
+            for key, item in six.iteritems(value):
+                if isinstance(item, six.string_types):
+                    # fast path for the common case, e.g. environment variables
+                    sensitive = keys.get(key)
+                    if sensitive is None:
+                        sensitive = self.is_sensitive_key(key)
+                    if sensitive or (value_re is not None and value_re.search(item)):
+                        item = self.mask
+                    result[key] = item
+                elif self.is_sensitive_key(key):
+                    result[key] = self.mask
+                elif isinstance(item, Mapping):
+                    result[key] = self._redact(item, deep - 1) if deep > 1 else self.mask
+                else:
+                    result[key] = self._redact_item(item, deep)
+            return result
+        return self._redact_item(value, deep)
+
+    def _redact_item(self, value, deep):  # type: (Any, int) -> Any
+        if isinstance(value, (list, tuple)):
+            if deep <= 1:
+                return self.mask
+            items = [self._redact(item, deep - 1) for item in value]
+            return tuple(items) if type(value) is tuple else items
+        if self._value_re is not None and isinstance(value, six.string_types) and self._value_re.search(value):
+            return self.mask
+        return value
+
+    def redact_environ(self, environ=os.environ):  # type: (MappingType[str, str]) -> Dict[str, Any]
+        """Redact the environment, reusing the previous result until it changes.
+
+        The returned dictionary is shared between calls and must not be modified.
+        """
+        # os.environ keeps its raw data in a plain dict, compared to the snapshot without a copy:
+        # unchanged variables are the same objects, so equality is a pointer comparison per item
+        source = getattr(environ, '_data', None)
+        if not isinstance(source, dict):
+            source = environ if isinstance(environ, dict) else dict(environ)
+        memo = self._environ
+        if memo is not None and memo[0] == source:
+            return memo[1]
+        result = self.redact(dict(environ))
+        self._environ = (dict(source), result)
+        return result
+
+
+_redactors = {}  # type: Dict[Tuple[Tuple[str, ...], int], Redactor]
+
+
+def get_redactor(blacklist=BLACKLIST, max_deep=5):  # type: (Iterable[str], int) -> Redactor
+    """Return a shared Redactor for a blacklist, compiled on first use."""
+    key = (tuple(blacklist), max_deep)
+    redactor = _redactors.get(key)
+    if redactor is None:
+        redactor = _redactors[key] = Redactor(key[0], max_deep=max_deep)
+    return redactor
+
+
+def safe_dict(dictionary, blacklist=BLACKLIST, max_deep=5):
+    # type: (MappingType[str, Any], Tuple[str,...], int)  -> MappingType[str, Any]
     """ Avoid listing passwords and access tokens or keys in the dictionary
 
     :param dictionary: Input dictionary
@@ -18,14 +132,9 @@ def safe_dict(dictionary, blacklist=('key', 'token', 'pass'), max_deep=5):
     :param max_deep: Maximum dictionary dict iteration
     :return: Safe dictionary
     """
-    if max_deep <= 0:
-        return dictionary
-    result = {}
-    for key in dictionary.keys():
-        if isinstance(dictionary[key], Mapping):
-            result[key] = safe_dict(dictionary[key], blacklist, max_deep - 1)
-        elif any(b in key.lower() for b in blacklist):
-            result[key] = '********'  # type:ignore[assignment]
-        else:
-            result[key] = dictionary[key]
-    return result
+    return get_redactor(blacklist, max_deep).redact(dictionary)
+
+
+def safe_environ(redactor=None):  # type: (Optional[Redactor]) -> Dict[str, Any]
+    """Redacted copy of ``os.environ``, rebuilt only when the environment changes."""
+    return (redactor or get_redactor()).redact_environ(os.environ)
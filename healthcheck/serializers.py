@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import copy
+import json
+try:
+    from typing import Any, Callable, Dict, List, Optional, Type, Union
+except ImportError:
+    # for python2
+    pass
+
+import six
+
+from .result import CheckResult
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson
+except ImportError:
+    ujson = None  # type: ignore[assignment]
+
+
+class JSONSerializer(object):
+    """JSON encoder backed by the standard library ``json`` module.
+
+    :param default: Function called for objects that can not be serialized,
+        check results are always written as dictionaries
+    """
+    name = 'json'
+
+    def __init__(self, default=None):  # type: (Optional[Callable[[Any], Any]]) -> None
+        self.default = default
+
+    def _default(self, obj):  # type: (Any) -> Any
+        if isinstance(obj, CheckResult):
+            return obj.to_dict()
+        if self.default is None:
+            raise TypeError('Type is not JSON serializable: {}'.format(type(obj).__name__))
+        return self.default(obj)
+
+    def dumps(self, obj):  # type: (Any) -> str
+        return json.dumps(obj, default=self._default)
+
+    def dumpb(self, obj):  # type: (Any) -> bytes
+        return self.dumps(obj).encode('utf-8')
+
+
+class OrjsonSerializer(JSONSerializer):
+    """JSON encoder backed by ``orjson``, which natively produces bytes.
+
+    Falls back to the standard library for values orjson rejects, such as
+    integers wider than 64 bits.
+    """
+    name = 'orjson'
+
+    def _default(self, obj):  # type: (Any) -> Any
+        # orjson does not serialize tuple subclasses (namedtuples) by itself
+        if isinstance(obj, tuple):
+            return list(obj)
+        return JSONSerializer._default(self, obj)
+
+    def dumpb(self, obj):  # type: (Any) -> bytes
+        try:
+            return orjson.dumps(obj, default=self._default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return JSONSerializer.dumps(self, obj).encode('utf-8')
+
+    def dumps(self, obj):  # type: (Any) -> str
+        return self.dumpb(obj).decode('utf-8')
+
+
+class UjsonSerializer(JSONSerializer):
+    """JSON encoder backed by ``ujson``.
+
+    Falls back to the standard library for values ujson rejects.
+    """
+    name = 'ujson'
+
+    def dumps(self, obj):  # type: (Any) -> str
+        try:
+            # ujson escapes forward slashes unlike json and orjson, URLs in outputs would change the ETag
+            return ujson.dumps(obj, default=self._default, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return JSONSerializer.dumps(self, obj)
+
+
+SERIALIZERS = {
+    'json': JSONSerializer,
+    'orjson': OrjsonSerializer,
+    'ujson': UjsonSerializer,
+}  # type: Dict[str, Type[JSONSerializer]]
+
+
+def available_serializers():  # type: () -> List[str]
+    """Names of the usable serializers, fastest first."""
+    names = []
+    if orjson is not None:
+        names.append('orjson')
+    if ujson is not None:
+        names.append('ujson')
+    names.append('json')
+    return names
+
+
+def get_serializer(serializer=None, default=None):
+    # type: (Optional[Union[str, JSONSerializer]], Optional[Callable[[Any], Any]]) -> JSONSerializer
+    """Return a serializer.
+
+    :param serializer: Serializer instance, name (``json``, ``orjson`` or
+        ``ujson``) or ``None`` for the fastest one installed
+    :param default: Function called for objects that can not be serialized,
+        an instance without a ``default`` of its own is copied to use it
+    """
+    if serializer is None:
+        serializer = available_serializers()[0]
+    if not isinstance(serializer, six.string_types):
+        if default is not None and getattr(serializer, 'default', default) is None:
+            # the instance may be shared, e.g. with a HealthCheck
+            serializer = copy.copy(serializer)
+            serializer.default = default  # type: ignore[union-attr]
+        return serializer  # type: ignore[return-value]
+    if serializer not in available_serializers():
+        raise ValueError('The serializer "{}" is not available.'.format(serializer))
+    return SERIALIZERS[serializer](default=default)
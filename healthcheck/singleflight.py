@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import sys
+import threading
+try:
+    from typing import Any, Callable, Dict, Hashable
+except ImportError:
+    # for python2
+    pass
+
+import six
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):  # type: () -> None
+        self.done = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Any
+
+
+class SingleFlight(object):
+    """Coalesce concurrent calls sharing a key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    running wait for it and get the same result (or exception).
+    """
+
+    def __init__(self):  # type: () -> None
+        self._lock = threading.Lock()
+        self._calls = {}  # type: Dict[Hashable, _Call]
+
+    def do(self, key, func, *args, **kwargs):  # type: (Hashable, Callable, *Any, **Any) -> Any
+        with self._lock:
+            leader = key not in self._calls
+            if leader:
+                self._calls[key] = _Call()
+            call = self._calls[key]
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                six.reraise(*call.error)
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException:
+            call.error = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
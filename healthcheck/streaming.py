@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    from typing import Any, Callable, Dict, Optional
+except ImportError:
+    # for python2
+    pass
+
+from .result import dumpb
+
+NDJSON = 'ndjson'
+SSE = 'sse'
+
+CONTENT_TYPES = {NDJSON: 'application/x-ndjson', SSE: 'text/event-stream'}
+
+
+def ndjson(serializer, event, data):  # type: (Any, str, Any) -> bytes
+    """One JSON document per line, the event is not written."""
+    return dumpb(serializer, data) + b'\n'
+
+
+def sse(serializer, event, data):  # type: (Any, str, Any) -> bytes
+    """A server-sent event, JSON encoders do not write new lines so the data fits on one line."""
+    return b'event: ' + event.encode('ascii') + b'\ndata: ' + dumpb(serializer, data) + b'\n\n'
+
+
+ENCODERS = {NDJSON: ndjson, SSE: sse}  # type: Dict[str, Callable[[Any, str, Any], bytes]]
+
+
+def get_encoder(format):  # type: (str) -> Callable[[Any, str, Any], bytes]
+    try:
+        return ENCODERS[format]
+    except KeyError:
+        raise ValueError('Unknown stream format "{}", expected one of {}.'.format(format, ', '.join(ENCODERS)))
+
+
+def negotiate(accept):  # type: (Optional[str]) -> Optional[str]
+    """Return the stream format asked for by an ``Accept`` header, None for a plain response."""
+    if accept:
+        for media_range in accept.split(','):
+            media_type = media_range.split(';', 1)[0].strip()
+            for format, content_type in CONTENT_TYPES.items():
+                if media_type == content_type:
+                    return format
+    return None
@@ -3,27 +3,49 @@
 from functools import wraps
 import errno
 import os
-import signal
+import sys
+import threading
+
+import six
 
 
 class TimeoutError(Exception):
     pass
 
 
+def call_with_timeout(seconds, error_message, func, *args, **kwargs):
+    """Call ``func`` and wait at most ``seconds`` (a float) for it to finish.
+
+    The call runs on a daemon thread, so it works from any thread and leaves
+    signal handlers alone. A call that misses its deadline is abandoned: it
+    keeps running in the background but its outcome is discarded.
+    """
+    outcome = {}
+    finished = threading.Event()
+
+    def target():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except BaseException:
+            outcome['error'] = sys.exc_info()
+        finally:
+            finished.set()
+
+    worker = threading.Thread(target=target, name='healthcheck-{}'.format(getattr(func, '__name__', 'call')))
+    worker.daemon = True
+    worker.start()
+    if not finished.wait(seconds):
+        raise TimeoutError(error_message)
+    if 'error' in outcome:
+        six.reraise(*outcome['error'])
+    return outcome['result']
+
+
 def timeout(seconds=2, error_message=os.strerror(
         getattr(errno, 'ETIME', errno.ETIMEDOUT))):
     def decorator(func):
-        def _handle_timeout(signum, frame):
-            raise TimeoutError(error_message)
-
         def wrapper(*args, **kwargs):
-            signal.signal(signal.SIGALRM, _handle_timeout)
-            signal.alarm(seconds)
-            try:
-                result = func(*args, **kwargs)
-            finally:
-                signal.alarm(0)
-            return result
+            return call_with_timeout(seconds, error_message, func, *args, **kwargs)
 
         return wraps(func)(wrapper)
 
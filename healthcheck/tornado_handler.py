@@ -1,24 +1,115 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import functools
 try:
-    from typing import Any
+    from typing import Any, Optional
 except ImportError:
     # for python2
     pass
 
 import tornado.web
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.queues import Queue
 
+from .environmentdump import EnvironmentDump
 from .healthcheck import HealthCheck
+from .streaming import CONTENT_TYPES, negotiate
 
 
 class TornadoHandler(tornado.web.RequestHandler):
+    """Tornado handler exposing a ``HealthCheck``, an ``EnvironmentDump`` or ``Metrics``.
 
-    def initialize(self, checker):  # type: (HealthCheck) -> None
+    The IOLoop is never blocked: ``run_async`` is awaited when the checker
+    has one (``AsyncHealthCheck``), otherwise ``run`` is called on
+    ``executor``, the IOLoop default pool unless given::
+
+        app.add_handlers(r'.*', [(r'/healthcheck', TornadoHandler, dict(checker=health))])
+
+    Health check results are streamed as they complete when the request
+    accepts ``application/x-ndjson`` or ``text/event-stream``, or always
+    with ``stream='ndjson'`` or ``stream='sse'``, see ``HealthCheck.stream``.
+    """
+
+    def initialize(self, checker, executor=None, stream=None):  # type: (Any, Optional[Any], Optional[str]) -> None
         self.checker = checker
+        self.executor = executor
+        self.stream = stream
 
-    def get(self, *args, **kwargs):  # type: (*Any, **Any) -> None
-        message, status_code, headers = self.checker.run(*args, **kwargs)
+    @gen.coroutine
+    def get(self, *args, **kwargs):  # type: (*Any, **Any) -> Any
+        if isinstance(self.checker, HealthCheck):
+            format = self.stream or negotiate(self.request.headers.get('Accept'))
+            if format:
+                yield self.write_stream(format, *args, **kwargs)
+                return
+            kwargs.setdefault('if_none_match', self.request.headers.get('If-None-Match'))
+        run_async = getattr(self.checker, 'run_async', None)
+        if run_async is not None:
+            message, status_code, headers = yield run_async(*args, **kwargs)
+        else:
+            run = functools.partial(self.checker.run, *args, **kwargs)
+            message, status_code, headers = yield IOLoop.current().run_in_executor(self.executor, run)
         self.set_status(status_code)
         for k, v in headers.items():
             self.set_header(k, v)
-        self.write(message)
+        if status_code != 304:
+            self.write(message)
+
+    @gen.coroutine
+    def write_stream(self, format, *args, **kwargs):  # type: (str, *Any, **Any) -> Any
+        self.set_header('Content-Type', CONTENT_TYPES[format])
+        self.set_header('Cache-Control', 'no-cache')
+        stream_async = getattr(self.checker, 'stream_async', None)
+        if stream_async is not None:
+            chunks = stream_async(*args, format=format, **kwargs)
+            while True:
+                try:
+                    chunk = yield chunks.__anext__()
+                except StopAsyncIteration:  # noqa: F821 (python3 only, as stream_async)
+                    break
+                self.write(chunk)
+                yield self.flush()
+            return
+        chunks = self.checker.stream(*args, format=format, **kwargs)
+        loop = IOLoop.current()
+        queue = Queue()  # type: Queue
+
+        def drain():  # type: () -> None
+            # a single pool thread runs the whole stream, so the run hooks start and end on the same
+            # thread, and hands the results to the IOLoop, which writes them as they come
+            try:
+                for chunk in chunks:
+                    loop.add_callback(queue.put_nowait, chunk)
+            finally:
+                loop.add_callback(queue.put_nowait, None)
+
+        done = loop.run_in_executor(self.executor, drain)
+        while True:
+            chunk = yield queue.get()
+            if chunk is None:
+                break
+            self.write(chunk)
+            yield self.flush()
+        # raises the error that ended the stream, if any
+        yield done
+
+
+class EnvironmentDumpHandler(TornadoHandler):
+    """Tornado handler exposing an ``EnvironmentDump``, a default one unless given.
+
+    A URL group selects the sections, see ``EnvironmentDump.run``::
+
+        app.add_handlers(r'.*', [(r'/environment/?(.*)', EnvironmentDumpHandler)])
+    """
+
+    # shared by the handlers created without a checker, so its sections are computed once
+    default_checker = None  # type: Optional[EnvironmentDump]
+
+    def initialize(self, checker=None, executor=None, stream=None):
+        # type: (Optional[EnvironmentDump], Optional[Any], Optional[str]) -> None
+        if checker is None:
+            if EnvironmentDumpHandler.default_checker is None:
+                EnvironmentDumpHandler.default_checker = EnvironmentDump()
+            checker = EnvironmentDumpHandler.default_checker
+        super(EnvironmentDumpHandler, self).initialize(checker, executor, stream)
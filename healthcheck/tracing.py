@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    from typing import Any, List, Mapping
+except ImportError:
+    # for python2
+    pass
+
+try:
+    from contextvars import ContextVar
+
+    from opentelemetry import context, trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:
+    trace = None  # type: ignore[assignment]
+
+
+class OpenTelemetryHooks(object):
+    """Hooks tracing health check runs with OpenTelemetry spans.
+
+    Each run gets a ``healthcheck.run`` span made current while it lasts, and
+    each executed check a ``healthcheck.check`` child span; cache hits are
+    recorded as events on the run span::
+
+        health.hooks.register(OpenTelemetryHooks())
+
+    :param tracer: Tracer to use, defaults to the ``healthcheck`` tracer
+    """
+
+    def __init__(self, tracer=None):  # type: (Any) -> None
+        if trace is None:
+            raise RuntimeError('OpenTelemetryHooks require the "opentelemetry-api" package.')
+        self.tracer = tracer or trace.get_tracer('healthcheck')
+        # spans live in the context of their run, each thread and asyncio task has its own one,
+        # so concurrent runs of any health check sharing these hooks never see each other's spans
+        self._run = ContextVar('healthcheck_run', default=None)  # type: Any
+        self._check = ContextVar('healthcheck_check', default=None)  # type: Any
+
+    def on_run_start(self, checks):  # type: (List[Any]) -> None
+        span = self.tracer.start_span('healthcheck.run', attributes={'healthcheck.checks': len(checks)})
+        token = context.attach(trace.set_span_in_context(span))
+        # the enclosing run, if any, is restored at the end of this one
+        self._run.set((span, token, self._run.get()))
+
+    def on_run_end(self, checks, results):  # type: (List[Any], List[Mapping[str, Any]]) -> None
+        run = self._run.get()
+        if run is None:
+            return
+        span, token, enclosing = run
+        self._run.set(enclosing)
+        passed = all(result['passed'] for result in results)
+        span.set_attribute('healthcheck.passed', passed)
+        if not passed:
+            span.set_status(Status(StatusCode.ERROR))
+        context.detach(token)
+        span.end()
+
+    def on_check_start(self, check):  # type: (Any) -> None
+        span = self.tracer.start_span('healthcheck.check', attributes={'healthcheck.check': check.__name__})
+        self._check.set((check.__name__, span, self._check.get()))
+
+    def on_check_end(self, check, result):  # type: (Any, Mapping[str, Any]) -> None
+        current = self._check.get()
+        if current is None or current[0] != check.__name__:
+            return
+        name, span, enclosing = current
+        self._check.set(enclosing)
+        span.set_attribute('healthcheck.passed', bool(result['passed']))
+        span.set_attribute('healthcheck.response_time', result['response_time'])
+        if not result['passed']:
+            span.set_status(Status(StatusCode.ERROR, str(result['output'])))
+        span.end()
+
+    def on_cache_hit(self, check, result):  # type: (Any, Mapping[str, Any]) -> None
+        trace.get_current_span().add_event('healthcheck.cache_hit', {'healthcheck.check': check.__name__})
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import random
+import threading
+try:
+    from typing import Any, Dict, Tuple
+except ImportError:
+    # for python2
+    pass
+
+
+class TTLPolicy(object):
+    """Decide how long a check result is cached.
+
+    With ``jitter`` each TTL is shortened by a random amount, up to that
+    fraction of it, so processes started together do not re-run their checks
+    in lockstep. The module level generator is used on purpose: it is
+    reseeded in forked workers, unlike a private ``random.Random``.
+
+    :param jitter: Maximum fraction of the TTL removed at random, 0 to 1
+    """
+
+    def __init__(self, jitter=0.0):  # type: (float) -> None
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1, got {}.'.format(jitter))
+        self.jitter = float(jitter)
+
+    def ttl(self, name, passed, base, response_time):  # type: (str, Any, float, float) -> float
+        """Seconds the result of check ``name`` is cached for, ``base`` being the configured TTL."""
+        return self.spread(base)
+
+    def spread(self, ttl):  # type: (float) -> float
+        if not self.jitter:
+            return ttl
+        return ttl * (1 - self.jitter * random.random())
+
+    def forget(self, name):  # type: (str) -> None
+        pass
+
+
+class AdaptiveTTL(TTLPolicy):
+    """TTL policy adapting to the history of each check.
+
+    A check that keeps passing while taking at least ``min_response_time``
+    seconds has its TTL multiplied by ``growth`` on every run, up to
+    ``max_factor`` times the configured one, as running it often costs more
+    than it tells. A check that flips between passing and failing is cached
+    for ``flip_factor`` of the configured TTL so the new state is confirmed
+    quickly, then goes back to the configured TTL.
+
+    :param jitter: Maximum fraction of the TTL removed at random, 0 to 1
+    :param min_response_time: Seconds from which a check is worth running less often
+    :param growth: TTL growth factor per consecutive slow pass
+    :param max_factor: Upper bound of the TTL, relative to the configured one
+    :param flip_factor: TTL after a state change, relative to the configured one
+    """
+
+    def __init__(self, jitter=0.0, min_response_time=0.1, growth=2.0, max_factor=4.0, flip_factor=0.25):
+        # type: (float, float, float, float, float) -> None
+        super(AdaptiveTTL, self).__init__(jitter)
+        self.min_response_time = float(min_response_time)
+        self.growth = float(growth)
+        self.max_factor = float(max_factor)
+        self.flip_factor = float(flip_factor)
+        self._lock = threading.Lock()
+        # last outcome and current TTL factor per check
+        self._states = {}  # type: Dict[str, Tuple[bool, float]]
+
+    def factor(self, name, passed, response_time):  # type: (str, Any, float) -> float
+        passed = bool(passed)
+        with self._lock:
+            state = self._states.get(name)
+            if state is None:
+                factor = 1.0
+            elif state[0] != passed:
+                factor = self.flip_factor
+            elif passed and response_time >= self.min_response_time:
+                factor = min(state[1] * self.growth, self.max_factor)
+            else:
+                factor = min(state[1] * self.growth, 1.0)
+            self._states[name] = (passed, factor)
+        return factor
+
+    def ttl(self, name, passed, base, response_time):  # type: (str, Any, float, float) -> float
+        return self.spread(base * self.factor(name, passed, response_time))
+
+    def forget(self, name):  # type: (str) -> None
+        with self._lock:
+            self._states.pop(name, None)
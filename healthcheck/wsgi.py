@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+try:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+except ImportError:
+    # for python2
+    pass
+try:
+    from collections.abc import Mapping  # only works on python 3.3+
+except ImportError:
+    from collections import Mapping  # type: ignore[attr-defined, no-redef]
+
+from six.moves import http_client
+
+from .healthcheck import HealthCheck
+from .streaming import CONTENT_TYPES, negotiate
+
+#: status lines, built once
+STATUS_LINES = dict((code, '{} {}'.format(code, reason)) for code, reason in http_client.responses.items()
+                    if isinstance(code, int))
+
+
+def status_line(code):  # type: (int) -> str
+    line = STATUS_LINES.get(code)
+    if line is None:
+        line = STATUS_LINES[code] = '{} Unknown'.format(code)
+    return line
+
+
+def encode(message):  # type: (Union[str, bytes]) -> bytes
+    return message if isinstance(message, bytes) else message.encode('utf-8')
+
+
+class Routes(object):
+    """Map path prefixes to checkers, longest prefix first.
+
+    A request for ``prefix`` runs the checker with no argument, and one for
+    ``prefix/<name>`` passes ``name`` to ``run``: a check name for a
+    ``HealthCheck``, section names for an ``EnvironmentDump``.
+    """
+
+    def __init__(self, routes):  # type: (Any) -> None
+        if not isinstance(routes, Mapping):
+            routes = {'/': routes}
+        self.routes = sorted(((prefix.rstrip('/'), checker) for prefix, checker in routes.items()),
+                             key=lambda route: len(route[0]), reverse=True)
+
+    def match(self, path):  # type: (str) -> Optional[Tuple[Any, Tuple[str, ...]]]
+        for prefix, checker in self.routes:
+            if path == prefix or path == prefix + '/':
+                return checker, ()
+            if path.startswith(prefix + '/'):
+                return checker, (path[len(prefix) + 1:].rstrip('/'),)
+        return None
+
+
+def stream_headers(format):  # type: (str) -> List[Tuple[str, str]]
+    return [('Content-Type', CONTENT_TYPES[format]), ('Cache-Control', 'no-cache')]
+
+
+def run(checker, args, if_none_match):  # type: (Any, Tuple[str, ...], Optional[str]) -> Tuple[bytes, int, Any]
+    if isinstance(checker, HealthCheck):
+        message, status, headers = checker.run(args[0] if args else None, if_none_match=if_none_match)
+    else:
+        message, status, headers = checker.run(*args)
+    return encode(message), status, headers
+
+
+class WSGIApplication(object):
+    """WSGI application exposing health checks without a web framework.
+
+    Serve it standalone or mount it in another WSGI server or application::
+
+        app = WSGIApplication({'/healthcheck': health, '/environment': envdump})
+
+    ``/healthcheck/<check>`` runs a single check and
+    ``/environment/<sections>`` dumps some sections. Health check results are
+    streamed as they complete when the request accepts
+    ``application/x-ndjson`` or ``text/event-stream``.
+
+    :param routes: Checkers by path prefix, or a single checker served on ``/``.
+        A checker is a ``HealthCheck``, an ``EnvironmentDump`` or ``Metrics``
+    """
+
+    def __init__(self, routes):  # type: (Any) -> None
+        self.routes = Routes(routes)
+
+    def __call__(self, environ, start_response):
+        # type: (Dict[str, Any], Callable[..., Any]) -> Iterable[bytes]
+        method = environ['REQUEST_METHOD']
+        if method != 'GET' and method != 'HEAD':
+            return self.respond(start_response, b'', 405, {'Allow': 'GET, HEAD'}, method)
+        match = self.routes.match(environ.get('PATH_INFO') or '/')
+        if match is None:
+            return self.respond(start_response, b'Not Found', 404, {'Content-Type': 'text/plain'}, method)
+        checker, args = match
+        if isinstance(checker, HealthCheck):
+            format = negotiate(environ.get('HTTP_ACCEPT'))
+            if format:
+                start_response(status_line(200), stream_headers(format))
+                return [] if method == 'HEAD' else checker.stream(args[0] if args else None, format=format)
+        body, status, headers = run(checker, args, environ.get('HTTP_IF_NONE_MATCH'))
+        return self.respond(start_response, body, status, headers, method)
+
+    def respond(self, start_response, body, status, headers, method):
+        # type: (Callable[..., Any], bytes, int, Mapping[str, str], str) -> List[bytes]
+        response_headers = list(headers.items())
+        if status != 304:
+            response_headers.append(('Content-Length', str(len(body))))
+        start_response(status_line(status), response_headers)
+        return [] if method == 'HEAD' else [body]
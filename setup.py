@@ -19,7 +19,7 @@ setup(
     author_email='luiscoms@ateliedocodigo.com.br',
     url=__repo__,
     download_url='{}/tarball/{}'.format(__repo__, __version__),
-    packages=find_packages(exclude=['tests', 'tests.*']),
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
     zip_safe=False,
     include_package_data=True,
     license='MIT',
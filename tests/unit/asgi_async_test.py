@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+
+from healthcheck import ASGIApplication, AsyncHealthCheck, EnvironmentDump, HealthCheck
+
+from .conftest import check_that_works, run
+
+
+async def async_check_that_works():
+    await asyncio.sleep(0)
+    return True, 'async works'
+
+
+class ASGIApplicationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hc = HealthCheck(checkers=[check_that_works], cache_response=True)
+        self.app = ASGIApplication({'/healthcheck': self.hc,
+                                    '/async': AsyncHealthCheck(checkers=[async_check_that_works]),
+                                    '/environment': EnvironmentDump()})
+
+    def request(self, path, method='GET', headers=()):
+        scope = {'type': 'http', 'method': method, 'path': path, 'headers': list(headers)}
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            messages.append(message)
+
+        run(self.app(scope, receive, send))
+        start, body = messages
+        return start['status'], dict(start['headers']), body['body']
+
+    def test_should_run_sync_checks(self):
+        status, headers, body = self.request('/healthcheck')
+
+        self.assertEqual(200, status)
+        self.assertEqual(b'application/json', headers[b'content-type'])
+        self.assertEqual(str(len(body)).encode(), headers[b'content-length'])
+        self.assertEqual('it works', json.loads(body.decode('utf-8'))['results'][0]['output'])
+
+    def test_should_await_async_checks(self):
+        status, headers, body = self.request('/async/async_check_that_works')
+
+        self.assertEqual(200, status)
+        self.assertEqual('async works', json.loads(body.decode('utf-8'))['results'][0]['output'])
+
+    def test_should_answer_not_modified(self):
+        status, headers, body = self.request('/healthcheck')
+
+        status, headers, body = self.request('/healthcheck', headers=[(b'if-none-match', headers[b'etag'])])
+
+        self.assertEqual(304, status)
+        self.assertEqual(b'', body)
+
+    def test_should_dump_environment_sections(self):
+        status, headers, body = self.request('/environment/python')
+
+        self.assertEqual(200, status)
+        self.assertEqual(['python'], list(json.loads(body.decode('utf-8'))))
+
+    def test_should_answer_not_found(self):
+        self.assertEqual(404, self.request('/missing')[0])
+
+    def test_should_answer_method_not_allowed(self):
+        self.assertEqual(405, self.request('/healthcheck', method='POST')[0])
+
+    def test_should_answer_head_without_body(self):
+        status, headers, body = self.request('/healthcheck', method='HEAD')
+
+        self.assertEqual(200, status)
+        self.assertEqual(b'', body)
+
+    def test_should_complete_lifespan(self):
+        incoming = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        messages = []
+
+        async def receive():
+            return incoming.pop(0)
+
+        async def send(message):
+            messages.append(message['type'])
+
+        run(self.app({'type': 'lifespan'}, receive, send))
+
+        self.assertEqual(['lifespan.startup.complete', 'lifespan.shutdown.complete'], messages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.cache import _SEQUENCE, DictCache, SharedMemoryCache
+
+
+def result(name, output='it works', passed=True):
+    return {'checker': name, 'output': output, 'passed': passed,
+            'timestamp': 1.0, 'expires': 2.0, 'response_time': 0.001}
+
+
+class SharedMemoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'healthcheck.cache')
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.tmp)
+
+    def open(self, **kwargs):
+        cache = SharedMemoryCache(self.path, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_should_store_and_get_results(self):
+        cache = self.open()
+        value = result('db')
+
+        cache['db'] = value
+
+        self.assertIs(value, cache.get('db'))
+        self.assertIsNone(cache.get('other'))
+        self.assertIn('db', cache)
+
+    def test_should_share_results_between_mappings(self):
+        writer, reader = self.open(), self.open()
+
+        writer['db'] = result('db')
+
+        self.assertEqual(result('db'), reader.get('db'))
+
+    def test_should_reuse_decoded_result_until_it_changes(self):
+        writer, reader = self.open(), self.open()
+        writer['db'] = result('db')
+        first = reader.get('db')
+
+        self.assertIs(first, reader.get('db'))
+
+        writer['db'] = result('db', output='changed')
+        self.assertEqual('changed', reader.get('db')['output'])
+
+    def test_should_pop_results(self):
+        writer, reader = self.open(), self.open()
+        writer['db'] = result('db')
+        reader.get('db')
+
+        self.assertEqual(result('db'), writer.pop('db'))
+
+        self.assertIsNone(reader.get('db'))
+        self.assertIsNone(writer.pop('db'))
+
+    def test_should_reuse_removed_slots(self):
+        cache = self.open(slots=2)
+        cache['a'] = result('a')
+        cache['b'] = result('b')
+        cache.pop('a')
+
+        cache['c'] = result('c')
+
+        self.assertEqual(result('b'), self.open(slots=2).get('b'))
+        self.assertEqual(result('c'), self.open(slots=2).get('c'))
+
+    def test_should_keep_results_local_when_full(self):
+        cache = self.open(slots=1)
+        cache['a'] = result('a')
+
+        cache['b'] = result('b')
+
+        self.assertEqual(result('b'), cache.get('b'))
+        self.assertIsNone(self.open(slots=1).get('b'))
+
+    def test_should_keep_large_results_local(self):
+        cache = self.open(record_size=128)
+        cache['db'] = result('db', output='x' * 200)
+
+        self.assertEqual('x' * 200, cache.get('db')['output'])
+        self.assertIsNone(self.open(record_size=128).get('db'))
+
+    def test_should_reject_a_file_with_another_layout(self):
+        self.open(slots=4)
+
+        with self.assertRaises(ValueError):
+            self.open(slots=8)
+
+    def test_should_clear(self):
+        cache = self.open()
+        cache['db'] = result('db')
+
+        cache.clear()
+
+        self.assertIsNone(cache.get('db'))
+
+    def test_should_wait_for_a_writer_thread_after_spinning(self):
+        cache = self.open()
+        cache.max_spins = 0
+        cache['db'] = result('db')
+        writing, release = threading.Event(), threading.Event()
+        write = cache._write
+
+        def slow_write(slot, digest, payload):
+            # leave the record half written until the reader is waiting
+            offset = slot * cache.record_size
+            sequence = _SEQUENCE.unpack_from(cache._map, offset)[0]
+            _SEQUENCE.pack_into(cache._map, offset, sequence + 1)
+            writing.set()
+            release.wait(5)
+            _SEQUENCE.pack_into(cache._map, offset, sequence)
+            return write(slot, digest, payload)
+
+        cache._write = slow_write
+        writer = threading.Thread(target=cache.__setitem__, args=('db', result('db', output='changed')))
+        writer.start()
+        writing.wait(5)
+        read = []
+        reader = threading.Thread(target=lambda: read.append(cache.get('db')))
+        reader.start()
+
+        reader.join(0.2)
+        self.assertTrue(reader.is_alive())
+        release.set()
+        writer.join(5)
+        reader.join(5)
+        self.assertEqual('changed', read[0]['output'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_should_serve_results_stored_by_forked_worker(self):
+        calls = []
+
+        def check_that_works():
+            calls.append(1)
+            return True, 'it works'
+
+        hc = HealthCheck(checkers=[check_that_works], cache=self.open())
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                hc.run()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        message, status, headers = hc.run()
+
+        self.assertEqual(200, status)
+        self.assertEqual([], calls)
+
+
+class HealthCheckCacheTest(unittest.TestCase):
+
+    def test_should_default_to_a_dict(self):
+        self.assertIsInstance(HealthCheck().cache, DictCache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import socket
+import sqlite3
+import threading
+import time
+import unittest
+
+from six.moves import BaseHTTPServer, socketserver
+
+from healthcheck import HealthCheck
+from healthcheck.checkers import (BrokenConnection, ConnectionPool, DBAPIChecker, HTTPChecker, RedisChecker,
+                                  RedisError, TCPChecker, socket_is_alive)
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Local stand-in server counting and keeping track of its connections."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler):
+        socketserver.TCPServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.connections = []
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.01})
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def process_request(self, request, client_address):
+        self.connections.append(request)
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+    def drop(self):
+        """Close every connection, as a restarted server would."""
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+    def stop(self):
+        self.drop()
+        self.shutdown()
+        self.server_close()
+
+
+class EchoHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            data = self.request.recv(1024)
+            if not data:
+                return
+            self.request.sendall(data)
+
+
+class HTTPHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    status = 200
+    close = False
+
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(self.status)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RedisHandler(socketserver.StreamRequestHandler):
+    password = 'secret'
+
+    def handle(self):
+        authenticated = False
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                self.rfile.readline()
+                args.append(self.rfile.readline()[:-2].decode('utf-8'))
+            command = args[0].upper()
+            if command == 'AUTH':
+                authenticated = args[1] == self.password
+                self.wfile.write(b'+OK\r\n' if authenticated else b'-WRONGPASS invalid password\r\n')
+            elif not authenticated:
+                self.wfile.write(b'-NOAUTH Authentication required.\r\n')
+            elif command == 'SELECT':
+                self.wfile.write(b'+OK\r\n')
+            else:
+                self.wfile.write(b'+PONG\r\n')
+
+
+def serve(test, handler):
+    server = Server(handler)
+    test.addCleanup(server.stop)
+    return server
+
+
+def wait_for_connections(server, count):
+    # plain TCP checks send nothing, the server may not have accepted yet
+    deadline = time.time() + 2
+    while len(server.connections) < count and time.time() < deadline:
+        time.sleep(0.01)
+    return len(server.connections)
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class Connection(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ConnectionPool(Connection, lambda connection: connection.close(),
+                                   lambda connection: not connection.closed)
+
+    def test_should_reuse_connections(self):
+        first = self.pool.run(lambda connection: connection)
+        second = self.pool.run(lambda connection: connection)
+
+        self.assertIs(first, second)
+        self.assertEqual(1, self.pool.created)
+
+    def test_should_keep_at_most_max_size_idle_connections(self):
+        with self.pool.connection() as (first, _):
+            with self.pool.connection() as (second, _):
+                with self.pool.connection() as (third, _):
+                    pass
+
+        self.assertEqual(2, len(self.pool))
+        self.assertTrue(first.closed)
+        self.assertFalse(third.closed)
+
+    def test_should_close_connections_idle_for_too_long(self):
+        self.pool.max_idle = -1
+        first = self.pool.run(lambda connection: connection)
+
+        second = self.pool.run(lambda connection: connection)
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+    def test_should_not_reuse_dead_connections(self):
+        first = self.pool.run(lambda connection: connection)
+        first.closed = True
+
+        self.assertIsNot(first, self.pool.run(lambda connection: connection))
+
+    def test_should_close_a_connection_raising(self):
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as (connection, _):
+                raise ValueError()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(0, len(self.pool))
+
+    def test_should_retry_once_on_a_new_connection(self):
+        first = self.pool.run(lambda connection: connection)
+        calls = []
+
+        def func(connection):
+            calls.append(connection)
+            if connection is first:
+                raise socket.error('reset by peer')
+            return connection
+
+        second = self.pool.run(func)
+
+        self.assertEqual([first, second], calls)
+        self.assertTrue(first.closed)
+
+    def test_should_not_retry_on_a_new_connection(self):
+        calls = []
+
+        def func(connection):
+            calls.append(connection)
+            raise socket.error('reset by peer')
+
+        with self.assertRaises(socket.error):
+            self.pool.run(func)
+        self.assertEqual(1, len(calls))
+
+    def test_should_not_share_connections_with_a_forked_process(self):
+        first = self.pool.run(lambda connection: connection)
+        self.pool._pid = -1
+
+        self.assertIsNot(first, self.pool.run(lambda connection: connection))
+        self.assertFalse(first.closed)
+
+    def test_should_close_idle_connections(self):
+        connection = self.pool.run(lambda connection: connection)
+
+        self.pool.close()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(0, len(self.pool))
+
+
+class SocketIsAliveTest(unittest.TestCase):
+
+    def test_should_tell_whether_the_peer_closed_the_socket(self):
+        left, right = socket.socketpair()
+        self.addCleanup(left.close)
+
+        self.assertTrue(socket_is_alive(left))
+        right.close()
+        self.assertFalse(socket_is_alive(left))
+
+    def test_should_not_reuse_a_closed_socket(self):
+        sock = socket.socket()
+        sock.close()
+
+        self.assertFalse(socket_is_alive(sock))
+        self.assertFalse(socket_is_alive(None))
+
+
+class TCPCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = serve(self, EchoHandler)
+
+    def test_should_keep_the_connection_open(self):
+        checker = TCPChecker('127.0.0.1', self.server.port)
+        self.addCleanup(checker.close)
+
+        for _ in range(3):
+            self.assertTrue(checker()[0])
+
+        self.assertEqual(1, wait_for_connections(self.server, 1))
+
+    def test_should_reconnect_when_the_server_closed_the_connection(self):
+        checker = TCPChecker('127.0.0.1', self.server.port)
+        self.addCleanup(checker.close)
+        checker()
+        wait_for_connections(self.server, 1)
+
+        self.server.drop()
+
+        self.assertTrue(checker()[0])
+        self.assertEqual(2, checker.pool.created)
+
+    def test_should_check_the_reply(self):
+        checker = TCPChecker('127.0.0.1', self.server.port, send=b'PING\n', expect=b'PING\n')
+        self.addCleanup(checker.close)
+
+        self.assertEqual((True, '127.0.0.1:{} replied {!r}'.format(self.server.port, b'PING\n')), checker())
+        self.assertTrue(checker()[0])
+        self.assertEqual(1, len(self.server.connections))
+
+    def test_should_fail_on_an_unexpected_reply(self):
+        checker = TCPChecker('127.0.0.1', self.server.port, send=b'PING\n', expect=b'PONG\n')
+        self.addCleanup(checker.close)
+
+        with self.assertRaises(BrokenConnection):
+            checker()
+        self.assertEqual(0, len(checker.pool))
+
+    def test_should_fail_when_the_server_is_down(self):
+        hc = HealthCheck(checkers=[TCPChecker('127.0.0.1', free_port())])
+
+        self.assertFalse(hc.results()[0]['passed'])
+
+    def test_should_be_named_after_its_address(self):
+        hc = HealthCheck()
+
+        check = hc.add_check(TCPChecker('127.0.0.1', self.server.port))
+
+        self.assertEqual('tcp_127.0.0.1_{}'.format(self.server.port), check.name)
+        self.assertTrue(hc.results()[0]['passed'])
+
+
+class HTTPCheckerTest(unittest.TestCase):
+
+    def make_checker(self, handler=HTTPHandler, **kwargs):
+        server = serve(self, handler)
+        checker = HTTPChecker('http://127.0.0.1:{}/status?deep=1'.format(server.port), **kwargs)
+        self.addCleanup(checker.close)
+        return server, checker
+
+    def test_should_keep_the_connection_alive(self):
+        server, checker = self.make_checker()
+
+        for _ in range(3):
+            passed, output = checker()
+            self.assertTrue(passed)
+
+        self.assertIn('returned 200 OK', output)
+        self.assertEqual(1, len(server.connections))
+
+    def test_should_reconnect_when_the_server_closed_the_connection(self):
+        server, checker = self.make_checker()
+        checker()
+
+        server.drop()
+
+        self.assertTrue(checker()[0])
+        self.assertEqual(2, len(server.connections))
+
+    def test_should_reconnect_when_asked_to_close(self):
+        class ClosingHandler(HTTPHandler):
+            close = True
+
+        server, checker = self.make_checker(ClosingHandler)
+
+        checker()
+        checker()
+
+        self.assertEqual(2, len(server.connections))
+
+    def test_should_fail_on_an_unexpected_status(self):
+        class UnavailableHandler(HTTPHandler):
+            status = 503
+
+        server, checker = self.make_checker(UnavailableHandler)
+
+        passed, output = checker()
+
+        self.assertFalse(passed)
+        self.assertIn('503', output)
+
+    def test_should_accept_the_expected_status(self):
+        class UnavailableHandler(HTTPHandler):
+            status = 503
+
+        server, checker = self.make_checker(UnavailableHandler, expected_status=[503])
+
+        self.assertTrue(checker()[0])
+
+    def test_should_reject_other_schemes(self):
+        with self.assertRaises(ValueError):
+            HTTPChecker('ftp://127.0.0.1/')
+
+
+class RedisCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = serve(self, RedisHandler)
+
+    def test_should_authenticate_once_per_connection(self):
+        checker = RedisChecker('127.0.0.1', self.server.port, password='secret', db=2)
+        self.addCleanup(checker.close)
+
+        for _ in range(3):
+            self.assertEqual((True, 'PING returned PONG'), checker())
+
+        self.assertEqual(1, len(self.server.connections))
+
+    def test_should_fail_with_a_wrong_password(self):
+        checker = RedisChecker('127.0.0.1', self.server.port, password='wrong')
+
+        with self.assertRaises(RedisError):
+            checker()
+
+    def test_should_report_error_replies(self):
+        hc = HealthCheck(checkers=[RedisChecker('127.0.0.1', self.server.port)])
+
+        result = hc.results()[0]
+
+        self.assertFalse(result['passed'])
+        self.assertIn('NOAUTH', result['output'])
+
+    def test_should_reconnect_when_the_server_closed_the_connection(self):
+        checker = RedisChecker('127.0.0.1', self.server.port, password='secret')
+        self.addCleanup(checker.close)
+        checker()
+
+        self.server.drop()
+
+        self.assertTrue(checker()[0])
+        self.assertEqual(2, checker.pool.created)
+
+
+class DBAPICheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connections = []
+
+    def connect(self):
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.connections.append(connection)
+        return connection
+
+    def test_should_reuse_the_connection(self):
+        checker = DBAPIChecker(self.connect)
+        self.addCleanup(checker.close)
+
+        for _ in range(3):
+            self.assertEqual((True, 'SELECT 1 returned 1'), checker())
+
+        self.assertEqual(1, len(self.connections))
+
+    def test_should_retry_on_a_new_connection_once_broken(self):
+        checker = DBAPIChecker(self.connect, errors=(sqlite3.ProgrammingError,))
+        self.addCleanup(checker.close)
+        checker()
+
+        self.connections[0].close()
+
+        self.assertTrue(checker()[0])
+        self.assertEqual(2, len(self.connections))
+
+    def test_should_fail_on_query_errors(self):
+        hc = HealthCheck()
+        hc.add_check(DBAPIChecker(self.connect, query='SELECT * FROM missing'))
+
+        result = hc.results()[0]
+
+        self.assertEqual('database', result['checker'])
+        self.assertFalse(result['passed'])
+        self.assertIn('missing', result['output'])
+
+
+if __name__ == '__main__':
+    unittest.main()
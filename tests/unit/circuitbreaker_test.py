@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.circuitbreaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_should_open_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+        self.assertEqual(CLOSED, breaker.record('db', False, now=100))
+        self.assertEqual(OPEN, breaker.record('db', False, now=100))
+        self.assertEqual(110, breaker.retry_at('db'))
+        self.assertFalse(breaker.allow('db', now=105))
+
+    def test_should_reset_failures_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record('db', False)
+        breaker.record('db', True)
+
+        self.assertEqual(CLOSED, breaker.record('db', False))
+
+    def test_should_probe_once_the_timeout_expires(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record('db', False, now=100)
+
+        self.assertTrue(breaker.allow('db', now=110))
+        self.assertEqual(HALF_OPEN, breaker.state('db'))
+        self.assertEqual(CLOSED, breaker.record('db', True, now=110))
+
+    def test_should_back_off_exponentially_after_failed_probes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, max_reset_timeout=30)
+        breaker.record('db', False, now=0)
+
+        retries = []
+        for _ in range(3):
+            now = breaker.retry_at('db')
+            self.assertTrue(breaker.allow('db', now=now))
+            self.assertEqual(OPEN, breaker.record('db', False, now=now))
+            retries.append(breaker.retry_at('db') - now)
+
+        self.assertEqual([20, 30, 30], retries)
+
+    def test_should_track_checks_independently(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+
+        breaker.record('db', False)
+
+        self.assertEqual(OPEN, breaker.state('db'))
+        self.assertEqual(CLOSED, breaker.state('cache'))
+        self.assertTrue(breaker.allow('cache'))
+
+
+class HealthCheckCircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+    def check_that_fails(self):
+        self.calls += 1
+        return False, 'it fails'
+
+    def test_should_report_the_breaker_state(self):
+        hc = HealthCheck(checkers=[self.check_that_fails], failed_ttl=0,
+                         circuit_breaker=CircuitBreaker(failure_threshold=2))
+
+        states = [hc.results()[0]['breaker'] for _ in range(2)]
+
+        self.assertEqual([CLOSED, OPEN], states)
+
+    def test_should_serve_the_cached_failure_while_open(self):
+        hc = HealthCheck(checkers=[self.check_that_fails], failed_ttl=0,
+                         circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+        hc.run()
+        hc.run()
+        first = hc.results()[0]
+        for _ in range(3):
+            hc.run()
+
+        self.assertEqual(2, self.calls)
+        self.assertIs(first, hc.results()[0])
+        self.assertGreater(first['expires'], time.time() + 50)
+
+    def test_should_not_run_an_open_check_when_forced(self):
+        hc = HealthCheck(checkers=[self.check_that_fails],
+                         circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        hc.run()
+
+        result = hc.run_checks(hc.select(), force=True)[0]
+
+        self.assertEqual(1, self.calls)
+        self.assertEqual(OPEN, result['breaker'])
+
+    def test_should_probe_and_close_after_the_reset_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        outcomes = [(False, 'down'), (True, 'up')]
+        hc = HealthCheck(failed_ttl=0, circuit_breaker=breaker)
+        hc.add_check(lambda: outcomes.pop(0), name='db')
+
+        self.assertEqual(OPEN, hc.results()[0]['breaker'])
+        time.sleep(0.02)
+        result = hc.results()[0]
+
+        self.assertTrue(result['passed'])
+        self.assertEqual(CLOSED, result['breaker'])
+
+    def test_should_forget_removed_checks(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        hc = HealthCheck(checkers=[self.check_that_fails], circuit_breaker=breaker)
+        hc.run()
+
+        hc.remove_check('check_that_fails')
+
+        self.assertEqual(CLOSED, breaker.state('check_that_fails'))
+
+    def test_should_not_report_state_without_breaker(self):
+        hc = HealthCheck(checkers=[self.check_that_fails])
+
+        self.assertNotIn('breaker', hc.results()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
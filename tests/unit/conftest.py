@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Checkers and helpers shared by the unit tests."""
+import json
+import threading
+import time
+
+from healthcheck.serializers import JSONSerializer
+
+try:
+    import asyncio
+except ImportError:
+    # python2, the asyncio tests are not collected
+    asyncio = None  # type: ignore[assignment]
+
+
+def check_that_works():
+    return True, 'it works'
+
+
+def check_that_fails():
+    return False, 'it fails'
+
+
+def make_slow_check(name, delay=0.2, passed=True):
+    """Check named ``name`` sleeping ``delay`` seconds, its output is the thread it ran on."""
+    def check():
+        time.sleep(delay)
+        return passed, threading.current_thread().name
+
+    check.__name__ = name
+    return check
+
+
+class CountingCheck(object):
+    """Check counting its calls, its output is the call number."""
+
+    def __init__(self, name='counting_check', passed=True, delay=0):
+        self.__name__ = name
+        self.passed = passed
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.passed, 'call {}'.format(self.calls)
+
+
+class CountingSerializer(JSONSerializer):
+    """JSON serializer counting the documents it encodes."""
+
+    def __init__(self):
+        super(CountingSerializer, self).__init__(default=str)
+        self.calls = 0
+
+    def dumps(self, obj):
+        self.calls += 1
+        return super(CountingSerializer, self).dumps(obj)
+
+
+def parse_sse(chunks):
+    """Parse server-sent events into ``(event, data)`` pairs."""
+    events = []
+    for chunk in chunks:
+        lines = chunk.decode('utf-8').strip().split('\n')
+        events.append((lines[0][len('event: '):], json.loads(lines[1][len('data: '):])))
+    return events
+
+
+def run(coroutine):
+    """Run ``coroutine`` on a new event loop, as ``asyncio.run`` which needs python 3.7+."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
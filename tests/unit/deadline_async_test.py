@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+
+from healthcheck import AsyncHealthCheck
+
+from .conftest import check_that_works, run
+
+
+class AsyncDeadlineTest(unittest.TestCase):
+
+    def test_should_answer_when_the_deadline_passes(self):
+        async def slow_check():
+            await asyncio.sleep(0.3)
+            return True, 'slow'
+
+        hc = AsyncHealthCheck(checkers=[check_that_works, slow_check])
+
+        async def probes():
+            first = await hc.run_async(deadline=0.05)
+            await asyncio.sleep(0.4)
+            return first, await hc.run_async(deadline=0.05)
+
+        (message, status, headers), (message2, status2, headers2) = run(probes())
+
+        self.assertEqual(500, status)
+        self.assertTrue(json.loads(message)['results'][1]['pending'])
+        self.assertEqual(200, status2)
+        self.assertEqual('slow', json.loads(message2)['results'][1]['output'])
+
+    def test_should_run_dependents_after_the_deadline(self):
+        async def dns():
+            await asyncio.sleep(0.1)
+            return True, 'resolved'
+
+        async def db():
+            return True, 'connected'
+
+        hc = AsyncHealthCheck()
+        hc.add_check(dns)
+        hc.add_check(db, depends_on='dns')
+
+        async def probe():
+            first = await hc.run_async(deadline=0.02)
+            await asyncio.sleep(0.3)
+            return first
+
+        message, status, headers = run(probe())
+
+        self.assertEqual([True, True], [r.get('pending') for r in json.loads(message)['results']])
+        self.assertEqual('connected', hc.cache.get('db')['output'])
+
+
+if __name__ == '__main__':
+    unittest.main()
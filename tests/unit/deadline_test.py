@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+import unittest
+
+from healthcheck import HealthCheck
+
+from .conftest import check_that_works
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+
+    def slow_check(self):
+        self.release.wait(5)
+        return True, 'slow'
+
+    def make(self, **kwargs):
+        hc = HealthCheck(**kwargs)
+        hc.add_check(check_that_works)
+        hc.add_check(self.slow_check, name='slow_check')
+        self.addCleanup(hc.shutdown)
+        self.addCleanup(self.release.set)
+        return hc
+
+    def test_should_answer_when_the_deadline_passes(self):
+        hc = self.make(deadline=0.1)
+
+        start = time.time()
+        message, status, headers = hc.run()
+        elapsed = time.time() - start
+
+        self.assertLess(elapsed, 1)
+        self.assertEqual(500, status)
+        results = json.loads(message)['results']
+        self.assertTrue(results[0]['passed'])
+        self.assertNotIn('pending', results[0])
+        self.assertEqual('slow_check', results[1]['checker'])
+        self.assertFalse(results[1]['passed'])
+        self.assertTrue(results[1]['pending'])
+
+    def test_should_take_the_deadline_of_the_run(self):
+        hc = self.make()
+
+        message, status, headers = hc.run(deadline=0.1)
+
+        self.assertTrue(json.loads(message)['results'][1]['pending'])
+
+    def test_should_cache_stragglers_for_the_next_run(self):
+        hc = self.make(deadline=0.1)
+        hc.run()
+        self.assertNotIn('slow_check', hc.cache)
+
+        self.release.set()
+        for _ in range(50):
+            if hc.cache.get('slow_check'):
+                break
+            time.sleep(0.01)
+        message, status, headers = hc.run()
+
+        self.assertEqual(200, status)
+        self.assertEqual('slow', json.loads(message)['results'][1]['output'])
+
+    def test_should_not_run_a_straggler_twice(self):
+        calls = []
+
+        def slow_check():
+            calls.append(1)
+            self.release.wait(5)
+            return True, 'slow'
+
+        hc = HealthCheck(checkers=[slow_check], deadline=0.05)
+        self.addCleanup(hc.shutdown)
+        self.addCleanup(self.release.set)
+
+        hc.run()
+        hc.run()
+
+        self.assertEqual(1, len(calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from healthcheck import AsyncHealthCheck
+
+from .conftest import run
+
+
+class AsyncDependenciesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def test_should_skip_dependents_in_async_health_check(self):
+        async def dns():
+            await asyncio.sleep(0)
+            return False, 'down'
+
+        async def db():
+            self.calls.append('db')
+            return True, 'up'
+
+        hc = AsyncHealthCheck()
+        hc.add_check(dns)
+        hc.add_check(db, depends_on='dns')
+
+        message, status, headers = run(hc.run_async())
+
+        self.assertEqual(500, status)
+        self.assertEqual([], self.calls)
+        self.assertIn('skipped: dependency dns failed', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
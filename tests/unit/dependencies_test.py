@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from healthcheck import HealthCheck
+
+from .conftest import check_that_fails, check_that_works
+
+
+class DependenciesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def track(self, name, passed=True, delay=0):
+        def check():
+            self.calls.append(name)
+            time.sleep(delay)
+            return passed, name
+
+        return check
+
+    def test_should_skip_dependents_of_a_failed_check(self):
+        hc = HealthCheck()
+        hc.add_check(self.track('dns', passed=False), name='dns')
+        hc.add_check(self.track('db'), name='db', depends_on='dns')
+        hc.add_check(self.track('queue'), name='queue', depends_on=['db'])
+
+        results = hc.results()
+
+        self.assertEqual(['dns'], self.calls)
+        self.assertEqual('skipped: dependency dns failed', results[1]['output'])
+        self.assertTrue(results[1]['skipped'])
+        self.assertFalse(results[1]['passed'])
+        self.assertEqual('skipped: dependency db failed', results[2]['output'])
+
+    def test_should_run_dependents_of_a_passed_check(self):
+        hc = HealthCheck()
+        hc.add_check(self.track('dns'), name='dns')
+        hc.add_check(self.track('db'), name='db', depends_on='dns')
+
+        message, status, headers = hc.run()
+
+        self.assertEqual(200, status)
+        self.assertEqual(['dns', 'db'], self.calls)
+
+    def test_should_run_dependencies_of_selected_checks(self):
+        hc = HealthCheck()
+        hc.add_check(self.track('dns', passed=False), name='dns')
+        hc.add_check(self.track('db'), name='db', depends_on='dns')
+
+        results = hc.results(check='db')
+
+        self.assertEqual(['db'], [r['checker'] for r in results])
+        self.assertTrue(results[0]['skipped'])
+
+    def test_should_cache_skipped_results_until_the_dependency_expires(self):
+        hc = HealthCheck()
+        hc.add_check(self.track('dns', passed=False), name='dns')
+        hc.add_check(self.track('db'), name='db', depends_on='dns')
+
+        first = hc.results()
+        second = hc.results()
+
+        self.assertEqual(['dns'], self.calls)
+        self.assertEqual(first[0]['expires'], first[1]['expires'])
+        self.assertIs(first[1], second[1])
+
+    def test_should_run_independent_branches_concurrently(self):
+        hc = HealthCheck(max_workers=4)
+        self.addCleanup(hc.shutdown)
+        hc.add_check(self.track('network', delay=0.1), name='network')
+        hc.add_check(self.track('db', delay=0.2), name='db', depends_on='network')
+        hc.add_check(self.track('cache', delay=0.2), name='cache', depends_on='network')
+        hc.add_check(self.track('disk', delay=0.2), name='disk')
+
+        start = time.time()
+        message, status, headers = hc.run()
+        elapsed = time.time() - start
+
+        self.assertEqual(200, status)
+        self.assertLess(elapsed, 0.5)
+        self.assertLess(self.calls.index('network'), self.calls.index('db'))
+        self.assertLess(self.calls.index('network'), self.calls.index('cache'))
+
+    def test_should_skip_without_waiting_for_other_dependencies(self):
+        release = threading.Event()
+        hc = HealthCheck(max_workers=2, deadline=1)
+        self.addCleanup(hc.shutdown)
+        self.addCleanup(release.set)
+        hc.add_check(lambda: (release.wait(5), 'slow'), name='slow')
+        hc.add_check(check_that_fails, name='broken')
+        hc.add_check(check_that_works, name='app', depends_on=['slow', 'broken'])
+
+        start = time.time()
+        results = hc.results(check='app')
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual('skipped: dependency broken failed', results[0]['output'])
+
+    def test_should_reject_unknown_dependencies(self):
+        hc = HealthCheck()
+
+        with self.assertRaises(Exception):
+            hc.add_check(check_that_works, depends_on='missing')
+
+    def test_should_not_remove_a_dependency(self):
+        hc = HealthCheck()
+        hc.add_check(check_that_works, name='dns')
+        hc.add_check(check_that_works, name='db', depends_on='dns')
+
+        with self.assertRaises(Exception):
+            hc.remove_check('dns')
+
+        hc.remove_check('db')
+        hc.remove_check('dns')
+        self.assertEqual(0, len(hc.registry))
+
+    def test_should_report_pending_checks_after_the_deadline(self):
+        release = threading.Event()
+        hc = HealthCheck(deadline=0.1)
+        self.addCleanup(hc.shutdown)
+        self.addCleanup(release.set)
+        hc.add_check(lambda: (release.wait(5), 'slow'), name='slow')
+        hc.add_check(check_that_works, name='db', depends_on='slow')
+
+        results = hc.results()
+
+        self.assertEqual([True, True], [r.get('pending') for r in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
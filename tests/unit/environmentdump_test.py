@@ -2,9 +2,11 @@
 # -*- coding: utf-8 -*-
 import json
 import os
+import sys
 import unittest
 
 from healthcheck import EnvironmentDump
+from healthcheck.environmentdump import get_installed_packages
 
 try:
     from collections.abc import Mapping  # only works on python 3.3+
@@ -39,6 +41,82 @@ class BasicEnvironmentDumpTest(unittest.TestCase):
         self.assertEqual('My custom section', jr['custom_section'])
 
 
+class SectionSelectionTest(unittest.TestCase):
+
+    def test_should_dump_only_selected_section(self):
+        message, status, headers = EnvironmentDump().run('python')
+
+        self.assertEqual(200, status)
+        self.assertEqual(['python'], list(json.loads(message)))
+
+    def test_should_dump_several_sections(self):
+        ed = EnvironmentDump()
+
+        self.assertEqual({'os', 'python'}, set(json.loads(ed.run(['os', 'python'])[0])))
+        self.assertEqual({'os', 'process'}, set(json.loads(ed.run('os,process')[0])))
+
+    def test_should_not_evaluate_other_sections(self):
+        calls = []
+        ed = EnvironmentDump(custom=lambda: calls.append(1))
+
+        ed.run('os')
+
+        self.assertEqual([], calls)
+
+    def test_should_answer_not_found_for_unknown_section(self):
+        message, status, headers = EnvironmentDump().run('missing')
+
+        self.assertEqual(404, status)
+        self.assertEqual('Unknown section "missing"', json.loads(message)['error'])
+
+    def test_should_cache_section_for_its_ttl(self):
+        calls = []
+        ed = EnvironmentDump()
+        ed.add_section('counter', lambda: calls.append(1) or len(calls), ttl=60)
+
+        ed.run('counter')
+        message, status, headers = ed.run('counter')
+
+        self.assertEqual(1, json.loads(message)['counter'])
+
+    def test_should_not_cache_section_without_ttl(self):
+        calls = []
+        ed = EnvironmentDump()
+        ed.add_section('counter', lambda: calls.append(1) or len(calls))
+
+        ed.run('counter')
+        message, status, headers = ed.run('counter')
+
+        self.assertEqual(2, json.loads(message)['counter'])
+
+
+class StaticSectionsTest(unittest.TestCase):
+
+    def test_should_compute_os_once(self):
+        ed = EnvironmentDump()
+
+        self.assertIs(ed.get_os(), ed.get_os())
+
+    def test_should_reuse_static_python_data(self):
+        ed = EnvironmentDump()
+
+        self.assertIs(ed.get_python()['version_info'], ed.get_python()['version_info'])
+        self.assertIs(get_installed_packages(), ed.get_python()['packages'])
+
+    def test_should_list_installed_packages(self):
+        packages = EnvironmentDump().get_python()['packages']
+
+        self.assertIn('six', packages)
+
+    def test_should_follow_pythonpath_changes(self):
+        ed = EnvironmentDump()
+        ed.get_python()
+        sys.path.append('/some/new/path')
+        self.addCleanup(sys.path.remove, '/some/new/path')
+
+        self.assertIn('/some/new/path', ed.get_python()['pythonpath'])
+
+
 class TestEnvironmentDumpSafeDump(unittest.TestCase):
 
     def test_should_return_safe_environment_vars(self):
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import time
+import unittest
+
+from healthcheck import AsyncHealthCheck
+from healthcheck.circuitbreaker import CircuitBreaker
+
+from .conftest import run
+
+
+async def async_check_that_works():
+    await asyncio.sleep(0.2)
+    return True, 'it works'
+
+
+async def async_check_that_hangs():
+    await asyncio.sleep(10)
+    return True, 'never reached'
+
+
+async def async_check_throws_exception():
+    raise Exception('My exception')
+
+
+def sync_check_that_works():
+    return True, 'sync works'
+
+
+class AsyncCheck(object):
+    __name__ = 'async_check'
+
+    async def __call__(self):
+        await asyncio.sleep(0)
+        return True, 'awaited'
+
+
+class AsyncHealthCheckTest(unittest.TestCase):
+
+    def run_async(self, hc, *args):
+        return run(hc.run_async(*args))
+
+    def test_should_run_coroutine_checkers_concurrently(self):
+        hc = AsyncHealthCheck(checkers=[async_check_that_works] * 3)
+
+        start = time.time()
+        message, status, headers = self.run_async(hc)
+        elapsed = time.time() - start
+
+        self.assertEqual(200, status)
+        self.assertLess(elapsed, 0.5)
+        jr = json.loads(message)
+        self.assertEqual(3, len(jr['results']))
+
+    def test_should_accept_sync_checkers(self):
+        hc = AsyncHealthCheck(checkers=[sync_check_that_works, async_check_that_works])
+
+        message, status, headers = self.run_async(hc)
+
+        self.assertEqual(200, status)
+        jr = json.loads(message)
+        self.assertEqual(['sync_check_that_works', 'async_check_that_works'], [r['checker'] for r in jr['results']])
+
+    def test_should_await_callable_objects(self):
+        hc = AsyncHealthCheck(checkers=[AsyncCheck()])
+
+        message, status, headers = self.run_async(hc)
+
+        self.assertEqual(200, status)
+        self.assertEqual('awaited', json.loads(message)['results'][0]['output'])
+
+    def test_should_fail_on_exception(self):
+        hc = AsyncHealthCheck(checkers=[async_check_throws_exception])
+
+        message, status, headers = self.run_async(hc)
+
+        self.assertEqual(500, status)
+        jr = json.loads(message)
+        self.assertEqual('My exception', jr['results'][0]['output'])
+
+    def test_should_apply_sub_second_error_timeout(self):
+        hc = AsyncHealthCheck(checkers=[async_check_that_hangs], error_timeout=0.1)
+
+        start = time.time()
+        message, status, headers = self.run_async(hc)
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(500, status)
+        jr = json.loads(message)
+        self.assertEqual('Timeout error!', jr['results'][0]['output'])
+
+    def test_should_share_cache_with_sync_run(self):
+        hc = AsyncHealthCheck(checkers=[sync_check_that_works])
+
+        self.run_async(hc)
+        cached = hc.cache['sync_check_that_works']
+        message, status, headers = hc.run()
+
+        jr = json.loads(message)
+        self.assertEqual(cached['timestamp'], jr['results'][0]['timestamp'])
+
+    def test_should_filter_by_check_name(self):
+        hc = AsyncHealthCheck(checkers=[sync_check_that_works, async_check_throws_exception])
+
+        message, status, headers = self.run_async(hc, 'sync_check_that_works')
+
+        self.assertEqual(200, status)
+
+    def test_should_serve_the_cached_failure_while_the_circuit_is_open(self):
+        calls = []
+
+        async def async_check_that_fails():
+            calls.append(1)
+            return False, 'it fails'
+
+        hc = AsyncHealthCheck(checkers=[async_check_that_fails], failed_ttl=0,
+                              circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+        for _ in range(3):
+            message, status, headers = self.run_async(hc)
+
+        self.assertEqual(500, status)
+        self.assertEqual(1, len(calls))
+        self.assertEqual('open', json.loads(message)['results'][0]['breaker'])
+
+
+if __name__ == '__main__':
+    unittest.main()
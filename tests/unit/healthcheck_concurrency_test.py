@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+import unittest
+
+from healthcheck import HealthCheck
+
+from .conftest import make_slow_check
+
+
+class ConcurrentHealthCheckTest(unittest.TestCase):
+
+    def test_should_run_misses_concurrently(self):
+        checkers = [make_slow_check('check_{}'.format(i)) for i in range(4)]
+        hc = HealthCheck(checkers=checkers, max_workers=4)
+        self.addCleanup(hc.shutdown)
+
+        start = time.time()
+        message, status, headers = hc.run()
+        elapsed = time.time() - start
+
+        self.assertEqual(200, status)
+        self.assertLess(elapsed, 0.6)
+
+    def test_should_keep_registration_order(self):
+        checkers = [make_slow_check('check_{}'.format(i), delay=0.05 * (4 - i)) for i in range(4)]
+        hc = HealthCheck(checkers=checkers, max_workers=4)
+        self.addCleanup(hc.shutdown)
+
+        message, status, headers = hc.run()
+
+        jr = json.loads(message)
+        self.assertEqual(['check_0', 'check_1', 'check_2', 'check_3'], [r['checker'] for r in jr['results']])
+
+    def test_should_reuse_pool_across_runs(self):
+        hc = HealthCheck(checkers=[make_slow_check('a', 0), make_slow_check('b', 0)], success_ttl=0, max_workers=2)
+        self.addCleanup(hc.shutdown)
+
+        hc.run()
+        executor = hc.executor
+        hc.run()
+
+        self.assertIs(executor, hc.executor)
+
+    def test_should_report_failures_from_pool(self):
+        hc = HealthCheck(checkers=[make_slow_check('a', 0), make_slow_check('b', 0, passed=False)], max_workers=2)
+        self.addCleanup(hc.shutdown)
+
+        message, status, headers = hc.run()
+
+        self.assertEqual(500, status)
+        jr = json.loads(message)
+        self.assertEqual([True, False], [r['passed'] for r in jr['results']])
+
+    def test_should_run_sequentially_by_default(self):
+        hc = HealthCheck(checkers=[make_slow_check('a', 0), make_slow_check('b', 0)])
+
+        message, status, headers = hc.run()
+
+        self.assertIsNone(hc.executor)
+        jr = json.loads(message)
+        self.assertEqual({threading.current_thread().name}, {r['output'] for r in jr['results']})
+
+
+if __name__ == '__main__':
+    unittest.main()
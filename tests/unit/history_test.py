@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.history import History, percentile
+
+
+def result(passed=True, response_time=0.1, timestamp=0.0, checker='db'):
+    return {'checker': checker, 'passed': passed, 'response_time': response_time, 'timestamp': timestamp}
+
+
+class PercentileTest(unittest.TestCase):
+
+    def test_should_use_the_nearest_rank(self):
+        ordered = [float(i) for i in range(1, 101)]
+
+        self.assertEqual(50, percentile(ordered, 50))
+        self.assertEqual(95, percentile(ordered, 95))
+        self.assertEqual(100, percentile(ordered, 100))
+
+    def test_should_handle_a_single_sample(self):
+        self.assertEqual(3, percentile([3.0], 99))
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_should_reject_an_empty_history(self):
+        with self.assertRaises(ValueError):
+            History(size=0)
+
+    def test_should_not_have_stats_before_the_first_run(self):
+        self.assertIsNone(History().stats('db'))
+
+    def test_should_keep_only_the_last_runs(self):
+        history = History(size=3)
+        for i in range(10):
+            history.record(result(response_time=float(i), timestamp=float(i)))
+
+        stats = history.stats('db')
+
+        self.assertEqual(3, stats['samples'])
+        self.assertEqual(7, stats['since'])
+        self.assertEqual(9, stats['until'])
+        self.assertEqual(8, stats['p50'])
+        self.assertEqual(9, stats['p99'])
+
+    def test_should_compute_latency_percentiles(self):
+        history = History()
+        for i in range(100, 0, -1):
+            history.record(result(response_time=i / 100.0))
+
+        stats = history.stats('db')
+
+        self.assertEqual(0.5, stats['p50'])
+        self.assertEqual(0.95, stats['p95'])
+        self.assertEqual(0.99, stats['p99'])
+
+    def test_should_count_failures_and_flaps(self):
+        history = History()
+        for passed in (True, True, False, True, False, False):
+            history.record(result(passed=passed))
+
+        stats = history.stats('db')
+
+        self.assertEqual(0.5, stats['failure_rate'])
+        self.assertEqual(3, stats['flaps'])
+
+    def test_should_reuse_the_stats_until_the_next_run(self):
+        history = History()
+        history.record(result())
+        stats = history.stats('db')
+
+        self.assertIs(stats, history.stats('db'))
+        history.record(result())
+        self.assertIsNot(stats, history.stats('db'))
+        self.assertEqual(2, history.stats('db')['samples'])
+
+    def test_should_forget_a_check(self):
+        history = History()
+        history.record(result())
+
+        history.forget('db')
+
+        self.assertIsNone(history.stats('db'))
+
+    def test_should_render_every_check(self):
+        history = History()
+        history.record(result(checker='db'))
+        history.record(result(checker='cache', passed=False))
+
+        message, status, headers = history.run()
+
+        self.assertEqual(200, status)
+        self.assertEqual('application/json', headers['Content-Type'])
+        stats = json.loads(message)
+        self.assertEqual(['cache', 'db'], sorted(stats))
+        self.assertEqual(1.0, stats['cache']['failure_rate'])
+
+    def test_should_render_a_single_check(self):
+        history = History()
+        history.record(result())
+
+        message, status, _ = history.run('db')
+
+        self.assertEqual(200, status)
+        self.assertEqual(1, json.loads(message)['samples'])
+
+    def test_should_return_404_for_an_unknown_check(self):
+        _, status, _ = History().run('nope')
+
+        self.assertEqual(404, status)
+
+
+class HealthCheckHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.history = History(size=10)
+        self.hc = HealthCheck(history=self.history, success_ttl=0, failed_ttl=0)
+        self.outcomes = [True, False, True]
+        self.hc.add_check(lambda: (self.outcomes.pop(0), 'ok'), name='flaky')
+
+    def test_should_record_every_run(self):
+        for _ in range(3):
+            self.hc.run()
+
+        stats = self.history.stats('flaky')
+        self.assertEqual(3, stats['samples'])
+        self.assertEqual(2, stats['flaps'])
+
+    def test_should_report_the_history_in_each_result(self):
+        self.hc.run()
+        message, _, _ = self.hc.run()
+
+        history = json.loads(message)['results'][0]['history']
+        self.assertEqual(2, history['samples'])
+        self.assertEqual(0.5, history['failure_rate'])
+
+    def test_should_forget_removed_checks(self):
+        self.hc.run()
+
+        self.hc.remove_check('flaky')
+
+        self.assertIsNone(self.history.stats('flaky'))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from healthcheck import AsyncHealthCheck
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None  # type: ignore[assignment, misc]
+
+from healthcheck.tracing import OpenTelemetryHooks
+
+from .conftest import run
+
+
+async def fast_check():
+    await asyncio.sleep(0.05)
+    return True, 'fast'
+
+
+async def slow_check():
+    await asyncio.sleep(0.2)
+    return True, 'slow'
+
+
+@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+class AsyncOpenTelemetryHooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.tracer = provider.get_tracer(__name__)
+
+    def test_should_keep_concurrent_runs_on_one_loop_apart(self):
+        hc = AsyncHealthCheck(checkers=[fast_check, slow_check])
+        hc.hooks.register(OpenTelemetryHooks(self.tracer))
+
+        async def probes():
+            return await asyncio.gather(hc.run_async(check='fast_check'), hc.run_async(check='slow_check'))
+
+        run(probes())
+
+        spans = self.exporter.get_finished_spans()
+        runs = dict((span.context.span_id, span) for span in spans if span.name == 'healthcheck.run')
+        checks = [span for span in spans if span.name == 'healthcheck.check']
+        self.assertEqual(2, len(runs))
+        self.assertEqual(2, len(checks))
+        for check in checks:
+            # each run ends after its own check, not when the other run does
+            self.assertGreaterEqual(runs[check.parent.span_id].end_time, check.end_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
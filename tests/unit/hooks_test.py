@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.hooks import Hooks
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None  # type: ignore[assignment, misc]
+
+from healthcheck.tracing import OpenTelemetryHooks
+
+from .conftest import check_that_fails, check_that_works, make_slow_check
+
+
+class Recorder(object):
+
+    def __init__(self):
+        self.events = []
+
+    def on_run_start(self, checks):
+        self.events.append(('run_start', [c.name for c in checks]))
+
+    def on_run_end(self, checks, results):
+        self.events.append(('run_end', [r['checker'] for r in results]))
+
+    def on_check_start(self, check):
+        self.events.append(('check_start', check.name))
+
+    def on_check_end(self, check, result):
+        self.events.append(('check_end', check.name, result['passed']))
+
+    def on_cache_hit(self, check, result):
+        self.events.append(('cache_hit', check.name))
+
+    def on_cache_miss(self, check):
+        self.events.append(('cache_miss', check.name))
+
+
+class HooksTest(unittest.TestCase):
+
+    def test_should_reject_unknown_event(self):
+        self.assertRaises(ValueError, Hooks().add, 'on_nothing', lambda: None)
+
+    def test_should_be_empty_when_unused(self):
+        hooks = Hooks()
+
+        self.assertFalse(hooks.on_check_start)
+
+    def test_should_fire_events_around_execution(self):
+        recorder = Recorder()
+        hc = HealthCheck(checkers=[check_that_works])
+        hc.hooks.register(recorder)
+
+        hc.run()
+        hc.run()
+
+        self.assertEqual([('run_start', ['check_that_works']),
+                          ('cache_miss', 'check_that_works'),
+                          ('check_start', 'check_that_works'),
+                          ('check_end', 'check_that_works', True),
+                          ('run_end', ['check_that_works']),
+                          ('run_start', ['check_that_works']),
+                          ('cache_hit', 'check_that_works'),
+                          ('run_end', ['check_that_works'])], recorder.events)
+
+    def test_failing_hook_should_not_break_run(self):
+        hc = HealthCheck(checkers=[check_that_works])
+        hc.add_hook('on_check_end', lambda check, result: 1 / 0)
+
+        message, status, headers = hc.run()
+
+        self.assertEqual(200, status)
+
+    def test_unregister_should_remove_hooks(self):
+        recorder = Recorder()
+        hc = HealthCheck(checkers=[check_that_works])
+        hc.hooks.register(recorder)
+        hc.hooks.unregister(recorder)
+
+        hc.run()
+
+        self.assertEqual([], recorder.events)
+
+
+@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+class OpenTelemetryHooksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.tracer = provider.get_tracer(__name__)
+
+    def spans(self):
+        return {span.name + ':' + str(span.attributes.get('healthcheck.check', '')): span
+                for span in self.exporter.get_finished_spans()}
+
+    def test_should_trace_run_and_checks(self):
+        hc = HealthCheck(checkers=[check_that_works, check_that_fails], max_workers=2)
+        self.addCleanup(hc.shutdown)
+        hc.hooks.register(OpenTelemetryHooks(self.tracer))
+
+        hc.run()
+
+        spans = self.spans()
+        run = spans['healthcheck.run:']
+        self.assertFalse(run.attributes['healthcheck.passed'])
+        for name in ('check_that_works', 'check_that_fails'):
+            check = spans['healthcheck.check:' + name]
+            self.assertEqual(run.context.span_id, check.parent.span_id)
+            self.assertEqual(run.context.trace_id, check.context.trace_id)
+        self.assertFalse(spans['healthcheck.check:check_that_fails'].status.is_ok)
+
+    def test_should_record_cache_hits(self):
+        hc = HealthCheck(checkers=[check_that_works])
+        hc.hooks.register(OpenTelemetryHooks(self.tracer))
+
+        hc.run()
+        hc.run()
+
+        runs = [span for span in self.exporter.get_finished_spans() if span.name == 'healthcheck.run']
+        self.assertEqual(['healthcheck.cache_hit'], [event.name for event in runs[1].events])
+
+    def test_should_keep_concurrent_runs_apart(self):
+        hooks = OpenTelemetryHooks(self.tracer)
+        healthchecks = [HealthCheck(checkers=[make_slow_check('slow_check', delay=0.1)]) for _ in range(2)]
+        for hc in healthchecks:
+            hc.hooks.register(hooks)
+        threads = [threading.Thread(target=hc.run) for hc in healthchecks]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        spans = self.exporter.get_finished_spans()
+        runs = [span.context.span_id for span in spans if span.name == 'healthcheck.run']
+        parents = [span.parent.span_id for span in spans if span.name == 'healthcheck.check']
+        self.assertEqual(2, len(runs))
+        self.assertEqual(sorted(runs), sorted(parents))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.metrics import Metrics
+
+from .conftest import check_that_fails, check_that_works
+
+
+def samples(text):
+    """Parse the exposition into {'name{labels}': value}."""
+    parsed = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            parsed[name] = float(value)
+    return parsed
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_should_record_latency_histogram(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.observe({'checker': 'db', 'response_time': 0.05, 'passed': True, 'timestamp': 10})
+        metrics.observe({'checker': 'db', 'response_time': 0.5, 'passed': True, 'timestamp': 20})
+        metrics.observe({'checker': 'db', 'response_time': 5, 'passed': False, 'timestamp': 30})
+
+        parsed = samples(metrics.render())
+
+        self.assertEqual(1, parsed['healthcheck_check_duration_seconds_bucket{check="db",le="0.1"}'])
+        self.assertEqual(2, parsed['healthcheck_check_duration_seconds_bucket{check="db",le="1"}'])
+        self.assertEqual(3, parsed['healthcheck_check_duration_seconds_bucket{check="db",le="+Inf"}'])
+        self.assertEqual(3, parsed['healthcheck_check_duration_seconds_count{check="db"}'])
+        self.assertAlmostEqual(5.55, parsed['healthcheck_check_duration_seconds_sum{check="db"}'])
+        self.assertEqual(2, parsed['healthcheck_check_runs_total{check="db",outcome="passed"}'])
+        self.assertEqual(1, parsed['healthcheck_check_runs_total{check="db",outcome="failed"}'])
+        self.assertEqual(0, parsed['healthcheck_check_up{check="db"}'])
+        self.assertEqual(20, parsed['healthcheck_check_last_success_timestamp_seconds{check="db"}'])
+
+    def test_should_escape_label_values(self):
+        metrics = Metrics()
+        metrics.cache_hit('say "hi"\n')
+
+        self.assertIn('check="say \\"hi\\"\\n"', metrics.render())
+
+    def test_run_should_answer_prometheus_text(self):
+        message, status, headers = Metrics().run()
+
+        self.assertEqual(200, status)
+        self.assertTrue(headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+
+class HealthCheckMetricsTest(unittest.TestCase):
+
+    def test_should_record_runs_and_cache_usage(self):
+        metrics = Metrics()
+        hc = HealthCheck(checkers=[check_that_works, check_that_fails], metrics=metrics)
+
+        hc.run()
+        hc.run()
+
+        parsed = samples(metrics.render())
+        self.assertEqual(1, parsed['healthcheck_check_runs_total{check="check_that_works",outcome="passed"}'])
+        self.assertEqual(1, parsed['healthcheck_check_runs_total{check="check_that_fails",outcome="failed"}'])
+        self.assertEqual(1, parsed['healthcheck_check_cache_requests_total{check="check_that_works",result="miss"}'])
+        self.assertEqual(1, parsed['healthcheck_check_cache_requests_total{check="check_that_works",result="hit"}'])
+        self.assertEqual(1, parsed['healthcheck_check_up{check="check_that_works"}'])
+
+    def test_remove_check_should_drop_its_metrics(self):
+        metrics = Metrics()
+        hc = HealthCheck(checkers=[check_that_works], metrics=metrics)
+        hc.run()
+
+        hc.remove_check('check_that_works')
+
+        self.assertNotIn('check_that_works', metrics.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.registry import CheckRegistry
+
+from .conftest import CountingCheck
+
+
+class CheckRegistryTest(unittest.TestCase):
+
+    def test_should_suffix_duplicated_function_names(self):
+        registry = CheckRegistry()
+
+        first = registry.add(lambda: (True, 'first'))
+        second = registry.add(lambda: (True, 'second'))
+
+        self.assertEqual('<lambda>', first.name)
+        self.assertEqual('<lambda>_2', second.name)
+
+    def test_should_reject_duplicated_explicit_names(self):
+        registry = CheckRegistry()
+        registry.add(lambda: (True, ''), name='db')
+
+        self.assertRaises(Exception, registry.add, lambda: (True, ''), name='db')
+
+    def test_should_select_by_names_and_tags_in_registration_order(self):
+        registry = CheckRegistry()
+        registry.add(CountingCheck('ping'), tags=['liveness'])
+        registry.add(CountingCheck('db'), tags=['readiness'])
+        registry.add(CountingCheck('queue'), tags=['readiness', 'deep'])
+
+        self.assertEqual(['db', 'queue'], [c.name for c in registry.select(tags='readiness')])
+        self.assertEqual(['ping', 'queue'], [c.name for c in registry.select(names='queue', tags='liveness')])
+        self.assertEqual(['ping', 'db'], [c.name for c in registry.select(names=['db', 'ping', 'missing'])])
+        self.assertEqual([], registry.select(tags='missing'))
+
+    def test_remove_should_forget_tags(self):
+        registry = CheckRegistry()
+        registry.add(CountingCheck('db'), tags=['readiness'])
+
+        registry.remove('db')
+
+        self.assertNotIn('db', registry)
+        self.assertEqual([], registry.tags)
+
+
+class HealthCheckRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ping = CountingCheck('ping')
+        self.db = CountingCheck('db', passed=False)
+        self.hc = HealthCheck()
+        self.hc.add_check(self.ping, tags=['liveness'])
+        self.hc.add_check(self.db, tags=['readiness'])
+
+    def test_liveness_should_not_run_readiness_checks(self):
+        message, status, headers = self.hc.run(tags='liveness')
+
+        self.assertEqual(200, status)
+        self.assertEqual(1, self.ping.calls)
+        self.assertEqual(0, self.db.calls)
+
+    def test_should_select_several_groups(self):
+        message, status, headers = self.hc.run(tags=['liveness', 'readiness'])
+
+        self.assertEqual(500, status)
+        jr = json.loads(message)
+        self.assertEqual(['ping', 'db'], [r['checker'] for r in jr['results']])
+
+    def test_should_run_lambdas_sharing_a_name(self):
+        hc = HealthCheck(checkers=[lambda: (True, 'first'), lambda: (True, 'second')])
+
+        message, status, headers = hc.run()
+
+        jr = json.loads(message)
+        self.assertEqual(['first', 'second'], [r['output'] for r in jr['results']])
+
+    def test_checkers_should_follow_the_registry(self):
+        queue = CountingCheck('queue')
+
+        self.hc.checkers.append(queue)
+        self.hc.checkers.remove(self.db)
+
+        self.assertEqual([self.ping, queue], self.hc.checkers)
+        self.assertEqual(['ping', 'queue'], [check.name for check in self.hc.registry])
+        message, status, headers = self.hc.run()
+        self.assertEqual(200, status)
+        self.assertEqual(1, queue.calls)
+        self.assertRaises(TypeError, self.hc.checkers.insert, 0, queue)
+
+    def test_should_clear_checkers(self):
+        self.hc.run()
+
+        self.hc.checkers.clear()
+
+        self.assertEqual([], self.hc.checkers)
+        self.assertEqual(0, len(self.hc.registry))
+        self.assertNotIn('ping', self.hc.cache)
+        message, status, headers = self.hc.run()
+        self.assertEqual(200, status)
+        self.assertEqual([], json.loads(message)['results'])
+
+    def test_should_replace_checkers(self):
+        self.hc.run()
+
+        self.hc.checkers = [self.db]
+
+        self.assertEqual([self.db], self.hc.checkers)
+        self.assertNotIn('ping', self.hc.cache)
+        message, status, headers = self.hc.run()
+        self.assertEqual(['db'], [r['checker'] for r in json.loads(message)['results']])
+
+    def test_remove_check_should_evict_cache(self):
+        self.hc.run()
+
+        self.hc.remove_check('db')
+
+        self.assertNotIn('db', self.hc.cache)
+        message, status, headers = self.hc.run()
+        self.assertEqual(200, status)
+
+    def test_should_reuse_group_aggregate_while_fresh(self):
+        self.hc.run(tags='liveness')
+        first = self.hc.results(tags='liveness')
+        second = self.hc.results(tags='liveness')
+
+        self.assertEqual(first, second)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(1, self.ping.calls)
+
+    def test_should_not_share_the_aggregate_list(self):
+        self.hc.results(tags='liveness')
+        self.hc.results(tags='liveness').append('mine')
+
+        self.assertEqual(1, len(self.hc.results(tags='liveness')))
+
+    def test_aggregate_should_be_invalidated_by_new_results(self):
+        hc = HealthCheck(checkers=[self.ping], success_ttl=0)
+
+        hc.run()
+        hc.run()
+
+        self.assertEqual(2, self.ping.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
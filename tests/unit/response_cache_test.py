@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.healthcheck import etag_matches
+
+from .conftest import check_that_fails, check_that_works
+
+
+class EtagMatchesTest(unittest.TestCase):
+
+    def test_should_match_listed_weak_and_wildcard_etags(self):
+        self.assertTrue(etag_matches('"a"', '"a"'))
+        self.assertTrue(etag_matches('"b", "a"', '"a"'))
+        self.assertTrue(etag_matches('W/"a"', '"a"'))
+        self.assertTrue(etag_matches('*', '"a"'))
+        self.assertFalse(etag_matches('"b"', '"a"'))
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_should_render_bytes_with_etag(self):
+        hc = HealthCheck(checkers=[check_that_works], cache_response=True)
+
+        message, status, headers = hc.run()
+
+        self.assertIsInstance(message, bytes)
+        self.assertEqual('success', json.loads(message.decode('utf-8'))['status'])
+        self.assertTrue(headers['ETag'].startswith('"'))
+
+    def test_should_reuse_rendered_body_while_results_are_cached(self):
+        hc = HealthCheck(checkers=[check_that_works], cache_response=True)
+
+        first = hc.run()
+        second = hc.run()
+
+        self.assertIs(first[0], second[0])
+        self.assertEqual(first[2]['ETag'], second[2]['ETag'])
+
+    def test_should_render_again_when_results_change(self):
+        hc = HealthCheck(checkers=[check_that_works], success_ttl=0, cache_response=True)
+
+        first = hc.run()
+        second = hc.run()
+
+        self.assertNotEqual(first[2]['ETag'], second[2]['ETag'])
+
+    def test_should_forget_responses_of_a_removed_check(self):
+        hc = HealthCheck(cache_response=True)
+        hc.add_check(check_that_works, name='one')
+        hc.add_check(check_that_works, name='two')
+        hc.run()
+        hc.run(check='two')
+
+        hc.remove_check('one')
+
+        self.assertEqual([('two',)], list(hc._responses))
+        self.assertEqual([('two',)], list(hc._aggregates))
+
+    def test_should_answer_not_modified(self):
+        hc = HealthCheck(checkers=[check_that_works], cache_response=True)
+        message, status, headers = hc.run()
+
+        message, status, headers = hc.run(if_none_match=headers['ETag'])
+
+        self.assertEqual(304, status)
+        self.assertEqual(b'', message)
+
+    def test_should_not_answer_not_modified_on_failure(self):
+        hc = HealthCheck(checkers=[check_that_fails], cache_response=True)
+        message, status, headers = hc.run()
+
+        message, status, headers = hc.run(if_none_match=headers['ETag'])
+
+        self.assertEqual(500, status)
+
+    def test_should_keep_str_responses_by_default(self):
+        message, status, headers = HealthCheck(checkers=[check_that_works]).run()
+
+        self.assertIsInstance(message, str)
+        self.assertNotIn('ETag', headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
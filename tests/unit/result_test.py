@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import pickle
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.healthcheck import json_success_handler
+from healthcheck.result import CheckResult
+from healthcheck.serializers import available_serializers, get_serializer
+
+from .conftest import CountingSerializer
+
+
+class NewLineSerializer(object):
+
+    def dumpb(self, obj):
+        return json.dumps(obj).encode('utf-8') + b'\n'
+
+
+def make_result(**extra):
+    return CheckResult('db', 'ok', True, 10.0, 37.0, 0.001, **extra)
+
+
+class CheckResultTest(unittest.TestCase):
+
+    def test_should_not_have_an_instance_dict(self):
+        self.assertFalse(hasattr(make_result(), '__dict__'))
+
+    def test_should_behave_as_a_dict(self):
+        result = make_result(breaker='closed')
+
+        self.assertEqual('db', result['checker'])
+        self.assertEqual('closed', result['breaker'])
+        self.assertIsNone(result.get('history'))
+        self.assertIn('passed', result)
+        self.assertNotIn('skipped', result)
+        self.assertEqual(['checker', 'output', 'passed', 'timestamp', 'expires', 'response_time', 'breaker'],
+                         list(result))
+        with self.assertRaises(KeyError):
+            result['history']
+
+    def test_should_equal_its_dict(self):
+        result = make_result(skipped=True)
+
+        self.assertEqual({'checker': 'db', 'output': 'ok', 'passed': True, 'timestamp': 10.0, 'expires': 37.0,
+                          'response_time': 0.001, 'skipped': True}, result)
+        self.assertEqual(result.to_dict(), dict(result))
+
+    def test_should_round_trip_through_a_dict(self):
+        result = make_result(breaker='open')
+
+        self.assertEqual(result, CheckResult.from_dict(result.to_dict()))
+        self.assertEqual(result, pickle.loads(pickle.dumps(result)))
+
+    def test_should_not_remove_fields(self):
+        result = make_result(breaker='open')
+
+        del result['breaker']
+
+        self.assertNotIn('breaker', result)
+        with self.assertRaises(TypeError):
+            del result['passed']
+
+    def test_should_be_written_by_every_serializer(self):
+        result = make_result(breaker='closed')
+        for name in available_serializers():
+            document = json.loads(get_serializer(name).dumps({'results': [result]}))
+            self.assertEqual(result.to_dict(), document['results'][0], name)
+
+    def test_should_encode_once(self):
+        serializer = CountingSerializer()
+        result = make_result()
+
+        encoded = result.encode(serializer)
+
+        self.assertIs(encoded, result.encode(serializer))
+        self.assertEqual(1, serializer.calls)
+        self.assertEqual(result.to_dict(), json.loads(encoded.decode('utf-8')))
+
+    def test_should_encode_again_after_a_change(self):
+        serializer = CountingSerializer()
+        result = make_result()
+        result.encode(serializer)
+
+        result['breaker'] = 'open'
+
+        self.assertEqual('open', json.loads(result.encode(serializer).decode('utf-8'))['breaker'])
+        self.assertEqual(2, serializer.calls)
+
+
+class HealthCheckResultTest(unittest.TestCase):
+
+    def test_should_return_check_results(self):
+        hc = HealthCheck(checkers=[lambda: (True, 'ok')])
+
+        result = hc.results()[0]
+
+        self.assertIsInstance(result, CheckResult)
+        self.assertGreaterEqual(result['response_time'], 0)
+        self.assertEqual(round(result['response_time'], 6), result['response_time'])
+
+    def test_should_render_cached_results(self):
+        hc = HealthCheck(checkers=[lambda: (True, 'ok')], serializer='json')
+        hc.run()
+
+        first, _, _ = hc.run()
+        second, _, _ = hc.run()
+
+        self.assertEqual(json.loads(first)['results'], json.loads(second)['results'])
+        self.assertEqual('ok', json.loads(second)['results'][0]['output'])
+
+    def test_should_render_with_encoders_ending_with_a_new_line(self):
+        message = json_success_handler([make_result()], serializer=NewLineSerializer(), extra='section')
+
+        document = json.loads(message)
+        self.assertIsInstance(message, str)
+        self.assertEqual('section', document['extra'])
+        self.assertEqual(make_result(), document['results'][0])
+
+    def test_should_give_dicts_to_custom_handlers(self):
+        received = []
+
+        def handler(results, **kwargs):
+            received.extend(results)
+            return json.dumps({'results': results})
+
+        hc = HealthCheck(checkers=[lambda: (True, 'ok')], success_handler=handler)
+
+        message, status, _ = hc.run()
+
+        self.assertEqual(200, status)
+        self.assertEqual('ok', json.loads(message)['results'][0]['output'])
+        self.assertIs(dict, type(received[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
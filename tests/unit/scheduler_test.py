@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import time
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.circuitbreaker import CircuitBreaker
+from healthcheck.scheduler import RefreshScheduler
+
+from .conftest import CountingCheck, check_that_fails
+
+
+def wait_for(condition, limit=2):
+    deadline = time.time() + limit
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class RefreshSchedulerTest(unittest.TestCase):
+
+    def test_due_should_include_never_cached_checkers(self):
+        check = CountingCheck()
+        hc = HealthCheck(checkers=[check])
+
+        due, wait = RefreshScheduler(hc).due()
+
+        self.assertEqual(['counting_check'], [c.name for c in due])
+
+    def test_due_should_wait_until_lead_time_before_expiry(self):
+        check = CountingCheck()
+        hc = HealthCheck(checkers=[check], success_ttl=10)
+        hc.run()
+        scheduler = RefreshScheduler(hc, lead_time=2, poll_interval=60)
+
+        now = hc.cache[check.__name__]['timestamp']
+        due, wait = scheduler.due(now)
+        self.assertEqual([], due)
+        self.assertAlmostEqual(8, wait, places=3)
+
+        due, wait = scheduler.due(now + 8)
+        self.assertEqual(['counting_check'], [c.name for c in due])
+
+    def test_due_should_respect_min_interval(self):
+        check = CountingCheck()
+        hc = HealthCheck(checkers=[check], success_ttl=0)
+        hc.run()
+        scheduler = RefreshScheduler(hc, min_interval=5, poll_interval=60)
+
+        due, wait = scheduler.due(hc.cache[check.__name__]['timestamp'] + 1)
+
+        self.assertEqual([], due)
+
+
+class BackgroundRefreshTest(unittest.TestCase):
+
+    def test_should_refresh_before_expiry(self):
+        check = CountingCheck()
+        hc = HealthCheck(checkers=[check], success_ttl=0.3)
+        hc.start_refresh(lead_time=0.2, min_interval=0.05)
+        self.addCleanup(hc.shutdown)
+
+        wait_for(lambda: check.calls >= 3)
+
+        self.assertGreaterEqual(check.calls, 3)
+
+    def test_run_should_serve_stale_results_while_refreshing(self):
+        check = CountingCheck(delay=0.3)
+        hc = HealthCheck(checkers=[check], success_ttl=0.01)
+        hc.run()
+        hc.start_refresh(min_interval=10)
+        self.addCleanup(hc.shutdown)
+        time.sleep(0.05)
+
+        start = time.time()
+        message, status, headers = hc.run()
+
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(200, status)
+        jr = json.loads(message)
+        self.assertEqual('call 1', jr['results'][0]['output'])
+
+    def test_stop_should_restore_expiry(self):
+        check = CountingCheck()
+        hc = HealthCheck(checkers=[check], success_ttl=0)
+        hc.start_refresh(min_interval=10)
+        wait_for(lambda: check.calls >= 1)
+        hc.stop_refresh()
+
+        self.assertFalse(hc.refreshing)
+        hc.run()
+        self.assertEqual(2, check.calls)
+
+    def test_should_wait_min_interval_when_nothing_is_stored(self):
+        # an open circuit without a cached result short-circuits the check and stores nothing
+        hc = HealthCheck(checkers=[check_that_fails],
+                         circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        hc.circuit_breaker.record(check_that_fails.__name__, False)
+        scheduler = RefreshScheduler(hc, min_interval=1)
+        refreshes = []
+        refresh = scheduler.refresh
+
+        def counting_refresh(checkers):
+            refreshes.append(checkers)
+            refresh(checkers)
+
+        scheduler.refresh = counting_refresh  # type: ignore[assignment]
+        scheduler.start()
+        time.sleep(0.2)
+        scheduler.stop()
+
+        self.assertEqual(1, len(refreshes))
+
+
+if __name__ == '__main__':
+    unittest.main()
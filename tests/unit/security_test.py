@@ -1,9 +1,10 @@
+import os
 from datetime import datetime
 from unittest import TestCase
 
 from ddt import data, ddt, unpack  # type:ignore[import]
 
-from healthcheck.security import safe_dict
+from healthcheck.security import Redactor, safe_dict, safe_environ
 
 
 def make_test_dict(test_key, test_value, deep=1):
@@ -112,3 +113,63 @@ class SafeDictTest(TestCase):
         to_dict = safe_dict(input_dict)
 
         self.assertEqual(make_test_dict(key_to_test, '********', deep), to_dict)
+
+
+class RedactorTest(TestCase):
+
+    def test_should_mask_secrets_inside_lists_and_tuples(self):
+        redactor = Redactor()
+
+        redacted = redactor.redact({'servers': [{'host': 'db', 'password': 'secret'}], 'pair': ({'token': 't'},)})
+
+        self.assertEqual({'servers': [{'host': 'db', 'password': '********'}], 'pair': ({'token': '********'},)},
+                         redacted)
+
+    def test_should_mask_sensitive_key_holding_a_list(self):
+        self.assertEqual({'api_keys': '********'}, Redactor().redact({'api_keys': ['a', 'b']}))
+
+    def test_should_mask_sensitive_key_holding_a_mapping(self):
+        redacted = Redactor().redact({'password': {'value': 'secret'}, 'db': {'host': 'db'}})
+
+        self.assertEqual({'password': '********', 'db': {'host': 'db'}}, redacted)
+
+    def test_should_match_key_patterns(self):
+        redactor = Redactor(blacklist=(), patterns=[r'^aws_', r'secret$'])
+
+        redacted = redactor.redact({'AWS_REGION': 'us', 'client_secret': 's', 'region': 'us'})
+
+        self.assertEqual({'AWS_REGION': '********', 'client_secret': '********', 'region': 'us'}, redacted)
+
+    def test_should_match_value_patterns(self):
+        redactor = Redactor(value_patterns=[r'://[^/]+:[^/]+@'])
+
+        redacted = redactor.redact({'DATABASE_URL': 'postgres://user:pw@db/app', 'HOME': '/root'})
+
+        self.assertEqual({'DATABASE_URL': '********', 'HOME': '/root'}, redacted)
+
+    def test_should_mask_containers_deeper_than_max_deep(self):
+        self.assertEqual({'a': {'b': '********'}}, Redactor(max_deep=2).redact({'a': {'b': {'c': 'd'}}}))
+
+    def test_should_accept_non_string_keys(self):
+        self.assertEqual({1: 'a'}, Redactor().redact({1: 'a'}))
+
+    def test_should_reuse_redacted_environ_until_it_changes(self):
+        redactor = Redactor()
+        environ = {'HOME': '/root', 'SOME_TOKEN': 't'}
+
+        first = redactor.redact_environ(environ)
+        self.assertIs(first, redactor.redact_environ(dict(environ)))
+
+        environ['HOME'] = '/home'
+        second = redactor.redact_environ(environ)
+        self.assertIsNot(first, second)
+        self.assertEqual({'HOME': '/home', 'SOME_TOKEN': '********'}, second)
+
+    def test_safe_environ_should_follow_os_environ(self):
+        os.environ['SAFE_ENVIRON_TEST_KEY'] = 'one'
+        self.addCleanup(os.environ.pop, 'SAFE_ENVIRON_TEST_KEY')
+        self.assertEqual('********', safe_environ()['SAFE_ENVIRON_TEST_KEY'])
+
+        os.environ['SAFE_ENVIRON_TEST_VALUE'] = 'two'
+        self.addCleanup(os.environ.pop, 'SAFE_ENVIRON_TEST_VALUE')
+        self.assertEqual('two', safe_environ()['SAFE_ENVIRON_TEST_VALUE'])
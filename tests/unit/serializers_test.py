@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import collections
+import datetime
+import json
+import unittest
+
+import six
+
+from healthcheck import EnvironmentDump, HealthCheck
+from healthcheck.serializers import JSONSerializer, available_serializers, get_serializer
+
+from .conftest import CountingSerializer
+
+Point = collections.namedtuple('Point', 'x y')
+
+
+class SerializersTest(unittest.TestCase):
+
+    def test_should_prefer_fastest_installed_serializer(self):
+        self.assertEqual(available_serializers()[0], get_serializer().name)
+        self.assertEqual('json', available_serializers()[-1])
+
+    def test_should_reject_unavailable_serializer(self):
+        self.assertRaises(ValueError, get_serializer, 'missing')
+
+    def test_should_return_serializer_instances_as_is(self):
+        serializer = JSONSerializer()
+        self.assertIs(serializer, get_serializer(serializer))
+
+    def test_every_serializer_should_produce_the_same_document(self):
+        data = {'a': [1, 2.5, 'b'], 'point': Point(1, 2), 'big': 2 ** 70, 'none': None}
+        for name in available_serializers():
+            serializer = get_serializer(name)
+            self.assertEqual(json.loads(json.dumps(data)), json.loads(serializer.dumps(data)), name)
+            self.assertEqual(json.loads(json.dumps(data)), json.loads(serializer.dumpb(data).decode('utf-8')), name)
+
+    def test_every_serializer_should_keep_forward_slashes(self):
+        url = 'http://localhost/health'
+        for name in available_serializers():
+            self.assertIn(url.encode('utf-8'), get_serializer(name).dumpb({'url': url}), name)
+
+    def test_every_serializer_should_use_default(self):
+        now = datetime.datetime.now()
+        for name in available_serializers():
+            document = json.loads(get_serializer(name, default=lambda o: 'custom').dumps({'o': object()}))
+            self.assertEqual('custom', document['o'], name)
+            document = json.loads(get_serializer(name, default=str).dumps({'now': now}))
+            self.assertIsInstance(document['now'], six.string_types)
+
+    def test_should_give_default_to_instances_without_one(self):
+        serializer = JSONSerializer()
+
+        document = json.loads(get_serializer(serializer, default=str).dumps({'now': datetime.datetime.now()}))
+
+        self.assertIsInstance(document['now'], six.string_types)
+        self.assertIsNone(serializer.default)
+        self.assertIs(serializer, get_serializer(serializer))
+
+
+class ConfigurableSerializerTest(unittest.TestCase):
+
+    def test_healthcheck_should_use_its_serializer(self):
+        serializer = CountingSerializer()
+        hc = HealthCheck(checkers=[lambda: (True, 'ok')], serializer=serializer)
+
+        message, status, headers = hc.run()
+
+        # the document and the result, which is encoded once
+        self.assertEqual(2, serializer.calls)
+        self.assertEqual('success', json.loads(message)['status'])
+        hc.run()
+        self.assertEqual(3, serializer.calls)
+
+    def test_environmentdump_should_use_its_serializer(self):
+        serializer = CountingSerializer()
+        ed = EnvironmentDump(serializer=serializer)
+
+        message, status, headers = ed.run()
+
+        self.assertEqual(1, serializer.calls)
+        self.assertIn('os', json.loads(message))
+
+    def test_environmentdump_should_serialize_any_section(self):
+        ed = EnvironmentDump(serializer=JSONSerializer())
+        ed.add_section('started', lambda: {'at': datetime.datetime(2020, 1, 1)})
+
+        message, status, headers = ed.run()
+
+        self.assertEqual('2020-01-01 00:00:00', json.loads(message)['started']['at'])
+
+
+if __name__ == '__main__':
+    unittest.main()
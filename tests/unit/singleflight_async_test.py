@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from healthcheck import AsyncHealthCheck
+
+from .conftest import CountingCheck, run
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_async_runs_should_execute_check_once(self):
+        check = CountingCheck('slow_check', delay=0.2)
+        hc = AsyncHealthCheck(checkers=[check])
+
+        async def probes():
+            return await asyncio.gather(*[hc.run_async() for _ in range(20)])
+
+        outcomes = run(probes())
+
+        self.assertEqual(1, check.calls)
+        self.assertEqual(20, len(outcomes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.singleflight import SingleFlight
+
+from .conftest import CountingCheck
+
+
+def run_concurrently(func, count=20):
+    outcomes = []
+    threads = [threading.Thread(target=lambda: outcomes.append(func())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_should_share_result_between_concurrent_callers(self):
+        flights = SingleFlight()
+        check = CountingCheck('slow_check', delay=0.2)
+
+        outcomes = run_concurrently(lambda: flights.do('key', check))
+
+        self.assertEqual(1, check.calls)
+        self.assertEqual({(True, 'call 1')}, set(outcomes))
+
+    def test_should_share_exception_between_concurrent_callers(self):
+        flights = SingleFlight()
+        calls = []
+
+        def explode():
+            calls.append(1)
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        def call():
+            try:
+                flights.do('key', explode)
+            except ValueError as exc:
+                return str(exc)
+
+        outcomes = run_concurrently(call, 5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(['boom'] * 5, outcomes)
+
+    def test_should_run_again_after_flight_lands(self):
+        flights = SingleFlight()
+        check = CountingCheck('slow_check')
+
+        flights.do('key', check)
+        flights.do('key', check)
+
+        self.assertEqual(2, check.calls)
+
+
+class HealthCheckSingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_runs_should_execute_check_once(self):
+        check = CountingCheck('slow_check', delay=0.2)
+        hc = HealthCheck(checkers=[check])
+
+        outcomes = run_concurrently(hc.run, 50)
+
+        self.assertEqual(1, check.calls)
+        self.assertEqual({200}, {status for _, status, _ in outcomes})
+
+
+if __name__ == '__main__':
+    unittest.main()
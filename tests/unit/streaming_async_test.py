@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import threading
+import unittest
+from concurrent.futures import Executor, Future
+
+from healthcheck import ASGIApplication, AsyncHealthCheck, HealthCheck
+
+from .conftest import check_that_works, parse_sse, run
+
+
+class ThreadPerTask(Executor):
+    """Run every task on a new thread, as a busy pool may."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run).start()
+        return future
+
+
+class AsyncStreamTest(unittest.TestCase):
+
+    def test_should_stream_async_checks(self):
+        async def async_check():
+            return True, 'async works'
+
+        hc = AsyncHealthCheck(checkers=[async_check])
+
+        async def collect():
+            chunks = []
+            async for chunk in hc.stream_async():
+                chunks.append(chunk)
+            return chunks
+
+        lines = [json.loads(chunk.decode('utf-8')) for chunk in run(collect())]
+
+        self.assertEqual('async works', lines[0]['output'])
+        self.assertEqual('success', lines[1]['status'])
+
+    def test_should_stream_from_asgi(self):
+        hc = HealthCheck(checkers=[check_that_works])
+        scope = {'type': 'http', 'method': 'GET', 'path': '/h', 'headers': [(b'accept', b'text/event-stream')]}
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            messages.append(message)
+
+        threads = []
+        hc.add_hook('on_run_start', lambda checks: threads.append(threading.current_thread()))
+        hc.add_hook('on_run_end', lambda checks, results: threads.append(threading.current_thread()))
+
+        run(ASGIApplication({'/h': hc}, executor=ThreadPerTask())(scope, receive, send))
+
+        self.assertEqual(b'text/event-stream', dict(messages[0]['headers'])[b'content-type'])
+        events = parse_sse([m['body'] for m in messages[1:] if m['body']])
+        self.assertEqual(['result', 'summary'], [event for event, data in events])
+        self.assertFalse(messages[-1].get('more_body'))
+        # tracing hooks keep the run span in the context of the thread
+        self.assertEqual(2, len(threads))
+        self.assertIs(threads[0], threads[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import time
+import unittest
+from wsgiref.util import setup_testing_defaults
+
+from healthcheck import HealthCheck, WSGIApplication
+from healthcheck.streaming import negotiate
+
+from .conftest import check_that_fails, check_that_works, make_slow_check, parse_sse
+
+
+class NegotiateTest(unittest.TestCase):
+
+    def test_should_pick_the_stream_format(self):
+        self.assertEqual('ndjson', negotiate('application/x-ndjson'))
+        self.assertEqual('sse', negotiate('text/html, text/event-stream;q=0.9'))
+        self.assertIsNone(negotiate('application/json'))
+        self.assertIsNone(negotiate(None))
+
+
+class StreamTest(unittest.TestCase):
+
+    def test_should_stream_results_and_summary(self):
+        hc = HealthCheck(checkers=[check_that_works, check_that_fails], version='1.0')
+
+        lines = [json.loads(chunk.decode('utf-8')) for chunk in hc.stream()]
+
+        self.assertEqual(['check_that_works', 'check_that_fails'], [line['checker'] for line in lines[:2]])
+        summary = lines[2]
+        self.assertEqual('failure', summary['status'])
+        self.assertEqual(1, summary['passed'])
+        self.assertEqual(1, summary['failed'])
+        self.assertEqual('1.0', summary['version'])
+
+    def test_should_yield_results_in_completion_order(self):
+        hc = HealthCheck(checkers=[make_slow_check('slow', 0.2), make_slow_check('fast', 0)], max_workers=2)
+        self.addCleanup(hc.shutdown)
+
+        lines = [json.loads(chunk.decode('utf-8')) for chunk in hc.stream()]
+
+        self.assertEqual(['fast', 'slow'], [line['checker'] for line in lines[:2]])
+
+    def test_should_yield_the_first_result_before_the_slowest_check_ends(self):
+        hc = HealthCheck(checkers=[make_slow_check('fast', 0), make_slow_check('slow', 0.3)])
+
+        start = time.time()
+        next(hc.stream())
+
+        self.assertLess(time.time() - start, 0.2)
+
+    def test_should_stream_cached_results_first(self):
+        hc = HealthCheck(checkers=[check_that_works])
+        hc.add_check(check_that_fails)
+        hc.run(check='check_that_fails')
+
+        lines = [json.loads(chunk.decode('utf-8')) for chunk in hc.stream()]
+
+        self.assertEqual(['check_that_fails', 'check_that_works'], [line['checker'] for line in lines[:2]])
+
+    def test_should_stream_server_sent_events(self):
+        hc = HealthCheck(checkers=[check_that_works])
+
+        events = parse_sse(hc.stream(format='sse'))
+
+        self.assertEqual(['result', 'summary'], [event for event, data in events])
+        self.assertEqual('success', events[1][1]['status'])
+
+    def test_should_reject_unknown_format(self):
+        with self.assertRaises(ValueError):
+            next(HealthCheck().stream(format='xml'))
+
+
+class ApplicationStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hc = HealthCheck(checkers=[check_that_works])
+
+    def test_should_stream_from_wsgi(self):
+        environ = {'PATH_INFO': '/h', 'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT': 'application/x-ndjson'}
+        setup_testing_defaults(environ)
+        response = {}
+
+        def start_response(status, headers):
+            response.update(status=status, headers=dict(headers))
+
+        chunks = list(WSGIApplication({'/h': self.hc})(environ, start_response))
+
+        self.assertEqual('200 OK', response['status'])
+        self.assertEqual('application/x-ndjson', response['headers']['Content-Type'])
+        self.assertEqual(2, len(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import signal
+import threading
+import time
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.timeout import TimeoutError, timeout
+
+
+def slow_check():
+    time.sleep(5)
+    return True, 'Waited for 5 seconds'
+
+
+def run_in_thread(func):
+    outcome = {}
+
+    def target():
+        outcome['result'] = func()
+
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join()
+    return outcome['result']
+
+
+class TimeoutTest(unittest.TestCase):
+
+    def test_should_return_result_within_deadline(self):
+        self.assertEqual(42, timeout(1)(lambda: 42)())
+
+    def test_should_raise_original_exception(self):
+        def explode():
+            raise ValueError('boom')
+
+        self.assertRaises(ValueError, timeout(1)(explode))
+
+    def test_should_accept_sub_second_deadline(self):
+        start = time.time()
+        self.assertRaises(TimeoutError, timeout(0.1, 'Timeout error!')(slow_check))
+        self.assertLess(time.time() - start, 1)
+
+    def test_should_work_off_the_main_thread(self):
+        def call():
+            try:
+                timeout(0.1)(slow_check)()
+            except TimeoutError:
+                return 'timed out'
+
+        self.assertEqual('timed out', run_in_thread(call))
+
+    def test_should_leave_signal_handlers_alone(self):
+        if not hasattr(signal, 'SIGALRM'):
+            self.skipTest('SIGALRM is not available')
+
+        def handler(signum, frame):
+            pass
+
+        previous = signal.signal(signal.SIGALRM, handler)
+        self.addCleanup(signal.signal, signal.SIGALRM, previous)
+        self.assertRaises(TimeoutError, timeout(0.1)(slow_check))
+        self.assertIs(handler, signal.getsignal(signal.SIGALRM))
+
+
+class ThreadedHealthCheckTimeoutTest(unittest.TestCase):
+
+    def test_error_timeout_should_fail_check_off_the_main_thread(self):
+        hc = HealthCheck(checkers=[slow_check], error_timeout=0.2)
+
+        start = time.time()
+        message, status, headers = run_in_thread(hc.run)
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(500, status)
+        jr = json.loads(message)
+        self.assertEqual('Timeout error!', jr['results'][0]['output'])
+
+    def test_error_timeout_should_apply_on_thread_pool(self):
+        hc = HealthCheck(checkers=[slow_check, slow_check], error_timeout=0.2, max_workers=2)
+        self.addCleanup(hc.shutdown, False)
+
+        start = time.time()
+        message, status, headers = hc.run()
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(500, status)
+
+
+if __name__ == '__main__':
+    unittest.main()
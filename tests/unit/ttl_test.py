@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from healthcheck import HealthCheck
+from healthcheck.ttl import AdaptiveTTL, TTLPolicy
+
+from .conftest import check_that_works
+
+
+class TTLPolicyTest(unittest.TestCase):
+
+    def test_should_keep_the_ttl_without_jitter(self):
+        self.assertEqual(27, TTLPolicy().ttl('db', True, 27, 0.1))
+
+    def test_should_shorten_the_ttl_within_the_jitter(self):
+        policy = TTLPolicy(jitter=0.2)
+
+        ttls = set(policy.ttl('db', True, 10, 0.1) for _ in range(100))
+
+        self.assertGreater(len(ttls), 1)
+        self.assertTrue(all(8 <= ttl <= 10 for ttl in ttls))
+
+    def test_should_reject_invalid_jitter(self):
+        with self.assertRaises(ValueError):
+            TTLPolicy(jitter=1.5)
+
+
+class AdaptiveTTLTest(unittest.TestCase):
+
+    def test_should_lengthen_ttl_of_slow_healthy_checks(self):
+        policy = AdaptiveTTL(min_response_time=0.1, growth=2, max_factor=4)
+
+        ttls = [policy.ttl('db', True, 10, 0.5) for _ in range(4)]
+
+        self.assertEqual([10, 20, 40, 40], ttls)
+
+    def test_should_keep_ttl_of_fast_healthy_checks(self):
+        policy = AdaptiveTTL(min_response_time=0.1)
+
+        ttls = [policy.ttl('db', True, 10, 0.001) for _ in range(3)]
+
+        self.assertEqual([10, 10, 10], ttls)
+
+    def test_should_shorten_ttl_after_a_flip(self):
+        policy = AdaptiveTTL(min_response_time=0.1, growth=2, max_factor=4, flip_factor=0.25)
+        for _ in range(3):
+            policy.ttl('db', True, 10, 0.5)
+
+        ttls = [policy.ttl('db', False, 10, 0.5) for _ in range(4)]
+
+        self.assertEqual([2.5, 5, 10, 10], ttls)
+
+    def test_should_track_checks_independently(self):
+        policy = AdaptiveTTL(min_response_time=0.1, growth=2)
+        policy.ttl('db', True, 10, 0.5)
+        policy.ttl('db', True, 10, 0.5)
+
+        self.assertEqual(10, policy.ttl('cache', True, 10, 0.5))
+
+    def test_should_forget_a_check(self):
+        policy = AdaptiveTTL(min_response_time=0.1, growth=2)
+        policy.ttl('db', True, 10, 0.5)
+
+        policy.forget('db')
+
+        self.assertEqual(10, policy.ttl('db', True, 10, 0.5))
+
+
+class HealthCheckTTLPolicyTest(unittest.TestCase):
+
+    def test_should_apply_the_policy_to_expires(self):
+        hc = HealthCheck(checkers=[check_that_works], success_ttl=100, ttl_policy=TTLPolicy(jitter=0.5))
+
+        result = hc.results()[0]
+
+        self.assertGreaterEqual(result['expires'] - result['timestamp'], 50)
+        self.assertLessEqual(result['expires'] - result['timestamp'], 100)
+
+    def test_should_adapt_the_ttl_of_the_check(self):
+        policy = AdaptiveTTL(min_response_time=0, growth=2)
+        hc = HealthCheck(checkers=[check_that_works], success_ttl=10, ttl_policy=policy)
+
+        first = hc.results()[0]
+        second = hc.run_checks(hc.select(), force=True)[0]
+
+        self.assertAlmostEqual(10, first['expires'] - first['timestamp'])
+        self.assertAlmostEqual(20, second['expires'] - second['timestamp'])
+
+
+if __name__ == '__main__':
+    unittest.main()
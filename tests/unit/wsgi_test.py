@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import unittest
+from wsgiref.util import setup_testing_defaults
+
+from healthcheck import EnvironmentDump, HealthCheck, WSGIApplication
+from healthcheck.metrics import Metrics
+
+from .conftest import check_that_fails, check_that_works
+
+
+class WSGIApplicationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hc = HealthCheck(checkers=[check_that_works, check_that_fails], cache_response=True)
+        self.app = WSGIApplication({'/healthcheck': self.hc,
+                                    '/environment': EnvironmentDump(),
+                                    '/metrics': Metrics()})
+
+    def request(self, path, method='GET', **headers):
+        environ = {'PATH_INFO': path, 'REQUEST_METHOD': method}
+        environ.update(headers)
+        setup_testing_defaults(environ)
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        body = b''.join(self.app(environ, start_response))
+        return response['status'], response['headers'], body
+
+    def test_should_run_every_check(self):
+        status, headers, body = self.request('/healthcheck')
+
+        self.assertEqual('500 Internal Server Error', status)
+        self.assertEqual('application/json', headers['Content-Type'])
+        self.assertEqual(str(len(body)), headers['Content-Length'])
+        self.assertEqual(2, len(json.loads(body.decode('utf-8'))['results']))
+
+    def test_should_run_a_check_from_the_path(self):
+        status, headers, body = self.request('/healthcheck/check_that_works')
+
+        self.assertEqual('200 OK', status)
+        self.assertEqual(['check_that_works'],
+                         [r['checker'] for r in json.loads(body.decode('utf-8'))['results']])
+
+    def test_should_answer_not_modified(self):
+        status, headers, body = self.request('/healthcheck/check_that_works')
+
+        status, headers, body = self.request('/healthcheck/check_that_works', HTTP_IF_NONE_MATCH=headers['ETag'])
+
+        self.assertEqual('304 Not Modified', status)
+        self.assertEqual(b'', body)
+
+    def test_should_dump_environment_sections(self):
+        status, headers, body = self.request('/environment/os,python')
+
+        self.assertEqual('200 OK', status)
+        self.assertEqual({'os', 'python'}, set(json.loads(body.decode('utf-8'))))
+
+    def test_should_expose_metrics(self):
+        status, headers, body = self.request('/metrics')
+
+        self.assertEqual('200 OK', status)
+        self.assertIn('text/plain', headers['Content-Type'])
+
+    def test_should_answer_head_without_body(self):
+        status, headers, body = self.request('/healthcheck/check_that_works', method='HEAD')
+
+        self.assertEqual('200 OK', status)
+        self.assertEqual(b'', body)
+        self.assertNotEqual('0', headers['Content-Length'])
+
+    def test_should_answer_not_found(self):
+        status, headers, body = self.request('/missing')
+
+        self.assertEqual('404 Not Found', status)
+
+    def test_should_answer_method_not_allowed(self):
+        status, headers, body = self.request('/healthcheck', method='POST')
+
+        self.assertEqual('405 Method Not Allowed', status)
+
+    def test_should_serve_a_single_checker_on_root(self):
+        self.app = WSGIApplication(HealthCheck(checkers=[check_that_works]))
+
+        self.assertEqual('200 OK', self.request('/')[0])
+        self.assertEqual('200 OK', self.request('/check_that_works')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
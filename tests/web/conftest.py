@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Handlers shared by the web tests."""
+import tornado.web
+
+
+class PingHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write('pong')
@@ -4,7 +4,8 @@ import unittest
 
 import flask
 
-from healthcheck import HealthCheck, EnvironmentDump
+from healthcheck import EnvironmentDump, FlaskHandler, HealthCheck
+from healthcheck.metrics import Metrics
 
 
 class BasicHealthCheckTest(unittest.TestCase):
@@ -36,6 +37,53 @@ class BasicHealthCheckTest(unittest.TestCase):
         self.assertEqual('failure', jr['status'])
 
 
+class FlaskHandlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.hc = HealthCheck(cache_response=True)
+        self.client = self.app.test_client()
+
+        self.app.add_url_rule('/h', 'h', view_func=FlaskHandler(self.hc))
+        self.app.add_url_rule('/h/<check>', 'check', view_func=FlaskHandler(self.hc))
+
+    def test_should_answer_not_modified(self):
+        response = self.client.get('/h')
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.get('/h', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.data)
+
+    def test_should_pass_url_variables(self):
+        self.hc.add_check(lambda: (False, 'FAIL'), name='fail_check')
+        self.hc.add_check(lambda: (True, 'OK'), name='ok_check')
+
+        response = self.client.get('/h/ok_check')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(['ok_check'], [r['checker'] for r in flask.json.loads(response.data)['results']])
+
+    def test_should_stream_when_accepted(self):
+        self.hc.add_check(lambda: (True, 'OK'), name='ok_check')
+
+        response = self.client.get('/h', headers={'Accept': 'application/x-ndjson'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/x-ndjson', response.mimetype)
+        lines = [flask.json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual('ok_check', lines[0]['checker'])
+        self.assertEqual('success', lines[1]['status'])
+
+    def test_should_always_stream_when_configured(self):
+        self.app.add_url_rule('/events', 'events', view_func=FlaskHandler(self.hc, stream='sse'))
+
+        response = self.client.get('/events')
+
+        self.assertEqual('text/event-stream', response.mimetype)
+        self.assertTrue(response.data.startswith(b'event: summary\n'))
+
+
 class BasicEnvironmentDumpTest(unittest.TestCase):
 
     def setUp(self):
@@ -62,5 +110,46 @@ class BasicEnvironmentDumpTest(unittest.TestCase):
         self.assertEqual('OK', jr['test_func'])
 
 
+class EnvironmentDumpRoutingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.client = self.app.test_client()
+
+        handler = FlaskHandler(EnvironmentDump())
+        self.app.add_url_rule('/e', 'e', view_func=handler)
+        self.app.add_url_rule('/e/<sections>', 'sections', view_func=handler)
+
+    def test_should_dump_every_section(self):
+        response = self.client.get('/e')
+        self.assertEqual({'os', 'python', 'process'}, set(flask.json.loads(response.data)))
+
+    def test_should_dump_section_from_url(self):
+        response = self.client.get('/e/process')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(['process'], list(flask.json.loads(response.data)))
+
+    def test_should_answer_not_found_for_unknown_section(self):
+        response = self.client.get('/e/missing')
+        self.assertEqual(404, response.status_code)
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_should_expose_metrics(self):
+        app = flask.Flask(__name__)
+        metrics = Metrics()
+        hc = HealthCheck(checkers=[lambda: (False, 'FAIL')], metrics=metrics)
+        app.add_url_rule('/h', 'h', view_func=FlaskHandler(hc))
+        app.add_url_rule('/metrics', 'metrics', view_func=FlaskHandler(metrics))
+        client = app.test_client()
+
+        client.get('/h')
+        response = client.get('/metrics')
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn(b'healthcheck_check_up{check="<lambda>"} 0', response.data)
+
+
 if __name__ == '__main__':
     unittest.main()
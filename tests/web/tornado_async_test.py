@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import time
+import unittest
+
+import tornado.web
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+from healthcheck import AsyncHealthCheck, TornadoHandler
+
+from .conftest import PingHandler
+
+
+class AsyncHealthCheckTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        async def slow_async_check():
+            await gen.sleep(0.3)
+            return True, 'slow'
+
+        self.async_hc = AsyncHealthCheck(checkers=[slow_async_check], success_ttl=0)
+        return tornado.web.Application([
+            (r'/async', TornadoHandler, dict(checker=self.async_hc)),
+            (r'/events', TornadoHandler, dict(checker=AsyncHealthCheck(checkers=[lambda: (True, 'OK')]),
+                                              stream='sse')),
+            (r'/ping', PingHandler),
+        ])
+
+    @gen_test
+    def test_should_await_async_health_checks(self):
+        start = time.time()
+        slow = self.http_client.fetch(self.get_url('/async'))
+
+        yield self.http_client.fetch(self.get_url('/ping'))
+
+        self.assertLess(time.time() - start, 0.3)
+        response = yield slow
+        self.assertEqual(200, response.code)
+        self.assertEqual('slow', json.loads(response.body.decode('utf-8'))['results'][0]['output'])
+
+    def test_should_stream_async_health_checks(self):
+        response = self.fetch('/events')
+
+        self.assertEqual('text/event-stream', response.headers['Content-Type'])
+        events = [block.split('\n')[0] for block in response.body.decode('utf-8').strip().split('\n\n')]
+        self.assertEqual(['event: result', 'event: summary'], events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,19 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import json
+import threading
 import unittest
+from concurrent.futures import Executor, Future
 
 import tornado.testing
 import tornado.web
-from tornado.testing import AsyncHTTPTestCase
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase, gen_test
 
-from healthcheck import TornadoHandler, HealthCheck, EnvironmentDump
+from healthcheck import EnvironmentDumpHandler, TornadoHandler, HealthCheck, EnvironmentDump
+from healthcheck.metrics import Metrics
+
+from .conftest import PingHandler
 
 
 class BasicHealthCheckTest(AsyncHTTPTestCase):
@@ -53,6 +59,19 @@ class BasicHealthCheckTest(AsyncHTTPTestCase):
         self.assertEqual('failure', jr['status'])
 
 
+class ConditionalHealthCheckTest(BasicHealthCheckTest):
+
+    def _hc(self):
+        return HealthCheck(cache_response=True)
+
+    def test_should_answer_not_modified(self):
+        response = self.fetch(self.path)
+        self.assertEqual(response.code, 200)
+
+        response = self.fetch(self.path, headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.code, 304)
+
+
 class BasicEnvironmentDumpTest(AsyncHTTPTestCase):
 
     def get_app(self):
@@ -92,5 +111,148 @@ class BasicEnvironmentDumpTest(AsyncHTTPTestCase):
         self.assertEqual('OK', jr['test_func'])
 
 
+class EnvironmentDumpRoutingTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r'/e/?(.*)', TornadoHandler, dict(checker=EnvironmentDump())),
+        ])
+
+    def test_should_dump_every_section(self):
+        response = self.fetch('/e')
+        self.assertEqual({'os', 'python', 'process'}, set(json.loads(response.body.decode('utf-8'))))
+
+    def test_should_dump_section_from_url(self):
+        response = self.fetch('/e/python')
+        self.assertEqual(response.code, 200)
+        self.assertEqual(['python'], list(json.loads(response.body.decode('utf-8'))))
+
+    def test_should_answer_not_found_for_unknown_section(self):
+        response = self.fetch('/e/missing')
+        self.assertEqual(response.code, 404)
+
+
+class MetricsTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.metrics = Metrics()
+        self.hc = HealthCheck(checkers=[lambda: (True, 'OK')], metrics=self.metrics)
+        return tornado.web.Application([
+            (r'/h', TornadoHandler, dict(checker=self.hc)),
+            (r'/metrics', TornadoHandler, dict(checker=self.metrics)),
+        ])
+
+    def test_should_expose_metrics(self):
+        self.fetch('/h')
+
+        response = self.fetch('/metrics')
+
+        self.assertEqual(response.code, 200)
+        self.assertIn('text/plain', response.headers['Content-Type'])
+        body = response.body.decode('utf-8')
+        self.assertIn('healthcheck_check_runs_total{check="<lambda>",outcome="passed"} 1', body)
+
+
+class NonBlockingTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.release = threading.Event()
+
+        def slow_check():
+            self.release.wait(5)
+            return True, 'slow'
+
+        self.hc = HealthCheck(checkers=[slow_check], success_ttl=0)
+        return tornado.web.Application([
+            (r'/h', TornadoHandler, dict(checker=self.hc)),
+            (r'/ping', PingHandler),
+        ])
+
+    @gen_test
+    def test_should_serve_requests_during_a_slow_check(self):
+        slow = self.http_client.fetch(self.get_url('/h'))
+
+        ping = yield self.http_client.fetch(self.get_url('/ping'))
+
+        self.assertEqual(b'pong', ping.body)
+        self.assertFalse(slow.done())
+        self.release.set()
+        response = yield slow
+        self.assertEqual(200, response.code)
+
+    @gen_test
+    def test_should_share_a_slow_check_between_concurrent_probes(self):
+        probes = [self.http_client.fetch(self.get_url('/h')) for _ in range(3)]
+        yield gen.sleep(0.1)
+        self.release.set()
+
+        responses = yield probes
+
+        self.assertEqual([200] * 3, [response.code for response in responses])
+
+
+class ThreadPerTask(Executor):
+    """Run every task on a new thread, as a busy pool may."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run).start()
+        return future
+
+
+class StreamTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.hc = HealthCheck(checkers=[lambda: (True, 'OK')])
+        return tornado.web.Application([
+            (r'/h', TornadoHandler, dict(checker=self.hc)),
+            (r'/threads', TornadoHandler, dict(checker=self.hc, executor=ThreadPerTask())),
+        ])
+
+    def test_should_stream_when_accepted(self):
+        response = self.fetch('/h', headers={'Accept': 'application/x-ndjson'})
+
+        self.assertEqual(response.code, 200)
+        self.assertEqual('application/x-ndjson', response.headers['Content-Type'])
+        lines = [json.loads(line) for line in response.body.decode('utf-8').splitlines()]
+        self.assertEqual('OK', lines[0]['output'])
+        self.assertEqual('success', lines[1]['status'])
+
+    def test_should_start_and_end_a_streamed_run_on_one_thread(self):
+        threads = []
+        self.hc.add_hook('on_run_start', lambda checks: threads.append(threading.current_thread()))
+        self.hc.add_hook('on_run_end', lambda checks, results: threads.append(threading.current_thread()))
+
+        response = self.fetch('/threads', headers={'Accept': 'application/x-ndjson'})
+
+        self.assertEqual(2, len(response.body.splitlines()))
+        self.assertEqual(2, len(threads))
+        self.assertIs(threads[0], threads[1])
+
+
+class EnvironmentDumpHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        return tornado.web.Application([
+            (r'/e/?(.*)', EnvironmentDumpHandler),
+        ])
+
+    def test_should_dump_the_default_environment(self):
+        response = self.fetch('/e')
+        self.assertEqual(response.code, 200)
+        self.assertEqual({'os', 'python', 'process'}, set(json.loads(response.body.decode('utf-8'))))
+
+    def test_should_dump_section_from_url(self):
+        response = self.fetch('/e/os')
+        self.assertEqual(['os'], list(json.loads(response.body.decode('utf-8'))))
+
+
 if __name__ == '__main__':
     unittest.main()